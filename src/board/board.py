@@ -1,39 +1,49 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from src.game.moves import SQUARES
+from src.game.zobrist import piece_keys
 from src.pieces.piece import  Piece, Position, Color
 
+# every square mapped to None, file by file; boards start from a copy,
+# which is far cheaper than hashing 64 new Positions per board
+_EMPTY_STATE: Dict[Position, Optional[Piece]] = {
+    SQUARES[rank * 8 + file_idx]: None for file_idx in range(8) for rank in range(8)
+}
+
 class Board:
     def __init__(self):
         """
         Create an empty chess board with a sophisticated representation
         
         Design Considerations:
-        - Immutable board state
+        - Mutated in place for speed; BoardSnapshot (src.board.snapshot)
+          is the immutable, structure-sharing form
         - Efficient piece lookup
         - Clear spatial relationships
         """
         self._board_state: Dict[Position, Optional[Piece]] = {}
+        
+        # the same pieces indexed by square number (A1 = 0 ... H8 = 63)
+        # so move generation can walk the board without building Positions
+        self._squares: List[Optional[Piece]] = [None] * 64
+        
+        # Zobrist key of the piece placement, updated by every mutation below
+        # so hashing a position does not have to walk the board
+        self._placement_key = 0
         self._initialize_empty_board()
     
     # internal method start with underscore
     def _initialize_empty_board(self):
         """
-        Systematically create board positions
+        Systematically lay out the board positions
         
         Demonstrates:
         - Comprehensive initialization
-        - Explicit position creation
+        - Positions shared with src.game.moves.SQUARES
         """
         
-        # get rows and columns
-        files = 'ABCDEFGH'
-        ranks = range(1,9)
-        
-        # create the files 
-        for file in files:
-            # for every file lay out all the ranks
-            for rank in ranks:
-                position = Position(file, rank)
-                self._board_state[position] = None
+        # the same Positions, in the same file-by-file order, as laying
+        # the files and ranks out one by one
+        self._board_state = _EMPTY_STATE.copy()
     
     def place_piece(self, piece:Piece, position:Position):
         """
@@ -51,6 +61,8 @@ class Board:
             raise ValueError(f"Position {position} is already occupied")
         
         self._board_state[position] = piece
+        self._squares[position.square] = piece
+        self._placement_key ^= piece_keys(piece)[position.square]
     
     def move_piece (self, from_position:Position, to_position:Position):
         """
@@ -75,9 +87,50 @@ class Board:
         # update the board state
         self._board_state[to_position] =  moving_piece
         self._board_state[from_position] = None
+        self._squares[to_position.square] = moving_piece
+        self._squares[from_position.square] = None
+        
+        keys = piece_keys(moving_piece)
+        self._placement_key ^= keys[from_position.square] ^ keys[to_position.square]
+        if captured_piece is not None:
+            self._placement_key ^= piece_keys(captured_piece)[to_position.square]
+        
+        # keep the piece in sync with where it now stands
+        moving_piece.current_position = to_position
         
         return captured_piece
     
+    def remove_piece(self, position:Position) -> Optional[Piece]:
+        """
+        Take a piece off the board (en passant captures, undoing simulations)
+        
+        Returns:
+            The removed piece, or None if the square was empty
+        """
+        if position not in self._board_state:
+            raise ValueError(f" Invalid board position {position}")
+        
+        removed_piece = self._board_state[position]
+        self._board_state[position] = None
+        self._squares[position.square] = None
+        if removed_piece is not None:
+            self._placement_key ^= piece_keys(removed_piece)[position.square]
+        return removed_piece
+    
+    def replace_piece(self, position:Position, piece:Piece) -> Optional[Piece]:
+        """
+        Swap whatever stands on a square for another piece (pawn promotion)
+        
+        Returns:
+            The piece that was replaced
+        """
+        replaced_piece = self.remove_piece(position)
+        self._board_state[position] = piece
+        self._squares[position.square] = piece
+        self._placement_key ^= piece_keys(piece)[position.square]
+        piece.current_position = position
+        return replaced_piece
+    
     def get_piece_at(self, position:Position)-> Optional[Piece]:
         """
         Retrieve piece at a specific position
@@ -86,7 +139,33 @@ class Board:
         - Provides controlled access to board state
         - Prevents direct manipulation of the board by encapsulating it in this function
         """
-        return self._board_state.get(position)
+        return self._squares[position.square]
+    
+    def get_piece_at_square(self, square:int) -> Optional[Piece]:
+        """
+        Retrieve piece by square number (A1 = 0 ... H8 = 63)
+        """
+        return self._squares[square]
+    
+    @property
+    def squares(self) -> List[Optional[Piece]]:
+        """
+        Read-only view of the board indexed by square number
+        
+        Hot loops fetch this once instead of calling get_piece_at per square,
+        callers must never modify it
+        """
+        return self._squares
+    
+    @property
+    def placement_key(self) -> int:
+        """
+        Zobrist key of the pieces on the board (see src.game.zobrist)
+        
+        Maintained by place/move/remove/replace, so it changes with every
+        mutation and can key caches of anything derived from the position
+        """
+        return self._placement_key
     
     def is_move_valid(self, piece:Piece, destination:Position)-> bool:
         """
@@ -111,10 +190,19 @@ class Board:
         
         # comprehension
         return [
-            piece for piece in self._board_state.values()
+            piece for piece in self._squares
             if piece is not None and piece.color == color
         ]
     
+    def get_all_pieces(self) -> list[tuple[Position, Piece]]:
+        """
+        Retrieve every occupied square together with its piece
+        """
+        return [
+            (piece.current_position, piece) for piece in self._squares
+            if piece is not None
+        ]
+    
     def __str__(self):
         """
         Create a string representation of the board
@@ -0,0 +1,179 @@
+# src/board/snapshot.py
+from typing import Iterator, NamedTuple, Optional, Tuple
+from src.board.board import Board
+from src.game.moves import (
+    CASTLING, DOUBLE_PUSH, EN_PASSANT, PROMOTION_SHIFT, SQUARE_MASK, SQUARES, TO_SHIFT
+)
+from src.game.zobrist import (
+    CASTLING_KEYS, CASTLING_SQUARES, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY,
+    castling_rights, compute_hash, en_passant_file
+)
+from src.pieces.concrete_pieces import PIECE_CLASSES
+from src.pieces.piece import Color, PieceType
+
+
+EMPTY = '.'
+
+# one character per piece, FEN style: upper case white, lower case black
+PIECE_CODES = {
+    (color, piece_type): letter if color is Color.WHITE else letter.lower()
+    for color in Color
+    for piece_type, letter in zip(
+        (PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN, PieceType.KING),
+        'PNBRQK'
+    )
+}
+CODE_PIECES = {code: color_type for color_type, code in PIECE_CODES.items()}
+CODE_KEYS = {code: PIECE_KEYS[color_type] for code, color_type in CODE_PIECES.items()}
+
+# promotion field of a packed move (1..4) to the white piece code
+PROMOTION_LETTERS = '.NBRQ'
+
+Ranks = Tuple[Tuple[str, ...], ...]
+
+
+class BoardSnapshot(NamedTuple):
+    """
+    Immutable position: eight rank tuples of piece codes plus the state the
+    rules need (side to move, castling rights, en passant file)
+
+    Design Considerations:
+    - apply() returns a new snapshot that shares every untouched rank tuple
+      with its parent, so a move costs the one or two ranks it changes plus
+      the 8-slot outer tuple instead of a copy of the board
+    - Nothing is ever modified, so any number of threads can read the same
+      snapshots without locking
+    - key is the Zobrist key ChessGame.position_hash() gives the position,
+      maintained incrementally by apply()
+    """
+    ranks: Ranks
+    side_to_move: Color
+    castling: int              # bit i set: CASTLING_SQUARES[i] still allowed
+    en_passant: Optional[int]  # file index, only when a capture is possible
+    key: int
+
+    @classmethod
+    def from_board(cls, board: Board, side_to_move: Color) -> 'BoardSnapshot':
+        squares = board.squares
+        codes = [
+            EMPTY if piece is None else PIECE_CODES[(piece.color, piece.piece_type)]
+            for piece in squares
+        ]
+        ranks = tuple(tuple(codes[row * 8:row * 8 + 8]) for row in range(8))
+        castling = sum(1 << index for index, right in enumerate(castling_rights(board)) if right)
+        return cls(ranks, side_to_move, castling, en_passant_file(board, side_to_move),
+                   compute_hash(board, side_to_move))
+
+    def piece_at(self, square: int) -> str:
+        """
+        Piece code on a square (A1 = 0 ... H8 = 63), EMPTY if none
+        """
+        return self.ranks[square >> 3][square & 7]
+
+    def pieces(self) -> Iterator[Tuple[int, str]]:
+        """
+        (square, code) for every occupied square
+        """
+        for row, rank in enumerate(self.ranks):
+            for file_idx, code in enumerate(rank):
+                if code != EMPTY:
+                    yield row * 8 + file_idx, code
+
+    def apply(self, move: int) -> 'BoardSnapshot':
+        """
+        The position after a legal packed move from get_legal_moves
+
+        Only the flags of the move are trusted, nothing is validated here
+        """
+        from_square = move & SQUARE_MASK
+        to_square = (move >> TO_SHIFT) & SQUARE_MASK
+        code = self.piece_at(from_square)
+        white = self.side_to_move is Color.WHITE
+
+        promotion = (move >> PROMOTION_SHIFT) & 0b111
+        if promotion:
+            letter = PROMOTION_LETTERS[promotion]
+            landing = letter if white else letter.lower()
+        else:
+            landing = code
+
+        changes = {from_square: EMPTY, to_square: landing}
+        if move & EN_PASSANT:
+            changes[to_square - 8 if white else to_square + 8] = EMPTY
+        if move & CASTLING:
+            kingside = to_square > from_square
+            rook_square = from_square + (3 if kingside else -4)
+            changes[from_square + (1 if kingside else -1)] = self.piece_at(rook_square)
+            changes[rook_square] = EMPTY
+
+        key = self.key ^ SIDE_KEY
+        ranks = list(self.ranks)
+        copied_rows = set()
+        for square, new_code in changes.items():
+            row = square >> 3
+            old_code = ranks[row][square & 7]
+            if old_code != EMPTY:
+                key ^= CODE_KEYS[old_code][square]
+            if new_code != EMPTY:
+                key ^= CODE_KEYS[new_code][square]
+            if row not in copied_rows:
+                ranks[row] = list(ranks[row])
+                copied_rows.add(row)
+            ranks[row][square & 7] = new_code
+        for row in copied_rows:
+            ranks[row] = tuple(ranks[row])
+
+        # a king or rook leaving (or a rook being taken on) its home square
+        castling = self.castling
+        for index, squares in enumerate(CASTLING_SQUARES):
+            if castling & (1 << index) and (from_square in squares or to_square in squares):
+                castling &= ~(1 << index)
+                key ^= CASTLING_KEYS[index]
+
+        if self.en_passant is not None:
+            key ^= EN_PASSANT_KEYS[self.en_passant]
+        en_passant = None
+        if move & DOUBLE_PUSH:
+            # counted only when an enemy pawn stands next to the pawn
+            enemy_pawn = 'p' if white else 'P'
+            file_idx = to_square & 7
+            rank = ranks[to_square >> 3]
+            if (file_idx > 0 and rank[file_idx - 1] == enemy_pawn) or (file_idx < 7 and rank[file_idx + 1] == enemy_pawn):
+                en_passant = file_idx
+                key ^= EN_PASSANT_KEYS[file_idx]
+
+        side = Color.BLACK if white else Color.WHITE
+        return BoardSnapshot(tuple(ranks), side, castling, en_passant, key)
+
+    def to_board(self) -> Board:
+        """
+        A fresh mutable Board holding this position
+
+        has_moved and just_moved_two are set so that the board allows
+        exactly the castles and en passant capture recorded here
+        """
+        board = Board()
+        home_squares = {}
+        for index, squares in enumerate(CASTLING_SQUARES):
+            if self.castling & (1 << index):
+                home_squares.update(dict.fromkeys(squares, True))
+
+        for square, code in self.pieces():
+            color, piece_type = CODE_PIECES[code]
+            position = SQUARES[square]
+            piece = PIECE_CLASSES[piece_type](color, position)
+            if piece_type in (PieceType.KING, PieceType.ROOK):
+                piece.has_moved = square not in home_squares
+            board.place_piece(piece, position)
+
+        if self.en_passant is not None:
+            # the pawn that just double stepped belongs to the side not to move
+            row = 4 if self.side_to_move is Color.WHITE else 3
+            board.get_piece_at_square(row * 8 + self.en_passant).just_moved_two = True
+        return board
+
+    def __hash__(self) -> int:
+        return self.key
+
+    def __str__(self):
+        return '\n'.join(' '.join(rank) for rank in reversed(self.ranks))
@@ -0,0 +1,211 @@
+# src/database/game_record.py
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Type
+from src.database.position_index import RESULT_CODES, UNKNOWN
+from src.game.chess_game import ChessGame
+from src.game.moves import CODE_MASK, decode_move, encode_move
+from src.notation.pgn import PGNGame
+from src.notation.san import decode_san
+from src.pieces.concrete_pieces import PIECE_CLASSES
+from src.pieces.piece import Piece, Position
+
+# header flag bits: two for the result, one for the move encoding
+RESULT_MASK = 0b011
+INDEXED_MOVES = 0b100
+
+RecordMove = Tuple[Position, Position, Optional[Type[Piece]]]
+
+
+class GameRecordError(ValueError):
+    """
+    Raised for truncated or inconsistent binary records
+    """
+    pass
+
+
+def legal_move_codes(game: ChessGame) -> List[int]:
+    """
+    Legal moves of the side to move as 16 bit codes, in a canonical order
+    
+    Both the writer and the reader sort the list the same way, so a move
+    can be stored as its index in it
+    """
+    return sorted(move & CODE_MASK for move in game.get_legal_moves().raw())
+
+
+def encode_game(moves: Iterable[RecordMove], result: int = UNKNOWN, indexed: bool = True) -> bytes:
+    """
+    Encode a game as a one byte header, a varint ply count and the moves
+    
+    Args:
+        moves: (from, to, promotion class) tuples from the initial position
+        result: One of the position_index result codes
+        indexed: Store each move as one byte (its index in the legal move
+                 list) instead of a two byte (from, to, promotion) code
+    """
+    game = ChessGame()
+    body = bytearray()
+    ply_count = 0
+    
+    for from_pos, to_pos, promotion in moves:
+        code = encode_move(from_pos, to_pos, promotion)
+        if indexed:
+            codes = legal_move_codes(game)
+            if code not in codes:
+                raise GameRecordError(f"Illegal move {from_pos}{to_pos} at ply {ply_count}")
+            body.append(codes.index(code))
+        else:
+            body += code.to_bytes(2, 'little')
+        
+        if not game.move_piece(from_pos, to_pos, promotion):
+            raise GameRecordError(f"Illegal move {from_pos}{to_pos} at ply {ply_count}")
+        ply_count += 1
+    
+    header = (result & RESULT_MASK) | (INDEXED_MOVES if indexed else 0)
+    return bytes([header]) + _encode_varint(ply_count) + bytes(body)
+
+
+def decode_game(data: bytes) -> Tuple[ChessGame, List[RecordMove], int]:
+    """
+    Replay a binary record, returning the final game, its moves and result
+    """
+    game, moves, result, _ = _decode_from(data, 0)
+    return game, moves, result
+
+
+def replay_record(data: bytes) -> Iterator[ChessGame]:
+    """
+    Replay a binary record lazily, yielding the game after every move (the
+    same object each time, like PGNGame.replay())
+    
+    A corrupt record raises GameRecordError at the bad move, after the
+    positions before it were yielded
+    """
+    header, ply_count, offset = _read_header(data, 0)
+    game = ChessGame()
+    for _ in _play_moves(game, data, offset, ply_count, bool(header & INDEXED_MOVES)):
+        yield game
+
+
+def encode_pgn_game(pgn_game: PGNGame, indexed: bool = True) -> bytes:
+    """
+    Convert a parsed PGN game into a binary record
+    """
+    return encode_game(_pgn_moves(pgn_game), RESULT_CODES.get(pgn_game.result, UNKNOWN), indexed)
+
+
+def write_records(stream: BinaryIO, records: Iterable[bytes]) -> int:
+    """
+    Append length-prefixed records to an archive stream
+    
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+    for record in records:
+        chunk = _encode_varint(len(record)) + record
+        stream.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def read_records(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield raw records from an archive one at a time
+    """
+    while True:
+        length = _read_varint(stream)
+        if length is None:
+            return
+        record = stream.read(length)
+        if len(record) != length:
+            raise GameRecordError("Truncated record")
+        yield record
+
+
+def _pgn_moves(pgn_game: PGNGame) -> Iterator[RecordMove]:
+    game = ChessGame()
+    for san in pgn_game.moves():
+        move = decode_san(game, san)
+        game.move_piece(*move)
+        yield move
+
+
+def _decode_from(data: bytes, offset: int):
+    header, ply_count, offset = _read_header(data, offset)
+    game = ChessGame()
+    moves: List[RecordMove] = []
+    for move, offset in _play_moves(game, data, offset, ply_count, bool(header & INDEXED_MOVES)):
+        moves.append(move)
+    return game, moves, header & RESULT_MASK, offset
+
+
+def _read_header(data: bytes, offset: int) -> Tuple[int, int, int]:
+    # header byte, ply count and the offset of the first move
+    if offset >= len(data):
+        raise GameRecordError("Empty record")
+    ply_count, moves_offset = _decode_varint(data, offset + 1)
+    return data[offset], ply_count, moves_offset
+
+
+def _play_moves(game: ChessGame, data: bytes, offset: int, ply_count: int,
+                indexed: bool) -> Iterator[Tuple[RecordMove, int]]:
+    # plays each stored move on game, yielding it with the offset after it
+    for ply in range(ply_count):
+        if indexed:
+            if offset >= len(data):
+                raise GameRecordError("Truncated move list")
+            codes = legal_move_codes(game)
+            if data[offset] >= len(codes):
+                raise GameRecordError(f"Move index {data[offset]} out of range at ply {ply}")
+            code = codes[data[offset]]
+            offset += 1
+        else:
+            if offset + 2 > len(data):
+                raise GameRecordError("Truncated move list")
+            code = int.from_bytes(data[offset:offset + 2], 'little')
+            offset += 2
+        
+        from_pos, to_pos, promotion_type = decode_move(code)
+        promotion = PIECE_CLASSES[promotion_type] if promotion_type else None
+        if not game.move_piece(from_pos, to_pos, promotion):
+            raise GameRecordError(f"Illegal move {from_pos}{to_pos} at ply {ply}")
+        yield (from_pos, to_pos, promotion), offset
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        if offset >= len(data):
+            raise GameRecordError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def _read_varint(stream: BinaryIO) -> Optional[int]:
+    value, shift = 0, 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise GameRecordError("Truncated varint")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
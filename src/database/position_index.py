@@ -0,0 +1,335 @@
+# src/database/position_index.py
+import heapq
+import json
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from src.game.chess_game import ChessGame
+from src.game.moves import decode_move, encode_move
+from src.notation.pgn import PGNGame
+from src.notation.san import SANError, decode_san
+
+
+# hash, game id, ply, move played from the position, result
+POSTING_FORMAT = struct.Struct('<QIHHB')
+# hash, move, games, white wins, draws, black wins; most played first per hash
+MOVE_STATS_FORMAT = struct.Struct('<QHIIII')
+# postings read from a sorted run at a time while merging
+MERGE_READ = 4096
+MANIFEST_NAME = 'manifest.json'
+
+NO_MOVE = 0  # the game ended in this position
+
+WHITE_WIN, DRAW, BLACK_WIN, UNKNOWN = range(4)
+RESULT_CODES = {'1-0': WHITE_WIN, '1/2-1/2': DRAW, '0-1': BLACK_WIN}
+
+
+class Posting(NamedTuple):
+    position_hash: int
+    game_id: int
+    ply: int
+    move: int
+    result: int
+
+
+class MoveStats:
+    """
+    Opening explorer line: how often a move was played and how it scored
+    """
+    def __init__(self, move: int):
+        self.move = move
+        self.games = 0
+        self.white_wins = 0
+        self.draws = 0
+        self.black_wins = 0
+    
+    def add(self, result: int):
+        self.games += 1
+        if result == WHITE_WIN:
+            self.white_wins += 1
+        elif result == DRAW:
+            self.draws += 1
+        elif result == BLACK_WIN:
+            self.black_wins += 1
+    
+    def __repr__(self):
+        from_pos, to_pos, promotion = decode_move(self.move)
+        return (f"MoveStats({from_pos}{to_pos}, games={self.games}, "
+                f"+{self.white_wins} ={self.draws} -{self.black_wins})")
+
+
+class PositionIndexBuilder:
+    """
+    Replays games and writes (position hash -> game, ply) postings to disk
+    
+    Design Considerations:
+    - Postings are buffered per hash prefix and appended to that shard's
+      file once `buffer_size` postings are pending, so memory does not grow
+      with the number of games
+    - finish() sorts each shard on its own as an external merge sort:
+      runs of buffer_size postings are sorted in memory and written out,
+      then merged, so no more than one run is held whatever the shard size
+    - The merge also writes each position's move counts and results next
+      to the shard, so an opening explorer query reads a few records even
+      for positions reached in millions of games
+    """
+    def __init__(self, index_dir: str, shard_bits: int = 8, buffer_size: int = 100_000):
+        if not 0 <= shard_bits <= 16:
+            raise ValueError(f"shard_bits must be between 0 and 16, got {shard_bits}")
+        
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.shard_bits = shard_bits
+        self.buffer_size = buffer_size
+        self.games_indexed = 0
+        self.games_failed = 0
+        self._buffers: Dict[int, List[bytes]] = {}
+        self._buffered = 0
+        
+        # start from a clean directory, shards are only ever appended to
+        for name in os.listdir(index_dir):
+            if name.startswith('shard_') or name == MANIFEST_NAME:
+                os.remove(os.path.join(index_dir, name))
+    
+    def add_game(self, pgn_game: PGNGame) -> bool:
+        """
+        Replay one game and record every position it reached
+        
+        Returns:
+            False when the move text contained an illegal move; the positions
+            up to that point are still indexed
+        """
+        game_id = self.games_indexed + self.games_failed
+        result = RESULT_CODES.get(pgn_game.result, UNKNOWN)
+        game = ChessGame()
+        
+        ply = 0
+        try:
+            for san in pgn_game.moves():
+                from_pos, to_pos, promotion = decode_san(game, san)
+                position_hash = game.position_hash()
+                self._write(Posting(position_hash, game_id, ply, encode_move(from_pos, to_pos, promotion), result))
+                game.move_piece(from_pos, to_pos, promotion)
+                ply += 1
+        except (SANError, ValueError):
+            self.games_failed += 1
+            return False
+        
+        self._write(Posting(game.position_hash(), game_id, ply, NO_MOVE, result))
+        self.games_indexed += 1
+        return True
+    
+    def add_games(self, games: Iterable[PGNGame]):
+        for pgn_game in games:
+            self.add_game(pgn_game)
+    
+    def finish(self) -> 'PositionIndex':
+        """
+        Sort every shard by hash and write the manifest
+        """
+        self._flush()
+        
+        for shard in range(1 << self.shard_bits):
+            path = _shard_path(self.index_dir, shard)
+            if not os.path.exists(path):
+                continue
+            self._sort_shard(path)
+        
+        manifest = {
+            'shard_bits': self.shard_bits,
+            'move_stats': True,
+            'games_indexed': self.games_indexed,
+            'games_failed': self.games_failed,
+        }
+        with open(os.path.join(self.index_dir, MANIFEST_NAME), 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        
+        return PositionIndex(self.index_dir)
+    
+    def _sort_shard(self, path: str):
+        run_paths = []
+        with open(path, 'rb') as shard_file:
+            while True:
+                data = shard_file.read(self.buffer_size * POSTING_FORMAT.size)
+                if not data:
+                    break
+                run_path = f'{path}.run{len(run_paths)}'
+                with open(run_path, 'wb') as run_file:
+                    run_file.write(b''.join(POSTING_FORMAT.pack(*posting)
+                                            for posting in sorted(POSTING_FORMAT.iter_unpack(data))))
+                run_paths.append(run_path)
+        
+        runs = [open(run_path, 'rb') for run_path in run_paths]
+        try:
+            with open(path, 'wb') as shard_file, open(_move_stats_path(path), 'wb') as stats_file:
+                # postings arrive grouped by hash: count each position's moves as it passes
+                current: Optional[int] = None
+                moves: Dict[int, List[int]] = {}
+                for posting in heapq.merge(*(_read_run(run) for run in runs)):
+                    shard_file.write(POSTING_FORMAT.pack(*posting))
+                    position_hash, _, _, move, result = posting
+                    if position_hash != current:
+                        _write_move_stats(stats_file, current, moves)
+                        current, moves = position_hash, {}
+                    if move != NO_MOVE:
+                        counts = moves.setdefault(move, [0, 0, 0, 0])
+                        counts[0] += 1
+                        if result != UNKNOWN:
+                            counts[1 + result] += 1
+                _write_move_stats(stats_file, current, moves)
+        finally:
+            for run, run_path in zip(runs, run_paths):
+                run.close()
+                os.remove(run_path)
+    
+    def _write(self, posting: Posting):
+        shard = _shard_of(posting.position_hash, self.shard_bits)
+        self._buffers.setdefault(shard, []).append(POSTING_FORMAT.pack(*posting))
+        self._buffered += 1
+        if self._buffered >= self.buffer_size:
+            self._flush()
+    
+    def _flush(self):
+        for shard, records in self._buffers.items():
+            with open(_shard_path(self.index_dir, shard), 'ab') as shard_file:
+                shard_file.write(b''.join(records))
+        self._buffers.clear()
+        self._buffered = 0
+
+
+class PositionIndex:
+    """
+    Read side of the index: binary search inside one memory-mapped shard
+    
+    Only the pages touched by the search are read from disk, so queries do
+    not depend on the total size of the index
+    """
+    def __init__(self, index_dir: str):
+        with open(os.path.join(index_dir, MANIFEST_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+        
+        self.index_dir = index_dir
+        self.shard_bits = manifest['shard_bits']
+        self.games_indexed = manifest['games_indexed']
+        # indexes written before the move stats existed are explored from their postings
+        self.has_move_stats = manifest.get('move_stats', False)
+        self._maps: Dict[str, Optional[mmap.mmap]] = {}
+    
+    def lookup(self, position_hash: int) -> List[Posting]:
+        """
+        Every (game, ply) at which the position occurred
+        """
+        return list(self._postings(position_hash))
+    
+    def find_games(self, game: ChessGame) -> List[Posting]:
+        return self.lookup(game.position_hash())
+    
+    def explore(self, game: ChessGame) -> List[MoveStats]:
+        """
+        Opening explorer query: moves played from this position, most popular first
+        """
+        position_hash = game.position_hash()
+        if self.has_move_stats:
+            return list(self._move_stats(position_hash))
+        
+        stats: Dict[int, MoveStats] = {}
+        for posting in self._postings(position_hash):
+            if posting.move == NO_MOVE:
+                continue
+            stats.setdefault(posting.move, MoveStats(posting.move)).add(posting.result)
+        return sorted(stats.values(), key=lambda move_stats: move_stats.games, reverse=True)
+    
+    def close(self):
+        for shard_map in self._maps.values():
+            if shard_map is not None:
+                shard_map.close()
+        self._maps.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _postings(self, position_hash: int) -> Iterator[Posting]:
+        path = _shard_path(self.index_dir, _shard_of(position_hash, self.shard_bits))
+        for record in self._records(path, POSTING_FORMAT, position_hash):
+            yield Posting(*record)
+    
+    def _move_stats(self, position_hash: int) -> Iterator[MoveStats]:
+        path = _move_stats_path(_shard_path(self.index_dir, _shard_of(position_hash, self.shard_bits)))
+        for _, move, games, white_wins, draws, black_wins in self._records(path, MOVE_STATS_FORMAT, position_hash):
+            stats = MoveStats(move)
+            stats.games, stats.white_wins, stats.draws, stats.black_wins = games, white_wins, draws, black_wins
+            yield stats
+    
+    def _records(self, path: str, record_format: struct.Struct, position_hash: int) -> Iterator[tuple]:
+        """
+        The records of a hash-sorted file whose leading field is position_hash
+        
+        Two binary searches find the run of matching records, which is then
+        unpacked in one call
+        """
+        file_map = self._map(path)
+        if file_map is None:
+            return iter(())
+        low = _lower_bound(file_map, record_format.size, position_hash)
+        high = _lower_bound(file_map, record_format.size, position_hash + 1)
+        return record_format.iter_unpack(file_map[low * record_format.size:high * record_format.size])
+    
+    def _map(self, path: str) -> Optional[mmap.mmap]:
+        if path not in self._maps:
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                self._maps[path] = None
+            else:
+                with open(path, 'rb') as mapped_file:
+                    self._maps[path] = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[path]
+
+
+def build_index(games: Iterable[PGNGame], index_dir: str, shard_bits: int = 8) -> PositionIndex:
+    """
+    Convenience wrapper: index a stream of games in one call
+    """
+    builder = PositionIndexBuilder(index_dir, shard_bits)
+    builder.add_games(games)
+    return builder.finish()
+
+
+def _read_run(run: BinaryIO) -> Iterator[tuple]:
+    while True:
+        data = run.read(MERGE_READ * POSTING_FORMAT.size)
+        if not data:
+            return
+        yield from POSTING_FORMAT.iter_unpack(data)
+
+
+def _write_move_stats(stats_file: BinaryIO, position_hash: Optional[int], moves: Dict[int, List[int]]):
+    # most played first, ties in the order the moves were first seen
+    for move, counts in sorted(moves.items(), key=lambda item: item[1][0], reverse=True):
+        stats_file.write(MOVE_STATS_FORMAT.pack(position_hash, move, *counts))
+
+
+def _lower_bound(file_map: mmap.mmap, size: int, position_hash: int) -> int:
+    # first record whose leading hash field is not below position_hash
+    low, high = 0, len(file_map) // size
+    while low < high:
+        middle = (low + high) // 2
+        if struct.unpack_from('<Q', file_map, middle * size)[0] < position_hash:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _shard_of(position_hash: int, shard_bits: int) -> int:
+    return position_hash >> (64 - shard_bits) if shard_bits else 0
+
+
+def _shard_path(index_dir: str, shard: int) -> str:
+    return os.path.join(index_dir, f'shard_{shard:04x}.bin')
+
+
+def _move_stats_path(shard_path: str) -> str:
+    return shard_path[:-len('.bin')] + '.moves'
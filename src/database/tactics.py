@@ -0,0 +1,404 @@
+# src/database/tactics.py
+import argparse
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO
+from src.database.game_record import read_records, replay_record
+from src.engine.mate_solver import PROVEN, MateSolver
+from src.engine.search import MATE_THRESHOLD, SearchLimits, Searcher
+from src.game.chess_game import ChessGame, GameState
+from src.notation.coordinate import move_to_uci
+from src.notation.pgn import PGNGame, open_games
+from src.pieces.piece import Color
+
+
+# positions whose side to move gained at least SWING centipawns over the
+# previous position's (shallow) score and stands at MIN_ADVANTAGE or more
+SWING = 250
+MIN_ADVANTAGE = 200
+# a puzzle's best move must beat the second best by this much
+UNIQUENESS = 150
+
+# games queued between the reader thread and the scanners, candidates
+# waiting for verification; pool jobs in flight per worker and stage
+QUEUE_SIZE = 64
+JOBS_PER_WORKER = 2
+# position hashes remembered for deduplication
+SEEN_SIZE = 1 << 20
+
+
+class MinerConfig:
+    """
+    What counts as a tactic and how hard each stage looks
+
+    Only plain values are stored so the configuration can be sent to worker
+    processes, like tournament EngineConfigs
+
+    Args:
+        scan_depth: Search depth run on every position of every game
+        verify_depth: Depth of the multi-PV search confirming a candidate
+        mate_moves: Longest forced mate the mate solver looks for
+        mate_nodes: Mate solver node budget per candidate
+        swing: Centipawns a position must gain over the previous one
+        min_advantage: Score the side to move must have after the swing
+        uniqueness: Margin of the best move over the second best
+        min_ply: Opening plies skipped before scanning starts
+    """
+    def __init__(self, scan_depth: int = 1, verify_depth: int = 3, mate_moves: int = 3,
+                 mate_nodes: int = 200_000, swing: int = SWING, min_advantage: int = MIN_ADVANTAGE,
+                 uniqueness: int = UNIQUENESS, min_ply: int = 8):
+        self.scan_depth = scan_depth
+        self.verify_depth = verify_depth
+        self.mate_moves = mate_moves
+        self.mate_nodes = mate_nodes
+        self.swing = swing
+        self.min_advantage = min_advantage
+        self.uniqueness = uniqueness
+        self.min_ply = min_ply
+
+
+class ArchiveGame(NamedTuple):
+    """
+    A game as read from an archive: parsed PGN or a binary game record
+    """
+    source: str
+    index: int
+    pgn: Optional[PGNGame]
+    record: Optional[bytes]
+
+
+class Candidate(NamedTuple):
+    """
+    A position the shallow scan flagged, with the game position checkpoint
+    """
+    source: str
+    index: int
+    ply: int
+    key: int
+    checkpoint: bytes
+    baseline: int     # previous position's score, seen by this side to move
+    score: int
+    mate: bool
+
+
+class ScanResult(NamedTuple):
+    candidates: List[Candidate]
+    plies: int
+    error: Optional[str]
+
+
+class Puzzle(NamedTuple):
+    """
+    A verified tactic: the position, its solution line and where it came from
+    """
+    key: int
+    kind: str                # "mate" or "swing"
+    checkpoint: bytes        # ChessGame.restore() gives the position
+    board: str               # ranks 8 to 1, '.' for empty squares
+    side: str                # 'w' or 'b' to move
+    solution: List[str]      # UCI moves, the solver's first
+    score: int
+    mate_in: Optional[int]
+    source: str
+    index: int
+    ply: int
+
+    def to_json(self) -> str:
+        values = self._asdict()
+        values['key'] = f"{self.key:016x}"
+        values['checkpoint'] = self.checkpoint.hex()
+        return json.dumps(values, separators=(',', ':'))
+
+
+class MinerStats:
+    def __init__(self):
+        self.games = 0
+        self.plies = 0
+        self.errors = 0
+        self.candidates = 0
+        self.duplicates = 0
+        self.puzzles = 0
+
+    def __repr__(self):
+        return (f"MinerStats(games={self.games}, plies={self.plies}, errors={self.errors}, "
+                f"candidates={self.candidates}, duplicates={self.duplicates}, puzzles={self.puzzles})")
+
+
+def archive_games(paths: Iterable[str]) -> Iterator[ArchiveGame]:
+    """
+    Stream the games of PGN files (*.pgn) and binary game record archives
+    (anything else, see src.database.game_record), one at a time
+    """
+    for path in paths:
+        if path.lower().endswith('.pgn'):
+            for index, pgn_game in enumerate(open_games(path)):
+                yield ArchiveGame(path, index, pgn_game, None)
+        else:
+            with open(path, 'rb') as stream:
+                for index, record in enumerate(read_records(stream)):
+                    yield ArchiveGame(path, index, None, record)
+
+
+def scan_game(item: ArchiveGame, config: MinerConfig) -> ScanResult:
+    """
+    Shallow search on every position of a game, flagging forced mates and
+    positions the last move turned in the side to move's favour
+
+    Runs in a worker process; a game that fails to replay or search keeps
+    the candidates found before the failure
+    """
+    searcher = Searcher(tt_size=1 << 16)
+    limits = SearchLimits(depth=config.scan_depth)
+    candidates: List[Candidate] = []
+    previous: Optional[int] = None
+    plies = 0
+    try:
+        for ply, game in enumerate(_positions(item), start=1):
+            plies = ply
+            if game.game_state != GameState.ACTIVE:
+                break
+            score = searcher.search(game, limits).score
+            if previous is not None and ply >= config.min_ply:
+                baseline = -previous
+                # a mate already on the board before the last move is the
+                # previous position's puzzle, not this one's
+                mate = score >= MATE_THRESHOLD and baseline < MATE_THRESHOLD
+                if mate or (score >= config.min_advantage and score - baseline >= config.swing):
+                    position = ChessGame.from_snapshot(game.snapshot())
+                    candidates.append(Candidate(
+                        item.source, item.index, ply, game.position_hash(),
+                        position.checkpoint(), baseline, score, mate
+                    ))
+            previous = score
+    except Exception as error:
+        return ScanResult(candidates, plies, f"{type(error).__name__}: {error}")
+    return ScanResult(candidates, plies, None)
+
+
+def verify_candidate(candidate: Candidate, config: MinerConfig) -> Optional[Puzzle]:
+    """
+    Deeper look at a candidate, in a worker process: a forced mate with a
+    single first move, or a winning move clearly better than any other
+    """
+    game = ChessGame.restore(candidate.checkpoint)
+    solver = MateSolver(table_size=1 << 18, max_nodes=config.mate_nodes)
+    mate = solver.solve(game, config.mate_moves)
+    if mate.status == PROVEN:
+        if len(solver.mating_moves(game, mate.moves)) != 1:
+            return None
+        return _puzzle(candidate, game, "mate", mate.line, candidate.score, mate.moves)
+
+    # quiet mates (the solver only tries checks) and material wins
+    result = Searcher().search(game, SearchLimits(depth=config.verify_depth), multipv=2)
+    best = result.lines[0]
+    if len(result.lines) > 1 and best.score - result.lines[1].score < config.uniqueness:
+        return None
+    mate_in = result.mate_in()
+    if mate_in is not None and mate_in > 0:
+        return _puzzle(candidate, game, "mate", best.pv, best.score, mate_in)
+    if best.score < config.min_advantage or best.score - candidate.baseline < config.swing:
+        return None
+    return _puzzle(candidate, game, "swing", best.pv, best.score, None)
+
+
+class TacticMiner:
+    """
+    Batch pipeline turning game archives into a deduplicated puzzle set
+
+        reader thread -> games queue -> scan jobs -> candidate queue
+                      -> verify jobs -> puzzles (JSON lines)
+
+    Design Considerations:
+    - Every stage is bounded: the reader blocks on a full games queue,
+      scans are not submitted while the candidate queue is full, and each
+      stage keeps a few jobs per worker in flight; memory stays flat
+      however many games the archives hold
+    - Scans and verifications share one process pool, so the cores do
+      whichever work is waiting
+    - Candidates are deduplicated by position hash before verification,
+      so a tactic reached in many games is verified and written once.
+      The hashes seen are bounded like the search TT: past seen_size
+      distinct candidates the set starts over, and a tactic seen before
+      that may be written again
+    - workers <= 1 runs every job inline, in order, for tests and debugging
+
+    Args:
+        config: Detection thresholds and search depths
+        workers: Worker processes, the CPU count by default
+        queue_size: Capacity of the games and candidate queues
+        seen_size: Position hashes kept for deduplication
+    """
+    def __init__(self, config: Optional[MinerConfig] = None, workers: Optional[int] = None,
+                 queue_size: int = QUEUE_SIZE, seen_size: int = SEEN_SIZE):
+        self.config = config or MinerConfig()
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.seen_size = seen_size
+
+    def run(self, paths: Iterable[str], output: Optional[TextIO] = None,
+            on_puzzle: Optional[Callable[[Puzzle], None]] = None) -> MinerStats:
+        """
+        Mine every game of the archives, writing one puzzle per line to output
+        """
+        stats = MinerStats()
+        games: "queue.Queue[Optional[ArchiveGame]]" = queue.Queue(maxsize=self.queue_size)
+        candidates: Deque[Candidate] = deque()
+        seen: Set[int] = set()
+        stop = threading.Event()
+        reader_errors: List[BaseException] = []
+        reader = threading.Thread(target=self._read, args=(list(paths), games, stop, reader_errors),
+                                  name="tactic-reader", daemon=True)
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else _InlineExecutor()
+        limit = max(1, self.workers) * JOBS_PER_WORKER
+        scans: Set[Future] = set()
+        verifications: Set[Future] = set()
+        exhausted = False
+        # with the fork start method the pool forks all its workers on the
+        # first submit; that has to happen before the reader thread exists
+        executor.submit(int).result()
+        reader.start()
+        try:
+            while True:
+                while not exhausted and len(scans) < limit and len(candidates) < self.queue_size:
+                    item = games.get()
+                    if item is None:
+                        exhausted = True
+                        break
+                    scans.add(executor.submit(scan_game, item, self.config))
+                while candidates and len(verifications) < limit:
+                    verifications.add(executor.submit(verify_candidate, candidates.popleft(), self.config))
+                if not scans and not verifications:
+                    if exhausted and not candidates:
+                        break
+                    continue
+
+                done, _ = wait(scans | verifications, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scanned = future in scans
+                    (scans if scanned else verifications).discard(future)
+                    try:
+                        value = future.result()
+                    except Exception:
+                        # one bad game or candidate must not end a long run
+                        stats.errors += 1
+                        if scanned:
+                            stats.games += 1
+                        continue
+                    if scanned:
+                        self._scanned(value, stats, seen, candidates, self.seen_size)
+                    elif value is not None:
+                        stats.puzzles += 1
+                        if output is not None:
+                            output.write(value.to_json() + '\n')
+                        if on_puzzle:
+                            on_puzzle(value)
+        finally:
+            stop.set()
+            for future in scans | verifications:
+                future.cancel()
+            executor.shutdown(wait=True)
+        reader.join()
+        if reader_errors:
+            raise reader_errors[0]
+        return stats
+
+    def _read(self, paths: List[str], games: queue.Queue, stop: threading.Event,
+              errors: List[BaseException]):
+        try:
+            for item in archive_games(paths):
+                if not self._put(games, item, stop):
+                    return
+        except Exception as error:
+            errors.append(error)
+        self._put(games, None, stop)
+
+    @staticmethod
+    def _put(games: queue.Queue, item: Optional[ArchiveGame], stop: threading.Event) -> bool:
+        # a full queue blocks the reader, but not past a stopped run
+        while not stop.is_set():
+            try:
+                games.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _scanned(result: ScanResult, stats: MinerStats, seen: Set[int], candidates: Deque[Candidate],
+                 seen_size: int):
+        stats.games += 1
+        stats.plies += result.plies
+        if result.error is not None:
+            stats.errors += 1
+        for candidate in result.candidates:
+            stats.candidates += 1
+            if candidate.key in seen:
+                stats.duplicates += 1
+                continue
+            if len(seen) >= seen_size:
+                # crude but bounded: start over when the set is full
+                seen.clear()
+            seen.add(candidate.key)
+            candidates.append(candidate)
+
+
+class _InlineExecutor(Executor):
+    """
+    Runs each job at submit time; the single-process stand-in for the pool
+    """
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+
+def _positions(item: ArchiveGame) -> Iterator[ChessGame]:
+    # the same game object after every move, like PGNGame.replay()
+    if item.pgn is not None:
+        yield from item.pgn.replay()
+    else:
+        yield from replay_record(item.record)
+
+
+def _puzzle(candidate: Candidate, game: ChessGame, kind: str, line, score: int,
+            mate_in: Optional[int]) -> Puzzle:
+    snapshot = game.snapshot()
+    board = '/'.join(''.join(rank) for rank in reversed(snapshot.ranks))
+    side = 'w' if snapshot.side_to_move is Color.WHITE else 'b'
+    return Puzzle(candidate.key, kind, candidate.checkpoint, board, side,
+                  [move_to_uci(move) for move in line], score, mate_in,
+                  candidate.source, candidate.index, candidate.ply)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mine tactics puzzles from game archives")
+    parser.add_argument("archives", nargs='+', help="PGN files (*.pgn) or binary game record archives")
+    parser.add_argument("--output", default="puzzles.jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--scan-depth", type=int, default=1)
+    parser.add_argument("--verify-depth", type=int, default=3)
+    parser.add_argument("--mate-moves", type=int, default=3)
+    parser.add_argument("--swing", type=int, default=SWING)
+    parser.add_argument("--min-ply", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    config = MinerConfig(scan_depth=args.scan_depth, verify_depth=args.verify_depth,
+                         mate_moves=args.mate_moves, swing=args.swing, min_ply=args.min_ply)
+    miner = TacticMiner(config, args.workers)
+    with open(args.output, 'w') as output:
+        stats = miner.run(args.archives, output,
+                          lambda puzzle: print(f"{puzzle.kind} {puzzle.source}#{puzzle.index} ply {puzzle.ply}: "
+                                               f"{' '.join(puzzle.solution)}"))
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
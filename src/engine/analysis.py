@@ -0,0 +1,112 @@
+# src/engine/analysis.py
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import Executor
+from typing import AsyncIterator, Optional
+from src.engine.search import MAX_DEPTH, SearchLimits, SearchResult, Searcher
+from src.game.chess_game import ChessGame
+
+
+class Analyser:
+    """
+    Streaming multi-PV analysis for interactive front-ends
+
+    analyse() is an async generator: every completed iteration of the
+    search is yielded as soon as it is done, so the first lines arrive in
+    milliseconds and keep getting deeper until a limit, stop() or the
+    consumer closing the generator ends the search
+
+        async with contextlib.aclosing(analyser.analyse(game, multipv=3)) as lines:
+            async for result in lines:
+                show(result.depth, result.nps, result.lines)
+
+    Design Considerations:
+    - The search runs in an executor on a private copy of the game, so the
+      event loop stays responsive and the caller's game may change meanwhile
+    - The searcher (and its transposition table) belongs to the analyser,
+      so analysing the position after the next move starts from what the
+      previous analysis learned
+    - One analysis runs at a time; a new one waits until the previous
+      generator is closed or its search is stopped
+    - Closing or cancelling the consumer stops the search and waits for
+      the executor job, so the searcher is free again afterwards
+
+    Args:
+        searcher: Searcher to use, a fresh one by default
+        executor: Where the search runs, the loop's default executor if None
+    """
+    def __init__(self, searcher: Optional[Searcher] = None, executor: Optional[Executor] = None):
+        self.searcher = searcher if searcher is not None else Searcher()
+        self.executor = executor
+        self._lock = asyncio.Lock()
+
+    def stop(self):
+        """
+        End the running analysis; its generator finishes with the last
+        depth the search completed
+        """
+        self.searcher.stop()
+
+    async def analyse(self, game: ChessGame, multipv: int = 1,
+                      limits: Optional[SearchLimits] = None) -> AsyncIterator[SearchResult]:
+        """
+        Yield a SearchResult per completed depth, with result.lines the
+        multipv best lines (best first), each with its score and pv
+
+        Args:
+            game: Position to analyse, copied before the search starts
+            multipv: Number of best moves to report
+            limits: When to stop by itself; unlimited depth by default
+        """
+        if multipv < 1:
+            raise ValueError(f"multipv must be at least 1, got {multipv}")
+        limits = limits or SearchLimits(depth=MAX_DEPTH)
+        position = ChessGame.from_snapshot(game.snapshot())
+        loop = asyncio.get_running_loop()
+        updates: "asyncio.Queue[Optional[SearchResult]]" = asyncio.Queue()
+
+        def on_iteration(result: SearchResult):
+            loop.call_soon_threadsafe(updates.put_nowait, result)
+
+        async with self._lock:
+            self.searcher.reset()
+            job = loop.run_in_executor(
+                self.executor, functools.partial(self.searcher.search, position, limits, on_iteration, multipv)
+            )
+            # queued behind every iteration the search reported
+            job.add_done_callback(lambda _: updates.put_nowait(None))
+            try:
+                yielded = False
+                while True:
+                    result = await updates.get()
+                    if result is None:
+                        break
+                    yielded = True
+                    yield result
+                final = job.result()
+                if not yielded:
+                    # mate or stalemate on the board, nothing was searched
+                    yield final
+            finally:
+                if not job.done():
+                    self.searcher.stop()
+                    await asyncio.wait({job})
+
+
+_DEFAULT_ANALYSER: Optional[Analyser] = None
+
+
+async def analyse(game: ChessGame, multipv: int = 1,
+                  limits: Optional[SearchLimits] = None) -> AsyncIterator[SearchResult]:
+    """
+    Analyser.analyse on a module wide analyser, so that successive calls
+    share one transposition table
+    """
+    global _DEFAULT_ANALYSER
+    if _DEFAULT_ANALYSER is None:
+        _DEFAULT_ANALYSER = Analyser()
+    # closing this generator has to close (and so stop) the inner one at once
+    async with contextlib.aclosing(_DEFAULT_ANALYSER.analyse(game, multipv, limits)) as results:
+        async for result in results:
+            yield result
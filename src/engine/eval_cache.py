@@ -0,0 +1,52 @@
+# src/engine/eval_cache.py
+from typing import Callable, Dict, Optional
+from src.game.canonical import Canonicalizer
+from src.game.chess_game import ChessGame
+
+
+class EvaluationCache:
+    """
+    Static evaluations remembered per position, usable as a Searcher evaluator
+
+    Scores are from the side to move's point of view, which a colour flip
+    leaves unchanged, so with a Canonicalizer a position and its flipped
+    twin share one entry and the cached score is returned as is
+
+    Design Considerations:
+    - The default canonicalizer does not mirror files: the piece-square
+      tables are not left-right symmetric, so mirrored positions do not
+      evaluate the same; pass Canonicalizer(mirror=True) for an evaluator
+      that is
+    - Bounded like the search TT, it starts over when full
+
+    Args:
+        evaluator: The evaluation being cached
+        capacity: Maximum number of stored scores
+        canonicalizer: Symmetry classes to share, colour flips by default
+    """
+    def __init__(self, evaluator: Callable[[ChessGame], int], capacity: int = 1 << 16,
+                 canonicalizer: Optional[Canonicalizer] = None):
+        self.evaluator = evaluator
+        self.capacity = capacity
+        self.canonicalizer = canonicalizer if canonicalizer is not None else Canonicalizer(mirror=False)
+        self.scores: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, game: ChessGame) -> int:
+        key = self.canonicalizer.canonical(game.board, game.current_turn).key
+        score = self.scores.get(key)
+        if score is not None:
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = self.evaluator(game)
+        if len(self.scores) >= self.capacity:
+            self.scores.clear()
+        self.scores[key] = score
+        return score
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,272 @@
+# src/engine/mate_solver.py
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.game.chess_game import ChessGame
+from src.game.moves import Move
+
+
+# proof and disproof numbers saturate here
+INFINITE = 10 ** 9
+
+PROVEN, DISPROVEN, UNKNOWN = "PROVEN", "DISPROVEN", "UNKNOWN"
+
+
+class MateResult:
+    """
+    Outcome of a mate search
+
+    status is PROVEN (the side to move mates within `moves`), DISPROVEN (it
+    cannot, whatever it does) or UNKNOWN (node budget ran out first)
+    """
+    def __init__(self, status: str, moves: int, line: List[Move], nodes: int):
+        self.status = status
+        self.moves = moves
+        self.line = line
+        self.nodes = nodes
+
+    @property
+    def best_move(self) -> Optional[Move]:
+        return self.line[0] if self.line else None
+
+    def __repr__(self):
+        return f"MateResult({self.status}, moves={self.moves}, line={self.line}, nodes={self.nodes})"
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class MateSolver:
+    """
+    Depth-first proof-number (df-pn) search for forced mates
+
+    The attacker (side to move at the root) only plays checking moves, the
+    defender answers with every legal evasion, so the tree is far smaller
+    than what an alpha-beta search has to look at to see the same mate.
+
+    Design Considerations:
+    - Proof and disproof numbers are stored per (Zobrist key, plies left),
+      since a position may be mate in 2 but not in 1
+    - The node table is bounded; like the search TT it starts over when
+      full, which costs re-expansion but never a wrong answer
+    - Moves are made and taken back on the caller's game, which is left
+      as it was; stop() may be called from another thread
+
+    Args:
+        table_size: Maximum number of stored nodes
+        max_nodes: Node budget per prove() call, None for unlimited
+    """
+    def __init__(self, table_size: int = 1 << 20, max_nodes: Optional[int] = 1_000_000):
+        self.table_size = table_size
+        self.max_nodes = max_nodes
+        self.table: Dict[int, Tuple[int, int]] = {}
+        self.nodes = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """
+        End the running proof with an UNKNOWN result; it stays stopped, so a
+        stop that lands before prove() starts is not lost, until reset()
+        """
+        self._stop_event.set()
+
+    def reset(self):
+        """
+        Allow proving again after stop(); call it before starting the
+        proof (and its thread), never from inside it
+        """
+        self._stop_event.clear()
+
+    def solve(self, game: ChessGame, max_moves: int) -> MateResult:
+        """
+        Shortest forced mate for the side to move, trying 1, 2 ... max_moves
+        """
+        nodes = 0
+        result = MateResult(DISPROVEN, 0, [], 0)
+        for moves in range(1, max_moves + 1):
+            result = self.prove(game, moves)
+            nodes += result.nodes
+            result.nodes = nodes
+            if result.status != DISPROVEN:
+                return result
+        return result
+
+    def prove(self, game: ChessGame, moves: int) -> MateResult:
+        """
+        Whether the side to move can force mate in at most `moves` moves
+        """
+        self.nodes = 0
+        plies = 2 * moves - 1
+        try:
+            self._mid(game, plies, INFINITE, INFINITE)
+        except _BudgetExceeded:
+            return MateResult(UNKNOWN, moves, [], self.nodes)
+
+        proof, _ = self._lookup(game.position_hash(), plies)
+        if proof == 0:
+            return MateResult(PROVEN, moves, self._proof_line(game, plies), self.nodes)
+        return MateResult(DISPROVEN, moves, [], self.nodes)
+
+    def mating_moves(self, game: ChessGame, moves: int) -> List[Move]:
+        """
+        Every first move that forces mate in at most `moves` moves
+
+        A puzzle has a unique solution when this returns a single move
+        """
+        winners = []
+        for move in self._checking_moves(game):
+            record = game.make_move(move, update_state=False)
+            try:
+                self.nodes = 0
+                plies = 2 * moves - 2
+                try:
+                    self._mid(game, plies, INFINITE, INFINITE)
+                except _BudgetExceeded:
+                    continue
+                # the defender's disproof number is the attacker's proof number
+                if self._lookup(game.position_hash(), plies)[1] == 0:
+                    winners.append(move)
+            finally:
+                game.unmake_move(record)
+        return winners
+
+    def _mid(self, game: ChessGame, plies: int, phi_threshold: int, delta_threshold: int):
+        """
+        Multiple iterative deepening step of df-pn
+
+        phi/delta are the proof/disproof numbers seen from the side to move:
+        (proof, disproof) at attacker nodes, (disproof, proof) at defender
+        nodes, so one routine serves both
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _BudgetExceeded()
+        if self._stop_event.is_set():
+            raise _BudgetExceeded()
+
+        key = game.position_hash()
+        phi, delta = self._lookup(key, plies)
+        if phi >= phi_threshold or delta >= delta_threshold:
+            return
+
+        children = self._expand(game, plies)
+        if children is None:
+            return
+
+        while True:
+            # phi(n) = min delta(child), delta(n) = sum phi(child)
+            best_index, best_delta, second_delta, phi_sum = -1, INFINITE, INFINITE, 0
+            best_phi = 0
+            for index, (_, child_key) in enumerate(children):
+                child_phi, child_delta = self._lookup(child_key, plies - 1)
+                phi_sum = min(phi_sum + child_phi, INFINITE)
+                if child_delta < best_delta:
+                    best_index, second_delta, best_delta, best_phi = index, best_delta, child_delta, child_phi
+                elif child_delta < second_delta:
+                    second_delta = child_delta
+
+            phi, delta = best_delta, phi_sum
+            if phi >= phi_threshold or delta >= delta_threshold:
+                self._store(key, plies, phi, delta)
+                return
+
+            child_phi_threshold = delta_threshold + best_phi - delta
+            child_delta_threshold = min(phi_threshold, second_delta + 1)
+            move = children[best_index][0]
+            record = game.make_move(move, update_state=False)
+            try:
+                self._mid(game, plies - 1, child_phi_threshold, child_delta_threshold)
+            finally:
+                game.unmake_move(record)
+
+    def _expand(self, game: ChessGame, plies: int) -> Optional[List[Tuple[Move, int]]]:
+        """
+        (move, child key) pairs to search, or None when the node is decided
+        here (and stored)
+        """
+        key = game.position_hash()
+        attacker = plies % 2 == 1
+
+        if attacker:
+            if plies <= 0:
+                self._store(key, plies, INFINITE, 0)
+                return None
+            children = self._checking_moves(game)
+            if not children:
+                # no check left: the attacker cannot force anything
+                self._store(key, plies, INFINITE, 0)
+                return None
+        else:
+            children = list(game.get_legal_moves())
+            if not children:
+                if game.is_in_check():
+                    # mated: the defender's disproof failed, the attacker proved
+                    self._store(key, plies, INFINITE, 0)
+                else:
+                    self._store(key, plies, 0, INFINITE)
+                return None
+            if plies <= 0:
+                # mate was not delivered in time
+                self._store(key, plies, 0, INFINITE)
+                return None
+
+        keyed = []
+        for move in children:
+            record = game.make_move(move, update_state=False)
+            keyed.append((move, game.position_hash()))
+            game.unmake_move(record)
+        return keyed
+
+    def _checking_moves(self, game: ChessGame) -> List[Move]:
+        checks = []
+        for move in game.get_legal_moves():
+            record = game.make_move(move, update_state=False)
+            if game.is_in_check():
+                checks.append(move)
+            game.unmake_move(record)
+        return checks
+
+    def _lookup(self, key: int, plies: int) -> Tuple[int, int]:
+        return self.table.get((key << 8) | plies, (1, 1))
+
+    def _store(self, key: int, plies: int, phi: int, delta: int):
+        table_key = (key << 8) | plies
+        if len(self.table) >= self.table_size and table_key not in self.table:
+            # crude but bounded: start over when the table is full
+            self.table.clear()
+        self.table[table_key] = (phi, delta)
+
+    def _proof_line(self, game: ChessGame, plies: int) -> List[Move]:
+        """
+        Follow proven children from the root to the mate
+        """
+        line, records = [], []
+        try:
+            while plies > 0:
+                attacker = plies % 2 == 1
+                next_move = None
+                for move in game.get_legal_moves():
+                    record = game.make_move(move, update_state=False)
+                    child_phi, child_delta = self._lookup(game.position_hash(), plies - 1)
+                    game.unmake_move(record)
+                    # attacker: a reply the defender cannot refute; defender:
+                    # a reply that lets the attacker still prove the mate
+                    if (child_delta == 0) if attacker else (child_phi == 0):
+                        next_move = move
+                        break
+                if next_move is None:
+                    break
+                line.append(next_move)
+                records.append(game.make_move(next_move, update_state=False))
+                plies -= 1
+        finally:
+            for record in reversed(records):
+                game.unmake_move(record)
+        return line
+
+
+def solve_mate(game: ChessGame, max_moves: int, max_nodes: Optional[int] = 1_000_000) -> MateResult:
+    """
+    One-shot shortest mate search with a fresh solver
+    """
+    return MateSolver(max_nodes=max_nodes).solve(game, max_moves)
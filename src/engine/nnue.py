@@ -0,0 +1,279 @@
+# src/engine/nnue.py
+import argparse
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from src.board.board import Board
+from src.game.chess_game import ChessGame
+from src.pieces.concrete_pieces import PIECE_CLASSES
+from src.pieces.piece import Color, PieceType
+
+
+# input features: (piece kind, square) for 6 piece types x 2 colours x 64 squares,
+# seen from one side; kinds 0-5 are that side's own pieces, 6-11 the opponent's
+FEATURES = 768
+HIDDEN = 128
+LAYER2 = 32
+
+# network output (about a pawn per unit) to centipawns
+DEFAULT_SCALE = 400.0
+
+# arrays of a weights file and their shapes given the accumulator size
+WEIGHT_SHAPES = {
+    'feature_weights': lambda hidden: (FEATURES, hidden),
+    'feature_bias': lambda hidden: (hidden,),
+    'hidden_weights': lambda hidden: (2 * hidden, LAYER2),
+    'hidden_bias': lambda hidden: (LAYER2,),
+    'output_weights': lambda hidden: (LAYER2,),
+    'output_bias': lambda hidden: (),
+}
+
+# more changed squares than this and a full refresh is cheaper
+REFRESH_LIMIT = 8
+
+_KINDS = {
+    color: {
+        PIECE_CLASSES[piece_type]: (0 if color is Color.WHITE else 6) + index
+        for index, piece_type in enumerate(PieceType)
+    }
+    for color in Color
+}
+
+
+class NNUEError(ValueError):
+    """
+    A weights file that is missing arrays or has the wrong shapes
+    """
+    pass
+
+
+class NetworkWeights:
+    """
+    Parameters of the evaluation network
+
+    768 piece-square inputs per side -> HIDDEN accumulator (shared weights,
+    one copy per side) -> clipped ReLU -> LAYER2 -> clipped ReLU -> 1
+
+    Design Considerations:
+    - columns holds, for every (absolute piece kind, square), the feature
+      column as seen by white and by black stacked together, so one array
+      addition moves a piece in both accumulators
+    - Stored as float32 .npz files; training happens elsewhere
+    """
+    def __init__(self, feature_weights: np.ndarray, feature_bias: np.ndarray,
+                 hidden_weights: np.ndarray, hidden_bias: np.ndarray,
+                 output_weights: np.ndarray, output_bias: np.ndarray,
+                 scale: float = DEFAULT_SCALE):
+        self.feature_weights = np.asarray(feature_weights, dtype=np.float32)
+        self.feature_bias = np.asarray(feature_bias, dtype=np.float32)
+        self.hidden_weights = np.asarray(hidden_weights, dtype=np.float32)
+        self.hidden_bias = np.asarray(hidden_bias, dtype=np.float32)
+        self.output_weights = np.asarray(output_weights, dtype=np.float32)
+        self.output_bias = np.asarray(output_bias, dtype=np.float32)
+        self.scale = float(scale)
+        self.hidden = self.feature_bias.shape[0]
+
+        for name, shape in WEIGHT_SHAPES.items():
+            actual = getattr(self, name).shape
+            if actual != shape(self.hidden):
+                raise NNUEError(f"{name} has shape {actual}, expected {shape(self.hidden)}")
+
+        # absolute feature (kind * 64 + square, kinds 0-5 white) -> the
+        # white-view and black-view feature; black sees the board flipped
+        # with the colours swapped
+        absolute = np.arange(FEATURES)
+        kinds, squares = absolute // 64, absolute % 64
+        black_view = ((kinds + 6) % 12) * 64 + (squares ^ 56)
+        self.columns = np.stack(
+            (self.feature_weights[absolute], self.feature_weights[black_view]), axis=1
+        )
+        self.bias = np.stack((self.feature_bias, self.feature_bias))
+
+        # second layer rows ordered [side to move, opponent] for each side to
+        # move, so the forward pass never has to concatenate the two halves
+        swapped = np.concatenate((self.hidden_weights[self.hidden:], self.hidden_weights[:self.hidden]))
+        self.hidden_by_side = np.stack((self.hidden_weights, swapped))
+
+    @classmethod
+    def random(cls, hidden: int = HIDDEN, seed: int = 0) -> 'NetworkWeights':
+        """
+        Small random weights, for tests and benchmarks
+        """
+        rng = np.random.default_rng(seed)
+        return cls(
+            rng.normal(0, 0.1, (FEATURES, hidden)), rng.normal(0.2, 0.1, hidden),
+            rng.normal(0, 0.1, (2 * hidden, LAYER2)), rng.normal(0, 0.1, LAYER2),
+            rng.normal(0, 0.5, LAYER2), np.float32(0.0),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'NetworkWeights':
+        with np.load(path, allow_pickle=False) as data:
+            missing = [name for name in WEIGHT_SHAPES if name not in data]
+            if missing:
+                raise NNUEError(f"{path} is missing {', '.join(missing)}")
+            arrays = {name: data[name] for name in WEIGHT_SHAPES}
+            scale = float(data['scale']) if 'scale' in data else DEFAULT_SCALE
+        return cls(scale=scale, **arrays)
+
+    def save(self, path: str):
+        np.savez(path, scale=np.float32(self.scale),
+                 **{name: getattr(self, name) for name in WEIGHT_SHAPES})
+
+
+def board_features(board: Board) -> List[int]:
+    """
+    Absolute feature index of every piece on the board
+    """
+    return [
+        _KINDS[piece.color][type(piece)] * 64 + square
+        for square, piece in enumerate(board.squares)
+        if piece is not None
+    ]
+
+
+class Accumulator:
+    """
+    First layer output for one board, from white's and from black's side
+
+    update() brings it in line with the board by subtracting the columns of
+    pieces that left a square and adding those of pieces that arrived, so a
+    move costs two to four column additions instead of a sum over all pieces
+
+    Design Considerations:
+    - Changes are found by comparing the board with a copy of the squares
+      taken at the last update, so it follows make/unmake, captures,
+      promotions and castling without Board knowing it exists, and costs
+      nothing while legal move generation tries moves out
+    - A different board, or a position far from the last one, is simply
+      refreshed from scratch
+    """
+    def __init__(self, weights: NetworkWeights):
+        self.weights = weights
+        self.values = weights.bias.copy()
+        self._board: Optional[Board] = None
+        self._squares: list = [None] * 64
+        self._placement_key: Optional[int] = None
+        self.refreshes = 0
+        self.updates = 0
+
+    def refresh(self, board: Board):
+        features = board_features(board)
+        self.values = self.weights.bias + self.weights.columns[features].sum(axis=0)
+        self._remember(board)
+        self.refreshes += 1
+
+    def update(self, board: Board):
+        if board is not self._board:
+            self.refresh(board)
+            return
+        if board.placement_key == self._placement_key:
+            return
+
+        before, after = self._squares, board.squares
+        changed = [square for square in range(64) if before[square] is not after[square]]
+        if len(changed) > REFRESH_LIMIT:
+            self.refresh(board)
+            return
+
+        columns, values = self.weights.columns, self.values
+        for square in changed:
+            old, new = before[square], after[square]
+            if old is not None:
+                values -= columns[_KINDS[old.color][type(old)] * 64 + square]
+            if new is not None:
+                values += columns[_KINDS[new.color][type(new)] * 64 + square]
+        self._remember(board)
+        self.updates += 1
+
+    def _remember(self, board: Board):
+        self._board = board
+        self._squares = list(board.squares)
+        self._placement_key = board.placement_key
+
+
+class NNUEEvaluator:
+    """
+    Network evaluation usable as a Searcher evaluator
+
+    Calling it with a game returns centipawns from the side to move's point
+    of view, like src.engine.evaluation.evaluate
+
+    Args:
+        weights: Network parameters (NetworkWeights.load for a trained file)
+    """
+    def __init__(self, weights: NetworkWeights):
+        self.weights = weights
+        self.accumulator = Accumulator(weights)
+
+    def __call__(self, game: ChessGame) -> int:
+        self.accumulator.update(game.board)
+        return self.forward(self.accumulator.values, game.current_turn)
+
+    def evaluate_full(self, game: ChessGame) -> int:
+        """
+        Same result with the accumulator computed from scratch (reference)
+        """
+        values = self.weights.bias + self.weights.columns[board_features(game.board)].sum(axis=0)
+        return self.forward(values, game.current_turn)
+
+    def forward(self, values: np.ndarray, side_to_move: Color) -> int:
+        weights = self.weights
+        # np.minimum/np.maximum: np.clip costs twice as much on arrays this small
+        inputs = np.minimum(np.maximum(values, 0.0), 1.0).reshape(-1)
+        hidden = inputs @ weights.hidden_by_side[0 if side_to_move is Color.WHITE else 1]
+        hidden = np.minimum(np.maximum(hidden + weights.hidden_bias, 0.0), 1.0)
+        return int((hidden @ weights.output_weights + weights.output_bias) * weights.scale)
+
+
+def load_evaluator(path: str) -> NNUEEvaluator:
+    return NNUEEvaluator(NetworkWeights.load(path))
+
+
+def benchmark(evaluator: NNUEEvaluator, game: ChessGame, plies: int = 3) -> Dict[str, float]:
+    """
+    Evaluations per second at every node of the tree `plies` deep from the
+    game, incrementally and with the accumulator recomputed each time
+
+    Only the evaluation calls are timed, not move generation
+    """
+    rates = {}
+    perf_counter = time.perf_counter
+    for name, evaluate in (('incremental', evaluator), ('full', evaluator.evaluate_full)):
+        count, elapsed = 0, 0.0
+        stack = [(plies, None)]
+        records = []
+        # depth first walk with an explicit stack; None marks "take back"
+        while stack:
+            depth, move = stack.pop()
+            if move is None and depth < 0:
+                game.unmake_move(records.pop())
+                continue
+            if move is not None:
+                records.append(game.make_move(move, update_state=False))
+                stack.append((-1, None))
+            start = perf_counter()
+            evaluate(game)
+            elapsed += perf_counter() - start
+            count += 1
+            if depth > 0:
+                stack.extend((depth - 1, child) for child in game.get_legal_moves())
+        rates[name] = count / elapsed
+    return rates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Network evaluation speed, incremental vs full")
+    parser.add_argument("weights", nargs="?", help=".npz weights file (random weights if omitted)")
+    parser.add_argument("--plies", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    weights = NetworkWeights.load(args.weights) if args.weights else NetworkWeights.random()
+    rates = benchmark(NNUEEvaluator(weights), ChessGame(), args.plies)
+    for name, rate in rates.items():
+        print(f"{name:12} {rate:10.0f} evals/s")
+    print(f"{'speedup':12} {rates['incremental'] / rates['full']:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
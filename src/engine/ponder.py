@@ -0,0 +1,108 @@
+# src/engine/ponder.py
+import threading
+import time
+from typing import Optional
+from src.engine.search import MAX_DEPTH, SearchLimits, SearchResult, Searcher
+from src.engine.time_manager import TimeBudget
+from src.game.chess_game import ChessGame
+from src.game.moves import Move
+
+
+class Ponderer:
+    """
+    Thinks on the opponent's time about the reply it expects
+
+    After the engine moves, start() searches the position after the
+    predicted reply (the second move of the principal variation) on a
+    background thread. When the opponent's move arrives, hit() either
+    finishes that search within the move's budget or, on a wrong guess,
+    drops it; the transposition table keeps what was learned either way
+
+    Design Considerations:
+    - The search runs on a private copy of the game, so the caller's game
+      can take the opponent's move while the thread is busy
+    - Only one search uses the searcher at a time: hit() and stop() wait for
+      the thread before anyone else may search with it
+    - start() takes limits, so a reply that never comes (a client gone
+      quiet) does not keep a thread searching forever
+
+    Args:
+        searcher: Searcher shared with the engine's own move searches
+    """
+    def __init__(self, searcher: Searcher):
+        self.searcher = searcher
+        self.expected: Optional[Move] = None
+        self.key: Optional[int] = None
+        self.result: Optional[SearchResult] = None
+        self.hits = 0
+        self.misses = 0
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    @property
+    def pondering(self) -> bool:
+        return self._thread is not None
+
+    def start(self, game: ChessGame, expected_reply: int, limits: Optional[SearchLimits] = None):
+        """
+        Begin searching the position after expected_reply (a legal move in game)
+
+        Args:
+            limits: When the ponder search gives up by itself; unlimited
+                    depth by default, so only hit() or stop() end it
+        """
+        limits = limits or SearchLimits(depth=MAX_DEPTH)
+        self.stop()
+        ponder_game = ChessGame.from_snapshot(game.snapshot())
+        ponder_game.make_move(expected_reply)
+        self.expected = Move(expected_reply)
+        self.key = ponder_game.position_hash()
+        self.result = None
+        self._started_at = time.perf_counter()
+
+        def ponder():
+            self.searcher.search(ponder_game, limits, on_iteration=self._record)
+
+        self.searcher.reset()
+        self._thread = threading.Thread(target=ponder, name="ponder", daemon=True)
+        self._thread.start()
+
+    def hit(self, game: ChessGame, budget: Optional[TimeBudget] = None) -> Optional[SearchResult]:
+        """
+        The opponent has moved and `game` is the position now to play
+
+        Returns:
+            The ponder search's result if it was searching this position,
+            after letting it run for what is left of budget.soft (time
+            already pondered counts); None if the guess was wrong
+        """
+        if self._thread is None:
+            return None
+        if game.position_hash() != self.key:
+            self.misses += 1
+            self.stop()
+            return None
+
+        self.hits += 1
+        if budget is not None:
+            wait = budget.soft - (time.perf_counter() - self._started_at)
+            if wait > 0:
+                self._thread.join(wait)
+        self.stop()
+        if self.result is None or self.result.best_move is None:
+            return None
+        return self.result
+
+    def stop(self):
+        """
+        End the ponder search, if any, and wait for its thread
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self.searcher.stop()
+        thread.join()
+        self._thread = None
+
+    def _record(self, result: SearchResult):
+        self.result = result
@@ -0,0 +1,382 @@
+# src/engine/search.py
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.engine.evaluation import PIECE_VALUES, evaluate
+from src.game.chess_game import ChessGame
+from src.game.moves import CAPTURE, CODE_MASK, PROMOTION_SHIFT, SQUARE_MASK, TO_SHIFT, Move
+
+
+MATE_SCORE = 100_000
+MATE_THRESHOLD = MATE_SCORE - 1_000
+INFINITY = 1_000_000
+MAX_DEPTH = 64
+
+# transposition table bound types
+EXACT, LOWER_BOUND, UPPER_BOUND = range(3)
+
+# how often (in nodes) the clock and the stop flag are looked at
+CHECK_INTERVAL = 512
+
+
+class SearchLimits:
+    """
+    When a search has to stop: any combination of depth, time and nodes
+
+    Args:
+        depth: Maximum iterative deepening depth
+        movetime: Seconds the search may use
+        nodes: Node budget
+    """
+    def __init__(self, depth: Optional[int] = None, movetime: Optional[float] = None,
+                 nodes: Optional[int] = None):
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+
+    def __repr__(self):
+        return f"SearchLimits(depth={self.depth}, movetime={self.movetime}, nodes={self.nodes})"
+
+
+class PVLine(NamedTuple):
+    """
+    One of the best root moves with its exact score and continuation
+    """
+    score: int
+    pv: List[Move]
+
+
+class SearchResult:
+    """
+    Outcome of the deepest completed iteration
+
+    lines holds the multipv best lines, best first; lines[0] is (score, pv)
+    """
+    def __init__(self, best_move: Optional[Move], score: int, depth: int, nodes: int,
+                 elapsed: float, pv: List[Move], lines: Optional[List[PVLine]] = None):
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = pv
+        self.lines = lines if lines is not None else [PVLine(score, pv)]
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    def mate_in(self) -> Optional[int]:
+        """
+        Moves to mate (negative when being mated), None for normal scores
+        """
+        if abs(self.score) < MATE_THRESHOLD:
+            return None
+        plies = MATE_SCORE - abs(self.score)
+        moves = (plies + 1) // 2
+        return moves if self.score > 0 else -moves
+
+    def __repr__(self):
+        return (f"SearchResult(best_move={self.best_move!r}, score={self.score}, "
+                f"depth={self.depth}, nodes={self.nodes})")
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside the tree when a limit is hit or stop() was called
+    """
+    pass
+
+
+class Searcher:
+    """
+    Iterative deepening alpha-beta search over ChessGame
+
+    Design Considerations:
+    - Moves are made and taken back on the caller's game, which is left
+      exactly as it was
+    - The transposition table lives on the searcher, so successive searches
+      on related positions reuse it
+    - stop() may be called from another thread and stays in force until
+      the owner calls reset(); search() never clears it, so a stop that
+      arrives before a search thread gets going is not lost
+    """
+    def __init__(self, evaluator: Callable[[ChessGame], int] = evaluate, tt_size: int = 1 << 18):
+        self.evaluator = evaluator
+        self.tt_size = tt_size
+        self.tt: Dict[int, Tuple[int, int, int, int]] = {}
+        self.nodes = 0
+        self._stop_event = threading.Event()
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+
+    def stop(self):
+        self._stop_event.set()
+
+    def reset(self):
+        """
+        Allow searching again after stop(); call it before starting the
+        search (and its thread), never from inside it
+        """
+        self._stop_event.clear()
+
+    def clear(self):
+        self.tt.clear()
+
+    def search(self, game: ChessGame, limits: SearchLimits,
+               on_iteration: Optional[Callable[[SearchResult], None]] = None,
+               multipv: int = 1) -> SearchResult:
+        """
+        Search the current position until one of the limits is reached
+
+        Args:
+            game: Position to search, restored before returning
+            limits: Depth / time / node limits, no limits means depth 4
+            on_iteration: Called with the result of every completed depth
+            multipv: Number of best root moves to score exactly (see _root_lines)
+        """
+        self.nodes = 0
+        start = time.perf_counter()
+        self._deadline = start + limits.movetime if limits.movetime is not None else None
+        self._node_limit = limits.nodes
+
+        max_depth = limits.depth or (MAX_DEPTH if limits.movetime or limits.nodes else 4)
+        result = SearchResult(None, 0, 0, 0, 0.0, [])
+
+        root_moves = list(game.get_legal_moves())
+        if not root_moves:
+            result.score = -MATE_SCORE if game.is_in_check() else 0
+            return result
+        # always have something to play, even if depth 1 gets cut short
+        result.best_move = root_moves[0]
+        if multipv > 1:
+            entry = self.tt.get(game.position_hash())
+            root_moves = self._ordered(game, root_moves, entry[3] if entry is not None else 0)
+
+        for depth in range(1, max_depth + 1):
+            try:
+                if multipv > 1:
+                    lines = self._root_lines(game, depth, root_moves, multipv)
+                    score, pv = lines[0]
+                else:
+                    score = self._negamax(game, depth, -INFINITY, INFINITY, 0)
+                    pv = self._principal_variation(game, depth)
+                    lines = None
+            except SearchAborted:
+                break
+
+            elapsed = time.perf_counter() - start
+            result = SearchResult(pv[0] if pv else result.best_move, score, depth, self.nodes, elapsed, pv, lines)
+            # the next iteration tries this one's best moves first
+            if lines is not None:
+                best = [line.pv[0] for line in lines]
+                root_moves = best + [move for move in root_moves if move not in best]
+            if on_iteration:
+                on_iteration(result)
+                # a callback may stop() the search between iterations
+                if self._stop_event.is_set():
+                    break
+
+            # a forced mate will not change with more depth
+            if abs(score) >= MATE_THRESHOLD and MATE_SCORE - abs(score) <= depth:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _check_limits(self):
+        if self._stop_event.is_set():
+            raise SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted()
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchAborted()
+
+    def _negamax(self, game: ChessGame, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_limits()
+
+        key = game.position_hash()
+        original_alpha = alpha
+        tt_move = 0
+        entry = self.tt.get(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, tt_move = entry
+            if entry_depth >= depth and ply > 0:
+                score = _score_from_tt(entry_score, ply)
+                if entry_flag == EXACT:
+                    return score
+                if entry_flag == LOWER_BOUND and score >= beta:
+                    return score
+                if entry_flag == UPPER_BOUND and score <= alpha:
+                    return score
+
+        moves = game.get_legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if game.is_in_check() else 0
+        if depth <= 0:
+            return self._quiescence(game, alpha, beta, ply)
+
+        best_score, best_move = -INFINITY, 0
+        for move in self._ordered(game, moves, tt_move):
+            record = game.make_move(move, update_state=False)
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.unmake_move(record)
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._store(key, depth, _score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _root_lines(self, game: ChessGame, depth: int, root_moves: List[Move], count: int) -> List[PVLine]:
+        """
+        The count best root moves with exact scores, in one pass
+
+        Each move is searched with alpha at the count-th best score found so
+        far: a move that beats it gets an exact score and enters the list,
+        one that does not can only be worse than all of them
+        """
+        self.nodes += 1
+        scored: List[Tuple[int, Move]] = []
+        for move in root_moves:
+            alpha = scored[count - 1][0] if len(scored) >= count else -INFINITY
+            record = game.make_move(move, update_state=False)
+            try:
+                score = -self._negamax(game, depth - 1, -INFINITY, -alpha, 1)
+            finally:
+                game.unmake_move(record)
+            if score > alpha:
+                scored.append((score, move))
+                scored.sort(key=lambda entry: -entry[0])
+                del scored[count:]
+
+        best_score, best_move = scored[0]
+        self._store(game.position_hash(), depth, _score_to_tt(best_score, 0), EXACT, best_move)
+        lines = []
+        for score, move in scored:
+            record = game.make_move(move, update_state=False)
+            try:
+                pv = [move] + self._principal_variation(game, depth - 1)
+            finally:
+                game.unmake_move(record)
+            lines.append(PVLine(score, pv))
+        return lines
+
+    def _quiescence(self, game: ChessGame, alpha: int, beta: int, ply: int) -> int:
+        """
+        Only captures and promotions, so the static evaluation is never
+        taken in the middle of an exchange
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_limits()
+
+        stand_pat = self.evaluator(game)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        tactical = [move for move in game.get_legal_moves().raw() if move & CAPTURE or (move >> PROMOTION_SHIFT) & 0b111]
+        for move in self._ordered(game, tactical, 0):
+            record = game.make_move(move, update_state=False)
+            try:
+                if not game.get_legal_moves():
+                    score = MATE_SCORE - ply - 1 if game.is_in_check() else 0
+                else:
+                    score = -self._quiescence(game, -beta, -alpha, ply + 1)
+            finally:
+                game.unmake_move(record)
+
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _ordered(self, game: ChessGame, moves, tt_move: int) -> List[int]:
+        """
+        Hash move first, then captures by most valuable victim / least valuable attacker
+        """
+        squares = game.board.squares
+
+        def priority(move: int) -> int:
+            if tt_move and move & CODE_MASK == tt_move & CODE_MASK:
+                return -INFINITY
+            score = 0
+            if move & CAPTURE:
+                victim = squares[(move >> TO_SHIFT) & SQUARE_MASK]
+                attacker = squares[move & SQUARE_MASK]
+                victim_value = PIECE_VALUES[victim.piece_type] if victim is not None else PIECE_VALUES[attacker.piece_type]
+                score -= 10 * victim_value - PIECE_VALUES[attacker.piece_type] // 10
+            score -= 100 * ((move >> PROMOTION_SHIFT) & 0b111)
+            return score
+
+        return sorted(moves, key=priority)
+
+    def _store(self, key: int, depth: int, score: int, flag: int, move: int):
+        if len(self.tt) >= self.tt_size and key not in self.tt:
+            # crude but bounded: start over when the table is full
+            self.tt.clear()
+        self.tt[key] = (depth, score, flag, move)
+
+    def _principal_variation(self, game: ChessGame, depth: int) -> List[Move]:
+        """
+        Follow hash moves from the root to rebuild the best line
+        """
+        pv, records = [], []
+        try:
+            for _ in range(depth):
+                entry = self.tt.get(game.position_hash())
+                if entry is None or not entry[3]:
+                    break
+                move = game.get_legal_moves().find(entry[3] & SQUARE_MASK, (entry[3] >> TO_SHIFT) & SQUARE_MASK,
+                                                   (entry[3] >> PROMOTION_SHIFT) & 0b111)
+                if move is None:
+                    break
+                pv.append(move)
+                records.append(game.make_move(move, update_state=False))
+        finally:
+            for record in reversed(records):
+                game.unmake_move(record)
+        return pv
+
+
+def find_best_move(game: ChessGame, limits: SearchLimits) -> SearchResult:
+    """
+    One-shot search with a fresh searcher
+
+    A module level function so it can be handed to thread or process
+    pool executors together with a copy of the game
+    """
+    return Searcher().search(game, limits)
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    # mate scores are stored relative to the node, not the root
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
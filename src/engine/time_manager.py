@@ -0,0 +1,151 @@
+# src/engine/time_manager.py
+from typing import Callable, Optional
+from src.engine.search import MATE_THRESHOLD, SearchLimits, SearchResult, Searcher
+from src.game.chess_game import ChessGame
+from src.game.clock import ChessClock
+
+
+# moves a game is assumed to still last when the time control does not say
+DEFAULT_MOVES_TO_GO = 30
+
+# seconds kept back per move for transmission and bookkeeping
+MOVE_OVERHEAD = 0.05
+
+# hard budget: a multiple of the soft one, never more than this share of the clock
+HARD_FACTOR = 4.0
+MAX_CLOCK_SHARE = 0.5
+
+# each iteration takes roughly this many times the previous one (measured
+# 4-7x for this searcher from the opening)
+BRANCHING_ESTIMATE = 5.0
+
+# soft budget scaling by how settled the search looks
+UNSTABLE_FACTOR = 1.5       # best move just changed
+STABLE_FACTOR = 0.6         # same best move for STABLE_ITERATIONS iterations
+FALLING_FACTOR = 1.3        # score dropped by more than FALLING_MARGIN
+STABLE_ITERATIONS = 3
+FALLING_MARGIN = 30
+
+
+class TimeBudget:
+    """
+    Time for one move: the search aims for soft and is cut off at hard
+    """
+    def __init__(self, soft: float, hard: float):
+        self.soft = soft
+        self.hard = hard
+
+    def __repr__(self):
+        return f"TimeBudget(soft={self.soft:.3f}, hard={self.hard:.3f})"
+
+
+class IterationController:
+    """
+    Decides after every completed depth whether to start another one
+
+    Passed to Searcher.search as on_iteration; it stops the searcher when
+    the time used, scaled by how stable the best move and score have
+    been, reaches the soft budget, or when the next iteration would not
+    finish before the hard one
+
+    Args:
+        budget: Soft and hard time for this move
+        searcher: The searcher to stop
+        on_iteration: Further callback for every iteration (info output ...)
+    """
+    def __init__(self, budget: TimeBudget, searcher: Searcher,
+                 on_iteration: Optional[Callable[[SearchResult], None]] = None):
+        self.budget = budget
+        self.searcher = searcher
+        self.on_iteration = on_iteration
+        self.best_move = None
+        self.stable_iterations = 0
+        self.last_score: Optional[int] = None
+        self.last_elapsed = 0.0
+        self.factor = 1.0
+
+    def __call__(self, result: SearchResult):
+        if self.on_iteration:
+            self.on_iteration(result)
+
+        if result.best_move == self.best_move:
+            self.stable_iterations += 1
+        else:
+            self.best_move = result.best_move
+            self.stable_iterations = 0
+
+        factor = 1.0
+        if self.stable_iterations == 0 and result.depth > 1:
+            factor *= UNSTABLE_FACTOR
+        elif self.stable_iterations >= STABLE_ITERATIONS:
+            factor *= STABLE_FACTOR
+        if self.last_score is not None and result.score < self.last_score - FALLING_MARGIN:
+            factor *= FALLING_FACTOR
+        self.factor = factor
+        self.last_score = result.score
+
+        iteration_time = result.elapsed - self.last_elapsed
+        self.last_elapsed = result.elapsed
+        if self.should_stop(result, iteration_time):
+            self.searcher.stop()
+
+    def should_stop(self, result: SearchResult, iteration_time: float) -> bool:
+        if abs(result.score) >= MATE_THRESHOLD:
+            return True
+        if result.elapsed >= self.budget.soft * self.factor:
+            return True
+        # starting a depth the hard limit will cut short wastes the time
+        return result.elapsed + iteration_time * BRANCHING_ESTIMATE > self.budget.hard
+
+
+class TimeManager:
+    """
+    Turns the clock into per-move search budgets
+
+    Design Considerations:
+    - The soft budget is an even share of the remaining time over the moves
+      still expected plus most of the increment; the hard budget is a few
+      soft budgets but never more than half of what is left
+    - Stability is judged from the iterations of the search itself, so an
+      easy recapture is played quickly and a sudden crisis gets more time
+    """
+    def __init__(self, moves_to_go: int = DEFAULT_MOVES_TO_GO, move_overhead: float = MOVE_OVERHEAD):
+        self.moves_to_go = moves_to_go
+        self.move_overhead = move_overhead
+
+    def budget(self, remaining: float, increment: float = 0.0,
+               moves_to_go: Optional[int] = None) -> TimeBudget:
+        """
+        Budget for a move with `remaining` seconds on the clock
+        """
+        available = max(0.0, remaining - self.move_overhead)
+        moves = max(1, moves_to_go if moves_to_go is not None else self.moves_to_go)
+        soft = available / moves + increment * 0.75
+        hard = min(soft * HARD_FACTOR, available * MAX_CLOCK_SHARE + increment * 0.75)
+        # with one move to the time control the whole clock may be used
+        if moves_to_go == 1:
+            hard = available
+        soft = min(soft, hard)
+        return TimeBudget(soft, max(hard, 0.001))
+
+    def clock_budget(self, game: ChessGame, clock: Optional[ChessClock] = None,
+                     moves_to_go: Optional[int] = None) -> TimeBudget:
+        """
+        Budget for the side to move from a game clock (the game's own by default)
+        """
+        clock = clock or game.clock
+        if clock is None:
+            raise ValueError("Game has no clock")
+        return self.budget(clock.time_left(game.current_turn), clock.control.increment, moves_to_go)
+
+    def search(self, searcher: Searcher, game: ChessGame, budget: TimeBudget,
+               on_iteration: Optional[Callable[[SearchResult], None]] = None) -> SearchResult:
+        """
+        Search the position within the budget
+
+        The controller ends the search with stop(), so a searcher used
+        again afterwards has to be reset() by its owner first
+        """
+        controller = IterationController(budget, searcher, on_iteration)
+        return searcher.search(game, SearchLimits(movetime=budget.hard), on_iteration=controller)
+
@@ -0,0 +1,247 @@
+# src/engine/uci_protocol.py
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, TextIO, Tuple
+from src.engine.search import MAX_DEPTH, SearchLimits, SearchResult, Searcher
+from src.engine.time_manager import IterationController, TimeBudget, TimeManager
+from src.game.chess_game import ChessGame
+from src.notation.coordinate import move_to_uci, uci_to_move
+from src.notation.fen import FENError, game_from_fen
+from src.pieces.piece import Color
+
+
+ENGINE_NAME = "OOP Chess"
+ENGINE_AUTHOR = "IsaacSemb"
+
+
+class UCIEngine:
+    """
+    Universal Chess Interface front-end around Searcher
+    
+    Design Considerations:
+    - `go` starts the search on a background thread so `stop`, `isready`
+      and `quit` are answered while it runs
+    - Output goes through one locked writer, the search thread prints
+      `info` and `bestmove` lines itself
+    - Clock times go through TimeManager; `go ponder` searches without a
+      limit and `ponderhit` turns it into a normal timed search, so time
+      spent pondering a correct guess is time saved
+    - A `position` that cannot be set up (bad FEN, illegal move) leaves no
+      position at all, and `go` answers `bestmove 0000`, rather than
+      searching whatever position came before
+    """
+    def __init__(self, output: Optional[Callable[[str], None]] = None):
+        self._output = output or self._print
+        self._output_lock = threading.Lock()
+        self.game: Optional[ChessGame] = ChessGame()
+        self.searcher = Searcher()
+        self.time_manager = TimeManager()
+        self._search_thread: Optional[threading.Thread] = None
+        # cleared while pondering or searching infinitely: bestmove must
+        # wait for ponderhit or stop
+        self._ponder_release = threading.Event()
+        self._pondering = False
+        self._ponder_budget: Optional[TimeBudget] = None
+        self._ponder_timer: Optional[threading.Timer] = None
+        self._ponder_started = 0.0
+    
+    def run(self, stream: TextIO = sys.stdin):
+        """
+        Read commands until `quit` or end of input
+        
+        `quit` interrupts a running search, end of input lets it finish
+        """
+        for line in stream:
+            if not self.handle(line):
+                self._stop_search()
+                return
+        self.wait()
+    
+    def handle(self, line: str) -> bool:
+        """
+        Process one command line, returning False once the engine should exit
+        """
+        parts = line.split()
+        if not parts:
+            return True
+        
+        command, args = parts[0], parts[1:]
+        if command == 'uci':
+            self._send(f"id name {ENGINE_NAME}")
+            self._send(f"id author {ENGINE_AUTHOR}")
+            self._send("uciok")
+        elif command == 'isready':
+            self._send("readyok")
+        elif command == 'ucinewgame':
+            self._stop_search()
+            self.game = ChessGame()
+            self.searcher.clear()
+        elif command == 'position':
+            self._stop_search()
+            self._set_position(args)
+        elif command == 'go':
+            self._stop_search()
+            if self.game is None:
+                self._send("bestmove 0000")
+                return True
+            limits, budget = self._parse_go(args)
+            self._start_search(limits, budget, ponder='ponder' in args, infinite='infinite' in args)
+        elif command == 'ponderhit':
+            self._ponder_hit()
+        elif command == 'stop':
+            self._stop_search()
+        elif command == 'quit':
+            return False
+        # unknown commands are ignored, as the protocol asks
+        return True
+    
+    def wait(self):
+        """
+        Block until the running search (if any) has printed its bestmove
+        """
+        if self._search_thread is not None:
+            self._search_thread.join()
+    
+    def _set_position(self, args: List[str]):
+        if not args:
+            return
+        # until the new position is set up, go has nothing to search
+        self.game = None
+        moves_at = args.index('moves') if 'moves' in args else len(args)
+        if args[0] == 'startpos':
+            game = ChessGame()
+        elif args[0] == 'fen':
+            try:
+                game = game_from_fen(' '.join(args[1:moves_at]))
+            except FENError as error:
+                self._send(f"info string bad fen: {error}")
+                return
+        else:
+            self._send(f"info string unknown position {args[0]}")
+            return
+        
+        for text in args[moves_at + 1:]:
+            move = uci_to_move(game, text)
+            if move is None:
+                self._send(f"info string illegal move {text}")
+                return
+            game.play_move(move)
+        self.game = game
+    
+    def _parse_go(self, args: List[str]) -> Tuple[SearchLimits, Optional[TimeBudget]]:
+        values = {}
+        infinite = False
+        index = 0
+        while index < len(args):
+            token = args[index]
+            if token in ('infinite', 'ponder'):
+                infinite = infinite or token == 'infinite'
+                index += 1
+                continue
+            if index + 1 < len(args):
+                try:
+                    values[token] = int(args[index + 1])
+                except ValueError:
+                    pass
+            index += 2
+        
+        if infinite:
+            return SearchLimits(depth=MAX_DEPTH), None
+        
+        budget = None
+        movetime = values.get('movetime')
+        if movetime is None:
+            white = self.game.current_turn == Color.WHITE
+            remaining = values.get('wtime' if white else 'btime')
+            increment = values.get('winc' if white else 'binc', 0)
+            if remaining is not None:
+                budget = self.time_manager.budget(remaining / 1000, increment / 1000, values.get('movestogo'))
+        
+        limits = SearchLimits(
+            depth=values.get('depth'),
+            movetime=movetime / 1000 if movetime is not None else budget.hard if budget is not None else None,
+            nodes=values.get('nodes'),
+        )
+        if limits.depth is None and limits.movetime is None and limits.nodes is None:
+            limits.depth = MAX_DEPTH
+        return limits, budget
+    
+    def _start_search(self, limits: SearchLimits, budget: Optional[TimeBudget] = None,
+                      ponder: bool = False, infinite: bool = False):
+        game = self.game
+        self._pondering = ponder
+        if ponder:
+            # think on the opponent's time until ponderhit or stop
+            self._ponder_release.clear()
+            self._ponder_budget = budget
+            self._ponder_started = time.perf_counter()
+            limits = SearchLimits(depth=MAX_DEPTH)
+            on_iteration = self._send_info
+        else:
+            # an infinite search may end by itself (mate found, depth cap)
+            # but reports bestmove only after stop
+            if infinite:
+                self._ponder_release.clear()
+            else:
+                self._ponder_release.set()
+            on_iteration = IterationController(budget, self.searcher, self._send_info) if budget else self._send_info
+        
+        def search():
+            result = self.searcher.search(game, limits, on_iteration=on_iteration)
+            self._ponder_release.wait()
+            best = move_to_uci(result.best_move) if result.best_move is not None else '0000'
+            if len(result.pv) > 1:
+                self._send(f"bestmove {best} ponder {move_to_uci(result.pv[1])}")
+            else:
+                self._send(f"bestmove {best}")
+        
+        # cleared here, before the thread exists, so an early stop still counts
+        self.searcher.reset()
+        self._search_thread = threading.Thread(target=search, name="uci-search", daemon=True)
+        self._search_thread.start()
+    
+    def _ponder_hit(self):
+        """
+        The predicted move was played: the ponder search becomes the real one
+        
+        Time already pondered counts against the soft budget, so a long
+        enough ponder answers at once
+        """
+        if self._search_thread is None or not self._pondering:
+            return
+        self._pondering = False
+        self._ponder_release.set()
+        if self._ponder_budget is not None:
+            wait = max(0.0, self._ponder_budget.soft - (time.perf_counter() - self._ponder_started))
+            self._ponder_timer = threading.Timer(wait, self.searcher.stop)
+            self._ponder_timer.daemon = True
+            self._ponder_timer.start()
+    
+    def _stop_search(self):
+        if self._ponder_timer is not None:
+            self._ponder_timer.cancel()
+            self._ponder_timer = None
+        if self._search_thread is not None:
+            self._pondering = False
+            self._ponder_release.set()
+            self.searcher.stop()
+            self._search_thread.join()
+            self._search_thread = None
+    
+    def _send_info(self, result: SearchResult):
+        mate = result.mate_in()
+        score = f"mate {mate}" if mate is not None else f"cp {result.score}"
+        pv = ' '.join(move_to_uci(move) for move in result.pv)
+        self._send(
+            f"info depth {result.depth} score {score} nodes {result.nodes} "
+            f"nps {result.nps} time {int(result.elapsed * 1000)} pv {pv}".rstrip()
+        )
+    
+    def _send(self, text: str):
+        with self._output_lock:
+            self._output(text)
+    
+    @staticmethod
+    def _print(text: str):
+        print(text, flush=True)
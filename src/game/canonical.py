@@ -0,0 +1,156 @@
+# src/game/canonical.py
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
+from src.game.moves import MoveList, TO_SHIFT
+from src.game.zobrist import (
+    CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY, castling_rights, en_passant_file
+)
+from src.pieces.piece import Color
+
+
+# symmetry transforms, combinable bit flags
+IDENTITY = 0
+FLIP = 1      # colours swapped and ranks reversed (a1 <-> a8, white <-> black)
+MIRROR = 2    # files reversed (a1 <-> h1), only while nobody can castle
+TRANSFORMS = (IDENTITY, FLIP, MIRROR, FLIP | MIRROR)
+
+# a square index maps to square ^ _SQUARE_XOR[transform]; all four are involutions
+_SQUARE_XOR = (0, 56, 7, 63)
+_MOVE_XOR = tuple(xor | (xor << TO_SHIFT) for xor in _SQUARE_XOR)
+
+# castling right i (see CASTLING_SQUARES) held by the other colour after a flip
+_FLIPPED_RIGHT = (2, 3, 0, 1)
+
+
+def transform_square(square: int, transform: int) -> int:
+    return square ^ _SQUARE_XOR[transform]
+
+
+def transform_move(move: int, transform: int) -> int:
+    """
+    A packed move in the transformed frame; applying it twice gives it back
+
+    Flags are kept, a capture stays a capture and so on
+    """
+    return move ^ _MOVE_XOR[transform]
+
+
+def transform_moves(moves: MoveList, transform: int) -> MoveList:
+    """
+    Compacted copy of a move list with every move transformed
+    """
+    return moves.remapped(_MOVE_XOR[transform])
+
+
+def transform_color(color: Color, transform: int) -> Color:
+    if transform & FLIP:
+        return Color.BLACK if color is Color.WHITE else Color.WHITE
+    return color
+
+
+class Canonical(NamedTuple):
+    """
+    Key of a position's class under the symmetries, and the transform
+    taking the position to the class representative
+    """
+    key: int
+    transform: int
+
+    @property
+    def move_xor(self) -> int:
+        """
+        Mask that transforms packed moves either way (MoveList.remapped)
+        """
+        return _MOVE_XOR[self.transform]
+
+    def to_canonical(self, move: int) -> int:
+        return move ^ _MOVE_XOR[self.transform]
+
+    def from_canonical(self, move: int) -> int:
+        # every transform is its own inverse
+        return move ^ _MOVE_XOR[self.transform]
+
+
+class Canonicalizer:
+    """
+    Maps a board and side to move onto one key per symmetry class
+
+    A position and its colour-flipped twin (and, once castling rights are
+    gone, their left-right mirrors) have the same legal moves up to the
+    transform and the same evaluation from the side to move's point of
+    view, so caches keyed by the canonical key store each class once
+
+    Design Considerations:
+    - The canonical key is the smallest of the transformed positions'
+      ordinary Zobrist keys, so it lives in the same key space as
+      ChessGame.position_hash() and is the hash of a real position
+    - Placement keys of the transformed boards are remembered per
+      board placement key, so asking again (move cache, then evaluation
+      cache) costs a dictionary lookup
+    - Mirroring is optional: move generation is mirror symmetric without
+      castling, but an evaluation with lopsided tables is not
+
+    Args:
+        mirror: Also use the file mirror symmetries
+        cache_size: Placements whose transformed keys are remembered
+    """
+    def __init__(self, mirror: bool = True, cache_size: int = 4096):
+        self.mirror = mirror
+        self.cache_size = cache_size
+        self._placements: "OrderedDict[int, Tuple[int, int, int, int]]" = OrderedDict()
+        # (colour, piece class) -> per square (identity, flip, mirror, flip+mirror) keys
+        self._class_keys: Dict[Tuple[Color, type], List[Tuple[int, int, int, int]]] = {}
+
+    def canonical(self, board, side_to_move: Color) -> Canonical:
+        placements = self._placement_keys(board)
+        rights = castling_rights(board)
+        ep_file = en_passant_file(board, side_to_move)
+        transforms = TRANSFORMS if self.mirror and not any(rights) else TRANSFORMS[:2]
+
+        best = None
+        for transform in transforms:
+            key = placements[transform]
+            if transform_color(side_to_move, transform) is Color.BLACK:
+                key ^= SIDE_KEY
+            for index, right in enumerate(rights):
+                if right:
+                    key ^= CASTLING_KEYS[_FLIPPED_RIGHT[index] if transform & FLIP else index]
+            if ep_file is not None:
+                key ^= EN_PASSANT_KEYS[ep_file ^ 7 if transform & MIRROR else ep_file]
+            if best is None or key < best.key:
+                best = Canonical(key, transform)
+        return best
+
+    def _placement_keys(self, board) -> Tuple[int, int, int, int]:
+        placement_key = board.placement_key
+        keys = self._placements.get(placement_key)
+        if keys is not None:
+            self._placements.move_to_end(placement_key)
+            return keys
+
+        flip = mirror = flip_mirror = 0
+        class_keys = self._class_keys
+        for square, piece in enumerate(board.squares):
+            if piece is None:
+                continue
+            table = class_keys.get((piece.color, type(piece)))
+            if table is None:
+                table = class_keys[(piece.color, type(piece))] = self._square_keys(piece.color, piece.piece_type)
+            _, flipped, mirrored, both = table[square]
+            flip ^= flipped
+            mirror ^= mirrored
+            flip_mirror ^= both
+
+        keys = self._placements[placement_key] = (placement_key, flip, mirror, flip_mirror)
+        if len(self._placements) > self.cache_size:
+            self._placements.popitem(last=False)
+        return keys
+
+    @staticmethod
+    def _square_keys(color: Color, piece_type) -> List[Tuple[int, int, int, int]]:
+        own = PIECE_KEYS[(color, piece_type)]
+        other = PIECE_KEYS[(transform_color(color, FLIP), piece_type)]
+        return [
+            (own[square], other[square ^ 56], own[square ^ 7], other[square ^ 63])
+            for square in range(64)
+        ]
@@ -0,0 +1,214 @@
+# src/game/checkpoint.py
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from src.board.snapshot import CODE_KEYS, EMPTY, BoardSnapshot
+from src.game.moves import CODE_MASK, FLAGS_SHIFT, Move
+from src.game.zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, SIDE_KEY
+from src.pieces.piece import Color
+
+
+VERSION = 1
+
+# square contents by 4 bit value, two squares per byte (A1 low nibble first)
+NIBBLE_CODES = EMPTY + 'PNBRQKpnbrqk'
+_CODE_NIBBLES = {code: value for value, code in enumerate(NIBBLE_CODES)}
+
+# header flag bits
+HAS_CLOCK = 0b01
+HAS_START = 0b10
+
+# version, flags, game state index, ply, line length
+_HEADER = struct.Struct('<BBBHH')
+# side to move | castling << 1, en passant file + 1 (0 = none), squares
+_POSITION = struct.Struct('<BB32s')
+# white ms, black ms, initial ms, increment ms, running side (0 none, 1 white, 2 black)
+_CLOCK = struct.Struct('<iiIIB')
+_LENGTH = struct.Struct('<I')
+
+_RUNNING = (None, Color.WHITE, Color.BLACK)
+
+
+class CheckpointError(ValueError):
+    """
+    Raised for truncated, corrupt or unknown-version checkpoints
+    """
+    pass
+
+
+class ClockReading(NamedTuple):
+    """
+    A game clock frozen at checkpoint time, all times in seconds
+    """
+    white: float
+    black: float
+    initial: float
+    increment: float
+    running: Optional[Color]
+
+
+class CheckpointState(NamedTuple):
+    """
+    Everything a ChessGame checkpoint holds
+
+    Design Considerations:
+    - The position is stored directly, so restoring never replays the game;
+      the line is kept for history and undo, which replays it only when a
+      move before the checkpoint is taken back
+    - The game state is an index into the caller's state list, so this
+      module does not depend on ChessGame
+    """
+    position: BoardSnapshot
+    state: int
+    ply: int
+    line: List[Move]
+    clock: Optional[ClockReading]
+    start: Optional[BoardSnapshot]   # None for the standard starting position
+
+
+def pack_position(snapshot: BoardSnapshot) -> bytes:
+    """
+    34 bytes: side, castling and en passant, then 64 nibble piece codes
+    """
+    codes = [_CODE_NIBBLES[code] for rank in snapshot.ranks for code in rank]
+    squares = bytes([codes[index] | (codes[index + 1] << 4) for index in range(0, 64, 2)])
+    side = 1 if snapshot.side_to_move is Color.BLACK else 0
+    en_passant = 0 if snapshot.en_passant is None else snapshot.en_passant + 1
+    return _POSITION.pack(side | (snapshot.castling << 1), en_passant, squares)
+
+
+def unpack_position(data: bytes, offset: int = 0) -> BoardSnapshot:
+    """
+    The snapshot packed at data[offset:], its Zobrist key recomputed
+    """
+    try:
+        flags, en_passant, squares = _POSITION.unpack_from(data, offset)
+    except struct.error:
+        raise CheckpointError("Truncated position")
+    if en_passant > 8 or flags >> 5:
+        raise CheckpointError("Corrupt position flags")
+
+    codes = []
+    key = 0
+    try:
+        for index, byte in enumerate(squares):
+            for square, value in ((index * 2, byte & 0xF), (index * 2 + 1, byte >> 4)):
+                code = NIBBLE_CODES[value]
+                if code != EMPTY:
+                    key ^= CODE_KEYS[code][square]
+                codes.append(code)
+    except IndexError:
+        raise CheckpointError("Corrupt piece code")
+
+    side = Color.BLACK if flags & 1 else Color.WHITE
+    castling = flags >> 1
+    if side is Color.BLACK:
+        key ^= SIDE_KEY
+    for index in range(4):
+        if castling & (1 << index):
+            key ^= CASTLING_KEYS[index]
+    ep_file = en_passant - 1 if en_passant else None
+    if ep_file is not None:
+        key ^= EN_PASSANT_KEYS[ep_file]
+    ranks = tuple(tuple(codes[row * 8:row * 8 + 8]) for row in range(8))
+    return BoardSnapshot(ranks, side, castling, ep_file, key)
+
+
+def pack_state(state: CheckpointState) -> bytes:
+    """
+    Encode a checkpoint: a 7 byte header, the position, the optional clock
+    and start position, then three bytes per move of the line
+
+    A timed 20 ply game takes about 120 bytes
+    """
+    flags = (HAS_CLOCK if state.clock is not None else 0) | (HAS_START if state.start is not None else 0)
+    if len(state.line) > 0xFFFF:
+        raise CheckpointError("Line too long to checkpoint")
+    parts = [_HEADER.pack(VERSION, flags, state.state, state.ply, len(state.line)), pack_position(state.position)]
+
+    if state.clock is not None:
+        clock = state.clock
+        parts.append(_CLOCK.pack(
+            round(clock.white * 1000), round(clock.black * 1000),
+            round(clock.initial * 1000), round(clock.increment * 1000), _RUNNING.index(clock.running)
+        ))
+    if state.start is not None:
+        parts.append(pack_position(state.start))
+
+    # 16 bit storage codes, then the flag nibbles a byte each
+    codes = array('H', [move & CODE_MASK for move in state.line])
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    parts.append(codes.tobytes())
+    parts.append(bytes([move >> FLAGS_SHIFT for move in state.line]))
+    return b''.join(parts)
+
+
+def unpack_state(data: bytes) -> CheckpointState:
+    try:
+        version, flags, game_state, ply, length = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise CheckpointError("Truncated checkpoint header")
+    if version != VERSION:
+        raise CheckpointError(f"Unsupported checkpoint version {version}")
+    if ply > length:
+        raise CheckpointError(f"Ply {ply} beyond a line of {length} moves")
+    offset = _HEADER.size
+
+    position = unpack_position(data, offset)
+    offset += _POSITION.size
+
+    clock = None
+    if flags & HAS_CLOCK:
+        try:
+            white, black, initial, increment, running = _CLOCK.unpack_from(data, offset)
+        except struct.error:
+            raise CheckpointError("Truncated clock")
+        if running >= len(_RUNNING):
+            raise CheckpointError("Corrupt clock")
+        clock = ClockReading(white / 1000, black / 1000, initial / 1000, increment / 1000, _RUNNING[running])
+        offset += _CLOCK.size
+
+    start = None
+    if flags & HAS_START:
+        start = unpack_position(data, offset)
+        offset += _POSITION.size
+
+    if len(data) != offset + 3 * length:
+        raise CheckpointError("Truncated or oversized move line")
+    codes = array('H')
+    codes.frombytes(data[offset:offset + 2 * length])
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    move_flags = data[offset + 2 * length:]
+    line = [Move(code | (flag << FLAGS_SHIFT)) for code, flag in zip(codes, move_flags)]
+    return CheckpointState(position, game_state, ply, line, clock, start)
+
+
+def pack_many(checkpoints: Iterable[bytes]) -> bytes:
+    """
+    Concatenate checkpoints, each behind a 4 byte length
+    """
+    parts = []
+    for checkpoint in checkpoints:
+        parts.append(_LENGTH.pack(len(checkpoint)))
+        parts.append(checkpoint)
+    return b''.join(parts)
+
+
+def unpack_many(data: bytes) -> Iterator[bytes]:
+    """
+    The checkpoints of a pack_many blob, in order
+    """
+    offset = 0
+    while offset < len(data):
+        try:
+            (length,) = _LENGTH.unpack_from(data, offset)
+        except struct.error:
+            raise CheckpointError("Truncated checkpoint length")
+        offset += _LENGTH.size
+        if offset + length > len(data):
+            raise CheckpointError("Truncated checkpoint")
+        yield data[offset:offset + length]
+        offset += length
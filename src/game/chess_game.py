@@ -1,35 +1,192 @@
-from typing import Optional, Tuple, List
+from typing import Iterable, Optional, Tuple, List, Type
 from src.board.board import Board
+from src.board.snapshot import BoardSnapshot
+from src.game.checkpoint import (
+    CheckpointState, ClockReading, pack_many, pack_state, unpack_many, unpack_state
+)
+from src.game.clock import ChessClock, TimeControl
+from src.game.moves import (
+    CASTLING, DOUBLE_PUSH, EN_PASSANT, SQUARES, Move, MoveList, promotion_code
+)
+from src.game.move_cache import LegalMoveCache
 from src.game.validation import MoveValidator
-from src.pieces.piece import Color, Position, Piece
+from src.game.zobrist import compute_hash
+from src.pieces.concrete_pieces import PIECE_CLASSES, Bishop, King, Knight, Pawn, Queen, Rook
+from src.pieces.piece import Color, PieceType, Position, Piece
 
 class GameState:
     ACTIVE = "ACTIVE"
     CHECKMATE = "CHECKMATE" 
     STALEMATE = "STALEMATE"
     DRAW = "DRAW"
+    TIMEOUT = "TIMEOUT"
+
+
+# game states by their index in a checkpoint
+_CHECKPOINT_STATES = (
+    GameState.ACTIVE, GameState.CHECKMATE, GameState.STALEMATE, GameState.DRAW, GameState.TIMEOUT
+)
+
+class UndoRecord:
+    """
+    Everything make_move changed that the move itself does not tell us
+    
+    Design Considerations:
+    - Taking a move back restores this record instead of replaying the game
+    - The cached legal move list is kept so it survives the round trip
+    """
+    __slots__ = (
+        'move', 'piece', 'captured', 'capture_position', 'had_moved',
+        'rook_had_moved', 'double_pushers', 'game_state', 'legal_moves', 'legal_moves_key'
+    )
+    
+    def __init__(self, move, piece, captured, capture_position, had_moved, rook_had_moved,
+                 double_pushers, game_state, legal_moves, legal_moves_key):
+        self.move = move
+        self.piece = piece
+        self.captured = captured
+        self.capture_position = capture_position
+        self.had_moved = had_moved
+        self.rook_had_moved = rook_had_moved
+        self.double_pushers = double_pushers
+        self.game_state = game_state
+        self.legal_moves = legal_moves
+        self.legal_moves_key = legal_moves_key
 
 
 class ChessGame:
-    def __init__(self):
+    def __init__(self, move_cache: Optional[LegalMoveCache] = None,
+                 clock: Optional[ChessClock] = None):
+        """
+        Args:
+            move_cache: Legal move cache to use, pass one in to share it
+                        between games; each game gets its own otherwise
+            clock: Game clock pressed by every history move, None for an
+                   untimed game
+        """
         self.board = Board()
         self._current_turn = Color.WHITE
         self._game_state = GameState.ACTIVE
         self._initialize_board()
         
         self.validator = MoveValidator(self.board)
+        
+        # legal moves of the last position they were generated for, keyed by
+        # its Zobrist hash so validation, execution and game-over detection
+        # all share one generation per position
+        self._legal_moves: Optional[MoveList] = None
+        self._legal_moves_key: Optional[int] = None
+        
+        # older positions' lists, for transpositions and positions revisited
+        # through undo or by search
+        self.move_cache = move_cache if move_cache is not None else LegalMoveCache()
+        
+        self.clock = clock
+        
+        # the game line: moves before the current ply have their undo record
+        # in _records, moves after it (taken back, not yet replayed) stay in
+        # _line so redo/goto can play them again
+        self._line: List[Move] = []
+        self._records: List[UndoRecord] = []
+        
+        # a game restored from a checkpoint has no records for the moves
+        # before it until an undo reaches them (see _replay_records); the
+        # line is replayed from _start, None being the standard position
+        self._unrecorded = 0
+        self._start: Optional[BoardSnapshot] = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: BoardSnapshot,
+                      move_cache: Optional[LegalMoveCache] = None) -> 'ChessGame':
+        """
+        A game continuing from an immutable snapshot (see snapshot())
+        """
+        game = cls(move_cache)
+        game.board = snapshot.to_board()
+        game.validator = MoveValidator(game.board)
+        game._current_turn = snapshot.side_to_move
+        game._start = snapshot
+        game._update_game_state()
+        return game
+    
+    def checkpoint(self) -> bytes:
+        """
+        Compact binary copy of the game: position, state, clock and line
+        
+        About 40 bytes plus 3 per move of the line (17 more for a clock),
+        see src.game.checkpoint. Restoring does not replay the game, so
+        servers can save and reload thousands of games per second
+        
+        The move cache is not saved, and a running clock is charged up to
+        now and restarts when the game is restored
+        """
+        clock = None
+        if self.clock is not None:
+            clock = ClockReading(
+                self.clock.time_left(Color.WHITE), self.clock.time_left(Color.BLACK),
+                self.clock.control.initial, self.clock.control.increment, self.clock.running
+            )
+        return pack_state(CheckpointState(
+            self.snapshot(), _CHECKPOINT_STATES.index(self._game_state), self.ply,
+            self._line, clock, self._start
+        ))
+    
+    @classmethod
+    def restore(cls, data: bytes, move_cache: Optional[LegalMoveCache] = None) -> 'ChessGame':
+        """
+        The game saved by checkpoint()
+        
+        Raises:
+            CheckpointError: For truncated or corrupt data
+        """
+        game = cls.__new__(cls)
+        game._restore(unpack_state(data), move_cache)
+        return game
+    
+    @staticmethod
+    def checkpoint_many(games: Iterable['ChessGame']) -> bytes:
+        """
+        Checkpoints of many games in one blob, for restore_many
+        """
+        return pack_many(game.checkpoint() for game in games)
+    
+    @classmethod
+    def restore_many(cls, data: bytes, move_cache: Optional[LegalMoveCache] = None) -> List['ChessGame']:
+        """
+        The games of a checkpoint_many blob, in order, optionally sharing one move cache
+        """
+        return [cls.restore(checkpoint, move_cache) for checkpoint in unpack_many(data)]
+    
+    # pickling and copy.deepcopy go through the compact checkpoint
+    def __getstate__(self) -> bytes:
+        return self.checkpoint()
+    
+    def __setstate__(self, state: bytes):
+        self._restore(unpack_state(state), None)
+    
+    def _restore(self, state: CheckpointState, move_cache: Optional[LegalMoveCache]):
+        # the same attributes __init__ sets, without building the start position
+        self.board = state.position.to_board()
+        self._current_turn = state.position.side_to_move
+        self._game_state = _CHECKPOINT_STATES[state.state]
+        self.validator = MoveValidator(self.board)
+        self._legal_moves = None
+        self._legal_moves_key = None
+        self.move_cache = move_cache if move_cache is not None else LegalMoveCache()
+        
+        self.clock = None
+        if state.clock is not None:
+            reading = state.clock
+            self.clock = ChessClock(TimeControl(reading.initial, reading.increment))
+            self.clock.set_time_left(reading.white, reading.black, reading.running)
+        
+        self._line = state.line
+        self._records = []
+        self._unrecorded = state.ply
+        self._start = state.start
 
     def _initialize_board(self):
         """Set up initial piece positions"""
-        # import all concrete pieces
-        from src.pieces.concrete_pieces import (
-            Rook,
-            Bishop,
-            Knight,
-            Queen,
-            King,
-            Pawn
-        )
         #  initialize back row pieces
         back_row = [ Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook ]
         files = 'ABCDEFGH'
@@ -42,7 +199,7 @@ class ChessGame:
             
             # placing pawns
             pawn_pos = Position(files[file_idx],2)
-            self.board.place_piece(Pawn(Color.WHITE,pos),pawn_pos)
+            self.board.place_piece(Pawn(Color.WHITE,pawn_pos),pawn_pos)
             
         
         # black pieces
@@ -53,7 +210,7 @@ class ChessGame:
             
             # placing pawns
             pawn_pos = Position(files[file_idx],7)
-            self.board.place_piece(Pawn(Color.BLACK,pos),pawn_pos)
+            self.board.place_piece(Pawn(Color.BLACK,pawn_pos),pawn_pos)
 
 
     # def move_piece(self, from_pos: Position, to_pos: Position) -> bool:
@@ -76,69 +233,321 @@ class ChessGame:
     #     self._switch_turn()    
     #    return True
     
-    def move_piece(self, from_pos: Position, to_pos: Position) -> bool:
+    @property
+    def current_turn(self) -> Color:
+        """
+        Side to move
+        """
+        return self._current_turn
+    
+    @property
+    def game_state(self) -> str:
+        """
+        One of the GameState values
+        """
+        return self._game_state
+    
+    def get_legal_moves(self) -> MoveList:
+        """
+        All legal moves for the side to move, as packed Move integers
+        
+        Generated once per position and kept in the move cache; callers
+        must not modify the list
+        """
+        key = self.position_hash()
+        if self._legal_moves_key != key:
+            moves = self.move_cache.get_position(self.board, self._current_turn, key)
+            if moves is None:
+                moves = self.move_cache.put_position(
+                    self.board, self._current_turn, key, self.validator.get_legal_moves(self._current_turn)
+                )
+            self._legal_moves = moves
+            self._legal_moves_key = key
+        return self._legal_moves
+    
+    def position_hash(self) -> int:
+        """
+        Zobrist key of the current position (see src.game.zobrist)
+        """
+        return compute_hash(self.board, self._current_turn)
+    
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Immutable copy of the current position
+        
+        Further snapshots are cheapest taken with BoardSnapshot.apply, which
+        shares unchanged ranks with the snapshot it starts from
+        """
+        return BoardSnapshot.from_board(self.board, self._current_turn)
+    
+    def is_in_check(self) -> bool:
+        """
+        Whether the side to move is currently in check
+        """
+        return self.validator.is_king_in_check(self._current_turn)
+    
+    def move_piece(self, from_pos: Position, to_pos: Position,
+                   promotion_choice: Optional[Type[Piece]] = None) -> bool:
         if self._game_state != GameState.ACTIVE:
             raise GameOverError("Game has ended")
         
-        is_valid, error = self.validator.validate_move(from_pos, to_pos)
-        if not is_valid:
-            return False
-
         piece = self.board.get_piece_at(from_pos)
         if not piece or piece.color != self._current_turn:
             return False
-
-        if to_pos not in piece.get_possible_moves(self.board):
+        
+        # a pawn reaching the last rank has to know what it becomes,
+        # so a missing or unexpected promotion simply finds no move
+        move = self.get_legal_moves().find(from_pos.square, to_pos.square, promotion_code(promotion_choice))
+        if move is None:
+            return False
+        
+        self.play_move(move)
+        return True
+    
+    def play_move(self, move: int) -> Move:
+        """
+        Make a game move and record it in the history
+        
+        Playing a move while scrolled back replaces the moves after the
+        current ply, like any editor's undo stack. Search uses make_move
+        directly so the history is never touched by its tree walk
+        
+        In a timed game the mover's clock is pressed; a move made after the
+        flag fell ends the game on time instead
+        """
+        move = Move(move)
+        if self.check_flag():
+            raise GameOverError("Time is up")
+        del self._line[self.ply:]
+        self._records.append(self.make_move(move))
+        self._line.append(move)
+        if self.clock is not None:
+            self._press_clock()
+        return move
+    
+    def check_flag(self) -> bool:
+        """
+        Whether the side to move has run out of time, ending the game if so
+        """
+        if self.clock is None:
             return False
+        if self._game_state == GameState.ACTIVE and self.clock.flagged(self._current_turn):
+            self.clock.stop()
+            self._game_state = GameState.TIMEOUT
+        return self._game_state == GameState.TIMEOUT
+    
+    def _press_clock(self):
+        if self._game_state != GameState.ACTIVE:
+            self.clock.stop()
+        elif self.clock.running is None:
+            # the first timed move starts the opponent's clock
+            self.clock.start(self._current_turn)
+        else:
+            self.clock.press()
+    
+    def _restart_clock(self):
+        """
+        After undo/redo only the side now to move may be on the clock
+
+        The side that was running is charged up to now (time is never
+        rewound); at the start and in a finished game no clock runs, so the
+        next move starts one like the game's first move does
+        """
+        if self.clock is None:
+            return
+        if self.ply == 0 or self._game_state != GameState.ACTIVE:
+            self.clock.stop()
+        else:
+            self.clock.start(self._current_turn)
+    
+    @property
+    def ply(self) -> int:
+        """
+        Number of history moves currently on the board
+        """
+        return self._unrecorded + len(self._records)
+    
+    @property
+    def move_history(self) -> List[Move]:
+        """
+        The whole recorded line, including moves after the current ply
+        """
+        return list(self._line)
+    
+    def undo(self) -> Optional[Move]:
+        """
+        Take back the last history move; None at the start of the game
+        """
+        if not self._records:
+            if not self._unrecorded:
+                return None
+            self._replay_records()
+        record = self._records.pop()
+        self.unmake_move(record)
+        self._restart_clock()
+        return record.move
+    
+    def redo(self) -> Optional[Move]:
+        """
+        Replay the next move of the line after an undo; None at its end
+        """
+        if self.ply == len(self._line):
+            return None
+        move = self._line[self.ply]
+        self._records.append(self.make_move(move))
+        self._restart_clock()
+        return move
+    
+    def goto(self, ply: int):
+        """
+        Move to a ply of the recorded line
+        
+        Only the moves between the current ply and the target are taken
+        back or replayed, whatever the length of the game
+        """
+        if not 0 <= ply <= len(self._line):
+            raise ValueError(f"Ply {ply} outside the recorded line (0-{len(self._line)})")
+        while self.ply > ply:
+            self.undo()
+        while self.ply < ply:
+            self.redo()
+    
+    def _replay_records(self):
+        """
+        Make the undo records a restored game was saved without
+        
+        Records hold the very pieces they move, so the line up to the
+        current ply is replayed on a fresh board that then replaces ours.
+        Every recorded position but the current one had a move played from
+        it, so none needs its state worked out again
+        """
+        if self._start is None:
+            replay = ChessGame(self.move_cache)
+        else:
+            replay = ChessGame.from_snapshot(self._start, self.move_cache)
+        for move in self._line[:self.ply]:
+            replay._records.append(replay.make_move(move, update_state=False))
+        self.board = replay.board
+        self.validator = replay.validator
+        self._records = replay._records
+        self._unrecorded = 0
+    
+    def make_move(self, move: int, update_state: bool = True) -> UndoRecord:
+        """
+        Apply a legal packed move taken from get_legal_moves
+        
+        The flags computed by move generation say whether the move castles,
+        captures en passant or is a double step, so nothing is re-derived here
+        
+        Args:
+            move: Packed move from get_legal_moves
+            update_state: Search passes False and detects mate/stalemate
+                          itself from the (empty) legal move list
+        
+        Returns:
+            UndoRecord to pass to unmake_move
+        """
+        move = Move(move)
+        from_pos, to_pos = move.from_position, move.to_position
+        piece = self.board.get_piece_at(from_pos)
+        
+        record = UndoRecord(
+            move, piece, None, to_pos, piece.has_moved, None, [],
+            self._game_state, self._legal_moves, self._legal_moves_key
+        )
+        
+        # en passant is only available right after the double step
+        for own_piece in self.board.get_pieces_by_color(piece.color):
+            if own_piece.just_moved_two:
+                record.double_pushers.append(own_piece)
+                own_piece.just_moved_two = False
 
         # Handle castling
-        if isinstance(piece, King) and abs(ord(to_pos.file) - ord(from_pos.file)) == 2:
-            rook_file = 'H' if to_pos.file == 'G' else 'A'
-            rook_pos = Position(rook_file, from_pos.rank)
-            new_rook_file = 'F' if to_pos.file == 'G' else 'D'
-            self.board.move_piece(rook_pos, Position(new_rook_file, from_pos.rank))
-        
-        # Handle en passant
-        if isinstance(piece, Pawn):
-            piece.just_moved_two = abs(to_pos.rank - from_pos.rank) == 2
-            
-            # Capture en passant
-            if abs(ord(to_pos.file) - ord(from_pos.file)) == 1 and not self.board.get_piece_at(to_pos):
-                captured_pawn_pos = Position(to_pos.file, from_pos.rank)
-                self.board.remove_piece(captured_pawn_pos)
-                
-        # promotion
-        # Handle pawn promotion
-        if isinstance(piece, Pawn):
-            promotion_rank = 8 if piece.color == Color.WHITE else 1
-            if to_pos.rank == promotion_rank:
-                if not promotion_choice:
-                    return False
-                # Create new piece of chosen type
-                promoted_piece = promotion_choice(piece.color, to_pos)
-                self.board.move_piece(from_pos, to_pos)
-                self.board.replace_piece(to_pos, promoted_piece)
-                return True
+        if move & CASTLING:
+            kingside = to_pos.square > from_pos.square
+            rook_pos = SQUARES[from_pos.square + (3 if kingside else -4)]
+            new_rook_pos = SQUARES[from_pos.square + (1 if kingside else -1)]
+            rook = self.board.get_piece_at(rook_pos)
+            record.rook_had_moved = rook.has_moved
+            self.board.move_piece(rook_pos, new_rook_pos)
+            rook.move(new_rook_pos)
+        
+        # Capture en passant
+        if move & EN_PASSANT:
+            record.capture_position = SQUARES[to_pos.square - 8 if piece.color is Color.WHITE else to_pos.square + 8]
+            record.captured = self.board.remove_piece(record.capture_position)
 
         # Execute move
-        self.board.move_piece(from_pos, to_pos)
+        captured = self.board.move_piece(from_pos, to_pos)
+        if captured is not None:
+            record.captured = captured
+        piece.move(to_pos)
+        piece.just_moved_two = bool(move & DOUBLE_PUSH)
+        
+        # Handle pawn promotion
+        promotion = move.promotion
+        if promotion is not None:
+            # Create new piece of chosen type
+            promoted_piece = PIECE_CLASSES[promotion](piece.color, to_pos)
+            self.board.replace_piece(to_pos, promoted_piece)
         
-        # Update game state
-        self._update_game_state()
+        # the side now on move is the one whose state we evaluate
         self._switch_turn()
+        if update_state:
+            self._update_game_state()
+        return record
+    
+    def unmake_move(self, record: UndoRecord):
+        """
+        Take back the move described by an UndoRecord from make_move
         
-        return True
+        Records must be undone in reverse order of the moves they came from
+        """
+        move = record.move
+        from_pos, to_pos = move.from_position, move.to_position
+        piece = record.piece
+        
+        # put the pawn back in place of the promoted piece
+        if move.promotion is not None:
+            self.board.replace_piece(to_pos, piece)
+        
+        self.board.move_piece(to_pos, from_pos)
+        piece.has_moved = record.had_moved
+        piece.just_moved_two = False
+        
+        if record.captured is not None:
+            self.board.place_piece(record.captured, record.capture_position)
+        
+        if move & CASTLING:
+            kingside = to_pos.square > from_pos.square
+            rook_pos = SQUARES[from_pos.square + (3 if kingside else -4)]
+            new_rook_pos = SQUARES[from_pos.square + (1 if kingside else -1)]
+            rook = self.board.get_piece_at(new_rook_pos)
+            self.board.move_piece(new_rook_pos, rook_pos)
+            rook.has_moved = record.rook_had_moved
+        
+        for pawn in record.double_pushers:
+            pawn.just_moved_two = True
+        
+        self._switch_turn()
+        self._game_state = record.game_state
+        self._legal_moves = record.legal_moves
+        self._legal_moves_key = record.legal_moves_key
     
     def _switch_turn(self):
         """Switch active player"""
         self._current_turn = Color.BLACK if self._current_turn == Color.WHITE else Color.WHITE
     
     def _update_game_state(self):
-        """Update game state after each move"""
-        if self._is_checkmate():
-            self._game_state = GameState.CHECKMATE
-        elif self._is_stalemate():
-            self._game_state = GameState.STALEMATE
+        """
+        Update game state after each move
+        
+        Generates the new position's legal moves once; the next move_piece
+        call validates against the same cached list
+        """
+        if not self.get_legal_moves():
+            in_check = self.is_in_check()
+            self._game_state = GameState.CHECKMATE if in_check else GameState.STALEMATE
         elif self._is_draw():
             self._game_state = GameState.DRAW
 
@@ -153,57 +562,16 @@ class ChessGame:
         if not self._is_king_in_check(king):
             return False
         
-        current_pieces = self.board.get_pieces_by_color(self._current_turn)
-        
-        for piece in current_pieces:
-            for move in piece. get_possible_moves(self.board):
-                if self._does_move_prevent_check(piece, move):
-                    return False
-        return True
-
-
-    def _does_move_prevent_check(self, piece:Piece, new_position:Position)->bool:
-        """
-        test if move prevents check
-        """
-        # save current state
-        old_position = piece.current_position
-        
-        # just in case moving new piece causes capturing
-        # for example to capture the checker
-        captured_piece = self.board.get_piece_at(new_position)
-        
-        
-        # try piece in new position
-        self.board.move_piece(old_position, new_position)
-        
-        # check if king is still in check
-        king = self._find_king(piece.color)
-        still_in_check = self. _is_king_in_check(king)
-        
-        # restore state
-        self.board.move_piece(new_position, old_position)
-        if captured_piece:
-            self.board.place_piece(captured_piece, new_position)
-        
-        return not still_in_check
-        
+        return not self.get_legal_moves()
 
     
     def _is_king_in_check(self, king):
         """
         check for if current player king is in check or not 
         
-        Checks overlapping possible positions of all other pieces 
+        Looks for any opponent piece attacking the king's square
         """
-        opponent_color = Color.BLACK if king.color == Color.WHITE else Color.WHITE
-        opponent_pieces = self.board.get_pieces_by_color(opponent_color)
-        
-        for piece in opponent_pieces:
-            if king.current_position in piece.get_possible_moves(self.board):
-                return True
-        
-        return False
+        return self.validator.is_king_in_check(king.color)
         
     def _find_king(self, color:Color):
         """
@@ -212,7 +580,7 @@ class ChessGame:
         pieces = self.board.get_pieces_by_color(color)
         
         for piece in pieces:
-            if isinstance(piece, King):
+            if piece.piece_type == PieceType.KING:
                 return piece
         raise RuntimeError(f"No {color} king found on board")
         
@@ -225,13 +593,7 @@ class ChessGame:
             return False
         
         # Check if any piece has legal moves
-        current_pieces = self.board.get_pieces_by_color(self._current_turn)
-        
-        for piece in current_pieces:
-            if piece.get_possible_moves(self.board):
-                return False
-                
-        return True
+        return not self.get_legal_moves()
     
     def _is_draw(self) -> bool:
         """Check for draw conditions"""
@@ -0,0 +1,111 @@
+# src/game/clock.py
+import time
+from typing import Callable, Dict, Optional
+from src.pieces.piece import Color
+
+
+class TimeControl:
+    """
+    Starting time and per-move increment, both in seconds
+
+    Args:
+        initial: Time each side starts with
+        increment: Added to a side's clock after each of its moves
+    """
+    def __init__(self, initial: float, increment: float = 0.0):
+        if initial <= 0 or increment < 0:
+            raise ValueError(f"Invalid time control {initial}+{increment}")
+        self.initial = initial
+        self.increment = increment
+
+    @classmethod
+    def parse(cls, text: str) -> 'TimeControl':
+        """
+        "300+2" (seconds + increment seconds) or plain "60"
+        """
+        initial, _, increment = text.partition('+')
+        try:
+            return cls(float(initial), float(increment or 0))
+        except ValueError:
+            raise ValueError(f"Invalid time control {text!r}")
+
+    def __str__(self):
+        return f"{self.initial:g}+{self.increment:g}"
+
+
+class ChessClock:
+    """
+    Two-sided game clock with Fischer increment
+
+    Only the side whose clock runs loses time; press() ends its move,
+    credits the increment and starts the opponent's clock
+
+    Design Considerations:
+    - Time is read from an injectable monotonic source, so tests and
+      replays can drive the clock without sleeping
+    - Times are not rewound by undo/redo; the clock measures the real game
+    """
+    def __init__(self, control: TimeControl, time_source: Callable[[], float] = time.monotonic):
+        self.control = control
+        self._time_source = time_source
+        self._remaining: Dict[Color, float] = {Color.WHITE: control.initial, Color.BLACK: control.initial}
+        self.running: Optional[Color] = None
+        self._started_at = 0.0
+
+    def start(self, color: Color = Color.WHITE):
+        """
+        Start (or resume) the given side's clock
+        """
+        self.stop()
+        self.running = color
+        self._started_at = self._time_source()
+
+    def stop(self):
+        """
+        Pause, charging the running side for the time used so far
+        """
+        if self.running is not None:
+            self._remaining[self.running] -= self._time_source() - self._started_at
+            self.running = None
+
+    def set_time_left(self, white: float, black: float, running: Optional[Color] = None):
+        """
+        Set both sides' remaining time, e.g. from a checkpoint, and restart
+        the running side's clock from now
+        """
+        self._remaining = {Color.WHITE: white, Color.BLACK: black}
+        self.running = running
+        self._started_at = self._time_source()
+    
+    def press(self) -> float:
+        """
+        End the running side's move and start the other side's clock
+
+        Returns:
+            Seconds the move took
+        """
+        if self.running is None:
+            raise ValueError("Clock is not running")
+        mover = self.running
+        used = self._time_source() - self._started_at
+        self._remaining[mover] -= used
+        if self._remaining[mover] > 0:
+            self._remaining[mover] += self.control.increment
+        self.running = Color.BLACK if mover is Color.WHITE else Color.WHITE
+        self._started_at = self._time_source()
+        return used
+
+    def time_left(self, color: Color) -> float:
+        """
+        Seconds left for a side, counting the move in progress
+        """
+        remaining = self._remaining[color]
+        if color is self.running:
+            remaining -= self._time_source() - self._started_at
+        return remaining
+
+    def flagged(self, color: Color) -> bool:
+        return self.time_left(color) <= 0
+
+    def __str__(self):
+        return f"{self.time_left(Color.WHITE):.1f}s / {self.time_left(Color.BLACK):.1f}s"
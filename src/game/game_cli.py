@@ -1,53 +1,113 @@
-from src.game.chess_game import ChessGame
+import argparse
+import sys
+from typing import Optional, TextIO
+from src.game.chess_game import ChessGame, GameOverError, GameState
+from src.game.rendering import ESC, FRAME_HEIGHT, BoardRenderer, BoardView
+from src.notation.san import PROMOTION_PIECES
 from src.pieces.piece import Color, Position
+from src.profiling import instrumentation
 
 
 class ChessGameCLI:
-    def __init__(self):
+    def __init__(self, output: TextIO = sys.stdout, ansi: Optional[bool] = None):
+        """
+        Args:
+            output: Where the board and messages are written
+            ansi: Redraw in place with cursor moves; defaults to whether
+                  output is a terminal
+        """
         self.game = ChessGame()
+        self.output = output
+        self.ansi = output.isatty() if ansi is None else ansi
+        self.renderer = BoardRenderer()
+        self.view = BoardView(self.renderer)
 
-    def display_board(self):
-        print("\n  A B C D E F G H")
-        for rank in range(8, 0, -1):
-            row = f"{rank} "
-            for file in 'ABCDEFGH':
-                piece = self.game.board.get_piece_at(Position(file, rank))
-                symbol = self._get_piece_symbol(piece)
-                row += symbol + " "
-            print(row + f"{rank}")
-        print("  A B C D E F G H\n")
-
-    def _get_piece_symbol(self, piece):
-        if not piece:
-            return "."
-        
-        symbols = {
-            'King': 'K', 'Queen': 'Q', 'Rook': 'R',
-            'Bishop': 'B', 'Knight': 'N', 'Pawn': 'P'
-        }
-        symbol = symbols[piece.__class__.__name__]
-        return symbol if piece.color == Color.WHITE else symbol.lower()
+    def display_board(self, message: str = ""):
+        if not self.ansi:
+            self.output.write(f"\n{self.renderer.text(self.game.board)}\n\n")
+            if message:
+                self.output.write(message + "\n")
+            return
+
+        # the board stays at the top of the screen and only the squares a
+        # move changed are rewritten; prompts and messages go below it
+        self.output.write(self.view.update(self.game.board))
+        self.output.write(f"{ESC}{FRAME_HEIGHT + 2};1H{ESC}J")
+        if message:
+            self.output.write(message + "\n")
+        self.output.flush()
 
     def play(self):
+        if self.ansi:
+            self.output.write(f"{ESC}2J")
+            self.view.invalidate()
+        message = ""
         while True:
-            self.display_board()
+            self.display_board(message)
+            message = ""
             try:
-                from_pos = input("From (e.g. E2): ").upper()
+                from_pos = input("From (e.g. E2, U undo, R redo, Q quit): ").upper()
                 if from_pos == 'Q':
                     break
-                to_pos = input("To (e.g. E4): ").upper()
-                
+                if from_pos == 'U':
+                    self.game.undo()
+                    continue
+                if from_pos == 'R':
+                    self.game.redo()
+                    continue
+                to_pos = input("To (e.g. E4, E8Q to promote): ").upper()
+                promotion = None
+                if len(to_pos) > 2:
+                    if to_pos[2:] not in PROMOTION_PIECES:
+                        raise ValueError(f"Unknown promotion piece {to_pos[2:]}")
+                    promotion = PROMOTION_PIECES[to_pos[2:]]
+
                 success = self.game.move_piece(
                     Position(from_pos[0], int(from_pos[1])),
-                    Position(to_pos[0], int(to_pos[1]))
+                    Position(to_pos[0], int(to_pos[1])),
+                    promotion
                 )
-                
+
                 if not success:
-                    print("Invalid move!")
-                    
+                    message = "Invalid move!"
+                elif self.game.game_state != GameState.ACTIVE:
+                    message = self.result_message()
+
+            except GameOverError:
+                message = self.result_message()
             except (ValueError, IndexError):
-                print("Invalid input! Use format: E2")
+                message = "Invalid input! Use format: E2, or E8Q to promote"
+            except EOFError:
+                break
+
+    def result_message(self) -> str:
+        state = self.game.game_state
+        if state == GameState.CHECKMATE:
+            # the side to move is the one that got mated
+            winner = "Black" if self.game.current_turn == Color.WHITE else "White"
+            result = f"Checkmate, {winner} wins!"
+        else:
+            result = f"Game over: {state.lower()}."
+        return f"{result} U to undo, Q to quit"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play chess in the terminal")
+    parser.add_argument("--profile", action="store_true",
+                        help="time move generation and validation, print a report on exit")
+    parser.add_argument("--plain", action="store_true",
+                        help="reprint the whole board after each move instead of updating it in place")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        instrumentation.enable()
+    game = ChessGameCLI(ansi=False if args.plain else None)
+    try:
+        game.play()
+    finally:
+        if args.profile:
+            print(instrumentation.report())
+
 
 if __name__ == "__main__":
-    game = ChessGameCLI()
-    game.play()
\ No newline at end of file
+    main()
@@ -0,0 +1,120 @@
+# src/game/move_cache.py
+from collections import OrderedDict
+from typing import Dict, Optional
+from src.game.canonical import Canonicalizer
+from src.game.moves import MoveList
+from src.pieces.piece import Color
+
+
+DEFAULT_CAPACITY = 8192
+
+
+class LegalMoveCache:
+    """
+    Bounded least-recently-used map from position key to legal move list
+
+    Design Considerations:
+    - Keys are Zobrist hashes, which cover placement, side to move, castling
+      rights and en passant; any board mutation changes the key, so stale
+      entries are never returned, they just age out
+    - Stored lists are compacted copies that nobody appends to, so one entry
+      can be handed to every caller that reaches the position
+    - One cache may be shared by several games (analysis of related lines)
+    - With a Canonicalizer, positions are stored under their symmetry class
+      key (see src.game.canonical) and lists are mapped back on the way
+      out, so a position and its colour-flipped or mirrored twins share
+      one entry
+
+    Args:
+        capacity: Maximum number of positions kept
+        canonicalizer: Share entries between symmetric positions
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, canonicalizer: Optional[Canonicalizer] = None):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        self.canonicalizer = canonicalizer
+        self._entries: "OrderedDict[int, MoveList]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory_bytes = 0
+
+    def get(self, key: int) -> Optional[MoveList]:
+        moves = self._entries.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return moves
+
+    def put(self, key: int, moves: MoveList) -> MoveList:
+        """
+        Store a compacted copy of the list and return the stored copy
+        """
+        stored = moves.compact()
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.memory_bytes -= previous.nbytes()
+        self._entries[key] = stored
+        self.memory_bytes += stored.nbytes()
+
+        while len(self._entries) > self.capacity:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes()
+            self.evictions += 1
+        return stored
+
+    def get_position(self, board, side_to_move: Color, key: int) -> Optional[MoveList]:
+        """
+        Moves for a position given its board and Zobrist key
+        """
+        if self.canonicalizer is None:
+            return self.get(key)
+        canonical = self.canonicalizer.canonical(board, side_to_move)
+        moves = self.get(canonical.key)
+        if moves is None or not canonical.transform:
+            return moves
+        return moves.remapped(canonical.move_xor)
+
+    def put_position(self, board, side_to_move: Color, key: int, moves: MoveList) -> MoveList:
+        """
+        Store a position's moves, returning a compacted copy for the caller
+        """
+        if self.canonicalizer is None:
+            return self.put(key, moves)
+        canonical = self.canonicalizer.canonical(board, side_to_move)
+        if not canonical.transform:
+            return self.put(canonical.key, moves)
+        self.put(canonical.key, moves.remapped(canonical.move_xor))
+        return moves.compact()
+
+    def clear(self):
+        self._entries.clear()
+        self.memory_bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Counters for reporting; memory is the size of the stored move buffers
+        """
+        return {
+            'entries': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+            'memory_bytes': self.memory_bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
@@ -1,16 +1,224 @@
 # src/game/moves.py
-from typing import Type
-from src.pieces.piece import Piece, Position
+from array import array
+from typing import Iterator, Optional, Tuple, Type
+from src.pieces.piece import Piece, PieceType, Position
 
-class PromotionMove:
-    def __init__(self, position: Position, promotion_piece_type: Type[Piece]):
-        self.position = position
-        self.promotion_piece_type = promotion_piece_type
+
+FILES = 'ABCDEFGH'
+
+# every square as a Position, so decoding a move never allocates one
+SQUARES = [Position(FILES[index % 8], index // 8 + 1) for index in range(64)]
+
+# promotion piece types in the order used by packed move codes (0 = none)
+PROMOTION_CODES = [PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN]
+
+# packed move layout: from (6) | to (6) | promotion (3) | flags (4)
+TO_SHIFT = 6
+PROMOTION_SHIFT = 12
+FLAGS_SHIFT = 15
+
+SQUARE_MASK = 0x3F
+ROUTE_MASK = 0xFFF        # from + to
+CODE_MASK = 0x7FFF        # from + to + promotion, the 16 bit storage code
+
+CAPTURE = 1 << FLAGS_SHIFT
+DOUBLE_PUSH = 2 << FLAGS_SHIFT
+EN_PASSANT = 4 << FLAGS_SHIFT
+CASTLING = 8 << FLAGS_SHIFT
+
+MAX_MOVES = 256  # no legal chess position has more than 218 moves
+
+
+class Move(int):
+    """
+    A move packed into a single integer
+
+    Design Considerations:
+    - Equality and hashing are plain integer operations
+    - The low 15 bits are the storage code used by the database formats,
+      the flags above them are hints for applying the move
+    """
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, from_square: int, to_square: int, promotion: int = 0, flags: int = 0) -> 'Move':
+        return cls(from_square | (to_square << TO_SHIFT) | (promotion << PROMOTION_SHIFT) | flags)
+
+    @property
+    def from_square(self) -> int:
+        return self & SQUARE_MASK
+
+    @property
+    def to_square(self) -> int:
+        return (self >> TO_SHIFT) & SQUARE_MASK
+
+    @property
+    def from_position(self) -> Position:
+        return SQUARES[self & SQUARE_MASK]
+
+    @property
+    def to_position(self) -> Position:
+        return SQUARES[(self >> TO_SHIFT) & SQUARE_MASK]
+
+    @property
+    def promotion(self) -> Optional[PieceType]:
+        promotion_code = (self >> PROMOTION_SHIFT) & 0b111
+        return PROMOTION_CODES[promotion_code - 1] if promotion_code else None
+
+    @property
+    def code(self) -> int:
+        """
+        16 bit (from, to, promotion) code without the flags
+        """
+        return self & CODE_MASK
+
+    def is_capture(self) -> bool:
+        return bool(self & CAPTURE)
+
+    def is_castling(self) -> bool:
+        return bool(self & CASTLING)
+
+    def is_en_passant(self) -> bool:
+        return bool(self & EN_PASSANT)
+
+    def __repr__(self):
+        promotion_code = (self >> PROMOTION_SHIFT) & 0b111
+        suffix = f"={'NBRQ'[promotion_code - 1]}" if promotion_code else ""
+        return f"Move({self.from_position}{self.to_position}{suffix})"
+
+
+class MoveList:
+    """
+    Fixed capacity move buffer backed by a preallocated unsigned int array
+
+    Design Considerations:
+    - Generation writes into the same storage instead of building lists
+      of objects
+    - clear() resets the length so one buffer can be reused per node
+    """
+    __slots__ = ('_moves', '_count')
+
+    def __init__(self, capacity: int = MAX_MOVES):
+        self._moves = array('I', bytes(4 * capacity))
+        self._count = 0
+
+    def append(self, move: int):
+        self._moves[self._count] = move
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    def raw(self) -> array:
+        """
+        The stored codes as plain ints, for hot loops that do their own decoding
+        """
+        return self._moves[:self._count]
+
+    def compact(self) -> 'MoveList':
+        """
+        Copy without spare capacity, for lists that are kept around
         
-    def __eq__(self, other):
-        if isinstance(other, Position):
-            return other == self.position
-        return isinstance(other, PromotionMove) and other.position == self.position
+        The copy is full, so appending to it raises IndexError
+        """
+        copy = MoveList(0)
+        copy._moves = self.raw()
+        copy._count = self._count
+        return copy
+
+    def remapped(self, xor: int) -> 'MoveList':
+        """
+        Compact copy with every code XORed with a square mask, which is how
+        the board symmetries of src.game.canonical act on packed moves
+        """
+        codes = self.raw()
+        if xor:
+            for index, code in enumerate(codes):
+                codes[index] = code ^ xor
+        copy = MoveList(0)
+        copy._moves = codes
+        copy._count = self._count
+        return copy
+
+    def nbytes(self) -> int:
+        """
+        Size of the backing buffer in bytes
+        """
+        return self._moves.buffer_info()[1] * self._moves.itemsize
+
+    def find(self, from_square: int, to_square: int, promotion: Optional[int] = 0) -> Optional[Move]:
+        """
+        First move matching the route and promotion, ignoring the flags
         
-    def __hash__(self):
-        return hash(self.position)
\ No newline at end of file
+        A promotion of None matches any promotion piece on that route
+        """
+        if promotion is None:
+            wanted, mask = from_square | (to_square << TO_SHIFT), ROUTE_MASK
+        else:
+            wanted, mask = from_square | (to_square << TO_SHIFT) | (promotion << PROMOTION_SHIFT), CODE_MASK
+        moves = self._moves
+        for index in range(self._count):
+            if moves[index] & mask == wanted:
+                return Move(moves[index])
+        return None
+
+    def __contains__(self, move) -> bool:
+        if isinstance(move, Position):
+            # any move landing on the square, regardless of origin
+            target = move.square
+            return any((code >> TO_SHIFT) & SQUARE_MASK == target for code in self.raw())
+        return any(code & CODE_MASK == move & CODE_MASK for code in self.raw())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Move:
+        if not -self._count <= index < self._count:
+            raise IndexError("move list index out of range")
+        return Move(self._moves[index % self._count])
+
+    def __iter__(self) -> Iterator[Move]:
+        for code in self.raw():
+            yield Move(code)
+
+    def __repr__(self):
+        return f"MoveList({list(self)})"
+
+
+def square_index(position: Position) -> int:
+    """
+    Map a Position onto 0..63 (A1 = 0, H1 = 7, A8 = 56)
+    """
+    return position.square
+
+
+def index_square(index: int) -> Position:
+    """
+    Inverse of square_index
+    """
+    return SQUARES[index]
+
+
+def promotion_code(promotion: Optional[Type[Piece]]) -> int:
+    """
+    Packed promotion field for a piece class (0 when not promoting)
+    """
+    if promotion is None:
+        return 0
+    # piece classes are named after their PieceType members
+    return PROMOTION_CODES.index(PieceType[promotion.__name__.upper()]) + 1
+
+
+def encode_move(from_pos: Position, to_pos: Position, promotion: Optional[Type[Piece]] = None) -> int:
+    """
+    Pack a move into 16 bits: from (6) | to (6) | promotion (3)
+    """
+    return from_pos.square | (to_pos.square << TO_SHIFT) | (promotion_code(promotion) << PROMOTION_SHIFT)
+
+
+def decode_move(code: int) -> Tuple[Position, Position, Optional[PieceType]]:
+    """
+    Unpack a 16 bit move code into (from, to, promotion piece type)
+    """
+    move = Move(code)
+    return move.from_position, move.to_position, move.promotion
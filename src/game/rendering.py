@@ -0,0 +1,144 @@
+# src/game/rendering.py
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from src.board.board import Board
+from src.pieces.piece import Color, PieceType
+
+
+PIECE_SYMBOLS: Dict[PieceType, str] = {
+    PieceType.KING: 'K', PieceType.QUEEN: 'Q', PieceType.ROOK: 'R',
+    PieceType.BISHOP: 'B', PieceType.KNIGHT: 'N', PieceType.PAWN: 'P',
+}
+EMPTY_SYMBOL = '.'
+FILE_LABELS = "  A B C D E F G H"
+
+# board lines: file labels, ranks 8..1, file labels
+FRAME_HEIGHT = 10
+
+ESC = '\x1b['
+
+
+def piece_symbol(piece) -> str:
+    """
+    Letter for a piece, upper case for white, '.' for an empty square
+    """
+    if piece is None:
+        return EMPTY_SYMBOL
+    symbol = PIECE_SYMBOLS[piece.piece_type]
+    return symbol if piece.color is Color.WHITE else symbol.lower()
+
+
+def square_codes(board: Board) -> str:
+    """
+    The board as 64 symbols, A1 first and H8 last
+    """
+    return ''.join([piece_symbol(piece) for piece in board.squares])
+
+
+@lru_cache(maxsize=4096)
+def plain_text(codes: str) -> str:
+    """
+    Full board drawing without escape codes, for logs and pipes
+    """
+    lines = [FILE_LABELS]
+    for rank in range(8, 0, -1):
+        row = codes[(rank - 1) * 8:rank * 8]
+        lines.append(f"{rank} {' '.join(row)} {rank}")
+    lines.append(FILE_LABELS)
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=4096)
+def ansi_frame(codes: str, origin: Tuple[int, int] = (1, 1)) -> str:
+    """
+    Full board drawn with absolute cursor moves, so it lands at `origin`
+    (1-based terminal row, column) whatever the cursor was doing
+    """
+    top, left = origin
+    return ''.join(
+        f"{ESC}{top + line_number};{left}H{line}"
+        for line_number, line in enumerate(plain_text(codes).split('\n'))
+    )
+
+
+@lru_cache(maxsize=16384)
+def ansi_diff(before: str, after: str, origin: Tuple[int, int] = (1, 1)) -> str:
+    """
+    Cursor moves and symbols that turn a drawn `before` board into `after`
+
+    A normal move touches two squares, a castle or en passant capture
+    four or three, so an update is a few dozen bytes instead of a frame
+    """
+    top, left = origin
+    updates = []
+    for square, (old, new) in enumerate(zip(before, after)):
+        if old != new:
+            row = top + 1 + (7 - square // 8)
+            column = left + 2 + 2 * (square % 8)
+            updates.append(f"{ESC}{row};{column}H{new}")
+    return ''.join(updates)
+
+
+class BoardRenderer:
+    """
+    Shared, cached drawing of boards for terminals and spectator streams
+
+    Design Considerations:
+    - Board symbols are cached per placement key (the board's Zobrist
+      placement hash), so redrawing a known position reads no squares
+    - Frames and diffs are cached on the symbols, so every watcher of a
+      game moving from one position to the next gets the same string
+      without building it again
+    """
+    def __init__(self, origin: Tuple[int, int] = (1, 1), cache_size: int = 4096):
+        self.origin = origin
+        self.cache_size = cache_size
+        self._codes: "OrderedDict[int, str]" = OrderedDict()
+
+    def codes(self, board: Board) -> str:
+        key = board.placement_key
+        codes = self._codes.get(key)
+        if codes is None:
+            codes = self._codes[key] = square_codes(board)
+            if len(self._codes) > self.cache_size:
+                self._codes.popitem(last=False)
+        else:
+            self._codes.move_to_end(key)
+        return codes
+
+    def text(self, board: Board) -> str:
+        return plain_text(self.codes(board))
+
+    def frame(self, board: Board) -> str:
+        return ansi_frame(self.codes(board), self.origin)
+
+    def diff(self, before: str, after: str) -> str:
+        return ansi_diff(before, after, self.origin)
+
+
+class BoardView:
+    """
+    What one terminal or watcher has on screen
+
+    update() returns a full frame the first time (or after invalidate()),
+    then only the squares that changed since the last update
+    """
+    def __init__(self, renderer: Optional[BoardRenderer] = None):
+        self.renderer = renderer or BoardRenderer()
+        self._shown: Optional[str] = None
+
+    def update(self, board: Board) -> str:
+        codes = self.renderer.codes(board)
+        if self._shown is None:
+            output = ansi_frame(codes, self.renderer.origin)
+        else:
+            output = self.renderer.diff(self._shown, codes)
+        self._shown = codes
+        return output
+
+    def invalidate(self):
+        """
+        Next update redraws everything (screen cleared, new watcher ...)
+        """
+        self._shown = None
@@ -1,7 +1,11 @@
 # src/game/validation.py
 from typing import Optional
-from src.pieces.piece import Piece, PieceType, Position, Color
+from src.pieces.piece import PieceType, Position, Color
+from src.pieces.movement import DIAGONAL_RAYS, ORTHOGONAL_RAYS, attacks_square
 from src.board.board import Board
+from src.game.moves import (
+    EN_PASSANT, SQUARES, SQUARE_MASK, TO_SHIFT, Move, MoveList
+)
 
 class MoveValidator:
     def __init__(self, board: Board):
@@ -12,45 +16,140 @@ class MoveValidator:
         
         if not piece:
             return False, "No piece at source position"
-            
-        if to_pos not in piece.get_possible_moves(self.board):
+        
+        # promotions share a route, any of them will do for the king test
+        move = piece.generate_moves(self.board, MoveList()).find(from_pos.square, to_pos.square, None)
+        if move is None:
             return False, "Invalid move for this piece"
             
         # Simulate move to check if it exposes king
-        if self._does_move_expose_king(piece, from_pos, to_pos):
+        if self._does_move_expose_king(move, piece.color):
             return False, "Move would put/leave king in check"
             
         return True, None
+    
+    def find_legal_move(self, from_pos: Position, to_pos: Position, promotion: int = 0) -> Optional[Move]:
+        """
+        The packed legal move for a route and promotion code, or None
+        """
+        piece = self.board.get_piece_at(from_pos)
+        if not piece:
+            return None
+        
+        move = piece.generate_moves(self.board, MoveList()).find(from_pos.square, to_pos.square, promotion)
+        if move is None or self._does_move_expose_king(move, piece.color):
+            return None
+        return move
+    
+    def get_legal_moves(self, color: Color, moves: Optional[MoveList] = None) -> MoveList:
+        """
+        Every legal move for one side, packed into a MoveList
+        
+        Args:
+            color: Side to generate for
+            moves: Optional buffer to reuse, it is cleared first
+        """
+        pseudo_legal = MoveList()
+        for piece in self.board.get_pieces_by_color(color):
+            piece.generate_moves(self.board, pseudo_legal)
+        
+        king_square = self._find_king_square(color)
+        opponent_color = Color.BLACK if color is Color.WHITE else Color.WHITE
+        in_check = attacks_square(self.board, king_square, opponent_color)
+        
+        # out of check, only king moves, pinned pieces and en passant
+        # can expose the king, everything else is legal as generated
+        pinned = set() if in_check else self._pinned_squares(color, king_square)
+        
+        legal_moves = moves if moves is not None else MoveList()
+        legal_moves.clear()
+        for move in pseudo_legal.raw():
+            from_square = move & SQUARE_MASK
+            needs_simulation = (
+                in_check or from_square == king_square
+                or from_square in pinned or move & EN_PASSANT
+            )
+            if not needs_simulation or not self._does_move_expose_king(move, color):
+                legal_moves.append(move)
+        return legal_moves
+    
+    def has_legal_move(self, color: Color) -> bool:
+        """
+        Stop at the first legal move instead of collecting them all
+        """
+        moves = MoveList()
+        for piece in self.board.get_pieces_by_color(color):
+            moves.clear()
+            for move in piece.generate_moves(self.board, moves).raw():
+                if not self._does_move_expose_king(move, color):
+                    return True
+        return False
+    
+    def is_king_in_check(self, color: Color) -> bool:
+        return self._is_king_in_check(color)
+    
+    def _pinned_squares(self, color: Color, king_square: int) -> set:
+        """
+        Squares of `color` pieces pinned against their own king
+        """
+        squares = self.board.squares
+        pinned = set()
+        for rays, piece_types in ((ORTHOGONAL_RAYS, (PieceType.ROOK, PieceType.QUEEN)),
+                                  (DIAGONAL_RAYS, (PieceType.BISHOP, PieceType.QUEEN))):
+            for ray in rays[king_square]:
+                shield = None
+                for square in ray:
+                    piece = squares[square]
+                    if piece is None:
+                        continue
+                    if piece.color is color:
+                        if shield is not None:
+                            break
+                        shield = square
+                        continue
+                    # first enemy piece on the ray: a pinner only behind a shield
+                    if shield is not None and piece.piece_type in piece_types:
+                        pinned.add(shield)
+                    break
+        return pinned
+    
+    def _does_move_expose_king(self, move: int, color: Color) -> bool:
+        from_pos = SQUARES[move & SQUARE_MASK]
+        to_pos = SQUARES[(move >> TO_SHIFT) & SQUARE_MASK]
         
-    def _does_move_expose_king(self, piece: Piece, from_pos: Position, to_pos: Position) -> bool:
         # Save board state
         captured_piece = self.board.get_piece_at(to_pos)
         
+        # an en passant capture takes a pawn that is not on the target square
+        en_passant_pos = None
+        if move & EN_PASSANT:
+            en_passant_pos = SQUARES[to_pos.square - 8 if color is Color.WHITE else to_pos.square + 8]
+            en_passant_pawn = self.board.remove_piece(en_passant_pos)
+        
         # Execute move
         self.board.move_piece(from_pos, to_pos)
         
         # Check if king is in check
-        king_in_check = self._is_king_in_check(piece.color)
+        king_in_check = self._is_king_in_check(color)
         
         # Restore board state
         self.board.move_piece(to_pos, from_pos)
         if captured_piece:
             self.board.place_piece(captured_piece, to_pos)
+        if en_passant_pos:
+            self.board.place_piece(en_passant_pawn, en_passant_pos)
             
         return king_in_check
 
     def _is_king_in_check(self, color: Color) -> bool:
-        king_pos = self._find_king_position(color)
-        opponent_color = Color.BLACK if color == Color.WHITE else Color.WHITE
-        
-        for pos, piece in self.board.get_all_pieces():
-            if piece and piece.color == opponent_color:
-                if king_pos in piece.get_possible_moves(self.board):
-                    return True
-        return False
+        opponent_color = Color.BLACK if color is Color.WHITE else Color.WHITE
+        return attacks_square(self.board, self._find_king_square(color), opponent_color)
+    
+    def _find_king_square(self, color: Color) -> int:
+        for square, piece in enumerate(self.board.squares):
+            if piece is not None and piece.color is color and piece.piece_type is PieceType.KING:
+                return square
+        raise ValueError(f"No {color} king found")
         
     def _find_king_position(self, color: Color) -> Position:
-        for pos, piece in self.board.get_all_pieces():
-            if piece and piece.color == color and piece.piece_type == PieceType.KING:
-                return pos
-        raise ValueError(f"No {color} king found")
\ No newline at end of file
+        return SQUARES[self._find_king_square(color)]
@@ -0,0 +1,110 @@
+# src/game/zobrist.py
+import random
+from typing import List
+from src.pieces.piece import Color, PieceType
+
+
+# fixed seed so hashes are stable across processes and on-disk indexes
+_rng = random.Random(0x5EED_C4E55)
+
+PIECE_KEYS = {
+    (color, piece_type): [_rng.getrandbits(64) for _ in range(64)]
+    for color in Color
+    for piece_type in PieceType
+}
+SIDE_KEY = _rng.getrandbits(64)
+
+# the same keys looked up by piece class, which hashes far faster than enums;
+# filled on first sight of a class so this module needs no piece imports
+_CLASS_KEYS = {color: {} for color in Color}
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(4)]
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+# (king square, rook square) for white king side, white queen side, black ...
+CASTLING_SQUARES = [ (4, 7), (4, 0), (60, 63), (60, 56) ]
+
+
+def piece_keys(piece) -> List[int]:
+    """
+    The 64 square keys for a piece's colour and type
+    """
+    keys = _CLASS_KEYS[piece.color].get(type(piece))
+    if keys is None:
+        keys = _CLASS_KEYS[piece.color][type(piece)] = PIECE_KEYS[(piece.color, piece.piece_type)]
+    return keys
+
+
+def placement_key(squares) -> int:
+    """
+    Piece placement part of the key, computed from scratch
+    
+    Board keeps this up to date incrementally; this is the reference
+    """
+    key = 0
+    for square, piece in enumerate(squares):
+        if piece is not None:
+            key ^= piece_keys(piece)[square]
+    return key
+
+
+def castling_rights(board) -> list[bool]:
+    """
+    Which of the four castles are still possible in principle
+    """
+    squares = board.squares
+    rights = []
+    for king_square, rook_square in CASTLING_SQUARES:
+        king = squares[king_square]
+        rook = squares[rook_square]
+        rights.append(
+            king is not None and king.piece_type is PieceType.KING and not king.has_moved
+            and rook is not None and rook.piece_type is PieceType.ROOK and not rook.has_moved
+            and rook.color is king.color
+        )
+    return rights
+
+
+def en_passant_file(board, side_to_move: Color):
+    """
+    File index of a pawn that can be taken en passant, or None
+    
+    Only counted when an enemy pawn actually stands next to it, so that
+    positions which differ only by an unusable double step hash the same
+    """
+    squares = board.squares
+    row_start = 32 if side_to_move is Color.WHITE else 24
+    for file_idx in range(8):
+        pawn = squares[row_start + file_idx]
+        if not (pawn is not None and pawn.just_moved_two and pawn.color is not side_to_move
+                and pawn.piece_type is PieceType.PAWN):
+            continue
+        for neighbour in (file_idx - 1, file_idx + 1):
+            if 0 <= neighbour < 8:
+                capturer = squares[row_start + neighbour]
+                if capturer is not None and capturer.piece_type is PieceType.PAWN and capturer.color is side_to_move:
+                    return file_idx
+    return None
+
+
+def compute_hash(board, side_to_move: Color) -> int:
+    """
+    64 bit Zobrist key of a position
+    
+    Covers piece placement, side to move, castling rights and the en
+    passant file, so two keys match exactly when the positions are the same
+    for the rules of the game
+    """
+    key = board.placement_key
+    
+    if side_to_move == Color.BLACK:
+        key ^= SIDE_KEY
+    
+    for right, castling_key in zip(castling_rights(board), CASTLING_KEYS):
+        if right:
+            key ^= castling_key
+    
+    ep_file = en_passant_file(board, side_to_move)
+    if ep_file is not None:
+        key ^= EN_PASSANT_KEYS[ep_file]
+    
+    return key
@@ -0,0 +1,48 @@
+# src/notation/coordinate.py
+from typing import Optional
+from src.game.chess_game import ChessGame
+from src.game.moves import PROMOTION_SHIFT, Move
+
+
+PROMOTION_SUFFIXES = 'nbrq'  # in PROMOTION_CODES order
+
+
+def move_to_uci(move: int) -> str:
+    """
+    Long algebraic coordinate notation as used by UCI, e.g. e2e4 or e7e8q
+    """
+    move = Move(move)
+    text = f"{move.from_position}{move.to_position}".lower()
+    promotion_code = (move >> PROMOTION_SHIFT) & 0b111
+    if promotion_code:
+        text += PROMOTION_SUFFIXES[promotion_code - 1]
+    return text
+
+
+def uci_to_move(game: ChessGame, text: str) -> Optional[Move]:
+    """
+    Find the legal move a coordinate string describes, None if there is none
+    """
+    text = text.strip().lower()
+    if len(text) not in (4, 5):
+        return None
+    
+    try:
+        from_square = _square(text[0:2])
+        to_square = _square(text[2:4])
+    except ValueError:
+        return None
+    
+    promotion = 0
+    if len(text) == 5:
+        if text[4] not in PROMOTION_SUFFIXES:
+            return None
+        promotion = PROMOTION_SUFFIXES.index(text[4]) + 1
+    
+    return game.get_legal_moves().find(from_square, to_square, promotion)
+
+
+def _square(text: str) -> int:
+    if text[0] not in 'abcdefgh' or text[1] not in '12345678':
+        raise ValueError(f"Invalid square {text}")
+    return (int(text[1]) - 1) * 8 + 'abcdefgh'.index(text[0])
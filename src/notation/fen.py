@@ -0,0 +1,87 @@
+# src/notation/fen.py
+from typing import List
+from src.board.snapshot import CODE_PIECES, EMPTY, BoardSnapshot
+from src.game.chess_game import ChessGame
+from src.pieces.piece import Color
+
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# castling letters in CASTLING_SQUARES order: white king side, white queen side, black ...
+CASTLING_LETTERS = 'KQkq'
+
+
+class FENError(ValueError):
+    """
+    Raised for FEN strings that do not describe a playable position
+    """
+    pass
+
+
+def parse_fen(text: str) -> BoardSnapshot:
+    """
+    The position a FEN string describes
+
+    The move counters are optional and ignored, ChessGame does not track
+    them. Castling rights without the king and rook on their home squares
+    and an en passant square no pawn can capture on are dropped, as
+    BoardSnapshot.from_board would drop them
+    """
+    fields = text.split()
+    if len(fields) not in (4, 6):
+        raise FENError(f"Expected 4 or 6 fields, got {len(fields)}")
+    placement, side, castling, en_passant = fields[:4]
+
+    rows = placement.split('/')
+    if len(rows) != 8:
+        raise FENError(f"Expected 8 ranks, got {len(rows)}")
+    ranks = [_rank(row) for row in reversed(rows)]
+    for king in 'Kk':
+        if sum(rank.count(king) for rank in ranks) != 1:
+            raise FENError(f"Expected exactly one {king}")
+
+    if side not in ('w', 'b'):
+        raise FENError(f"Bad side to move {side}")
+    side_to_move = Color.WHITE if side == 'w' else Color.BLACK
+
+    rights = 0
+    if castling != '-':
+        for letter in castling:
+            if letter not in CASTLING_LETTERS:
+                raise FENError(f"Bad castling rights {castling}")
+            rights |= 1 << CASTLING_LETTERS.index(letter)
+
+    ep_file = None
+    if en_passant != '-':
+        if len(en_passant) != 2 or en_passant[0] not in 'abcdefgh' or en_passant[1] != ('6' if side == 'w' else '3'):
+            raise FENError(f"Bad en passant square {en_passant}")
+        ep_file = 'abcdefgh'.index(en_passant[0])
+        # the pawn that double stepped stands just past the square
+        pawn_row = 4 if side_to_move is Color.WHITE else 3
+        if ranks[pawn_row][ep_file] != ('p' if side_to_move is Color.WHITE else 'P'):
+            raise FENError(f"No pawn to take en passant on {en_passant}")
+
+    snapshot = BoardSnapshot(tuple(tuple(rank) for rank in ranks), side_to_move, rights, ep_file, 0)
+    # rebuilt from the board: only usable rights and captures kept, key computed
+    return BoardSnapshot.from_board(snapshot.to_board(), side_to_move)
+
+
+def game_from_fen(text: str) -> ChessGame:
+    """
+    A game continuing from a FEN position
+    """
+    return ChessGame.from_snapshot(parse_fen(text))
+
+
+def _rank(row: str) -> List[str]:
+    codes: List[str] = []
+    for char in row:
+        if char in '12345678':
+            codes.extend(EMPTY * int(char))
+        elif char in CODE_PIECES:
+            codes.append(char)
+        else:
+            raise FENError(f"Bad piece code {char}")
+    if len(codes) != 8:
+        raise FENError(f"Rank {row} does not have 8 squares")
+    return codes
@@ -0,0 +1,147 @@
+# src/notation/pgn.py
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from src.game.chess_game import ChessGame
+from src.notation.san import SANError, push_san
+
+
+HEADER_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+
+# comments, variations, NAGs, move numbers and results are all dropped
+MOVETEXT_TOKEN = re.compile(r'\{[^}]*\}|;[^\n]*|\(|\)|\$\d+|\d+\.+|[^\s(){};]+')
+RESULTS = {'1-0', '0-1', '1/2-1/2', '*'}
+
+HeaderFilter = Callable[[Dict[str, str]], bool]
+
+
+class PGNError(ValueError):
+    """
+    Raised when a game's move text cannot be replayed
+    """
+    pass
+
+
+class PGNGame:
+    """
+    One game from a PGN stream: its tag pairs plus the raw move text
+    
+    Design Considerations:
+    - Move text is kept as a string and only tokenized on demand
+    - Replaying is a separate, explicit step
+    """
+    def __init__(self, headers: Dict[str, str], movetext: str):
+        self.headers = headers
+        self.movetext = movetext
+    
+    @property
+    def result(self) -> str:
+        return self.headers.get('Result', '*')
+    
+    def moves(self) -> Iterator[str]:
+        """
+        Yield the mainline SAN tokens, skipping comments and variations
+        """
+        variation_depth = 0
+        for token in MOVETEXT_TOKEN.findall(self.movetext):
+            if token == '(':
+                variation_depth += 1
+                continue
+            if token == ')':
+                variation_depth = max(0, variation_depth - 1)
+                continue
+            if variation_depth or token[0] in '{;$' or token in RESULTS:
+                continue
+            # move numbers start with a digit, castling written with zeros too
+            if token[0].isdigit() and not token.startswith('0-0'):
+                continue
+            yield token
+    
+    def replay(self) -> Iterator[ChessGame]:
+        """
+        Play the mainline, yielding the same game object after every move
+        """
+        if 'FEN' in self.headers:
+            raise PGNError("Games starting from a FEN position are not supported")
+        
+        game = ChessGame()
+        for ply, san in enumerate(self.moves(), start=1):
+            try:
+                push_san(game, san)
+            except (SANError, ValueError) as error:
+                raise PGNError(f"Move {ply} ({san}): {error}") from error
+            yield game
+    
+    def final_position(self) -> ChessGame:
+        """
+        Replay the whole mainline and return the finished game
+        """
+        game = ChessGame()
+        for game in self.replay():
+            pass
+        return game
+    
+    def __repr__(self):
+        white = self.headers.get('White', '?')
+        black = self.headers.get('Black', '?')
+        return f"PGNGame({white} vs {black}, {self.result})"
+
+
+def read_games(stream: Iterable[str], header_filter: Optional[HeaderFilter] = None) -> Iterator[PGNGame]:
+    """
+    Lazily read games from a PGN text stream
+    
+    Only one game is held in memory at a time. When `header_filter` rejects
+    a game's tag pairs, its move text lines are skipped without being
+    stored or tokenized.
+    
+    Args:
+        stream: Any iterable of lines, usually an open text file
+        header_filter: Called with the tag pairs, return False to skip the game
+    """
+    headers: Dict[str, str] = {}
+    movetext: List[str] = []
+    in_movetext = False
+    tags_closed = False   # a blank line followed the tag pairs
+    keep = True
+    
+    for line in stream:
+        stripped = line.strip()
+        
+        if stripped.startswith('['):
+            header = HEADER_PATTERN.match(stripped)
+            if header:
+                # a tag pair after move text, or after a tag section that a
+                # blank line closed (a game without moves), starts the next game
+                if in_movetext or tags_closed:
+                    if not in_movetext:
+                        keep = header_filter is None or header_filter(headers)
+                    if keep:
+                        yield PGNGame(headers, '\n'.join(movetext))
+                    headers, movetext, in_movetext, keep, tags_closed = {}, [], False, True, False
+                headers[header.group(1)] = header.group(2).replace('\\"', '"')
+                continue
+        
+        if not stripped:
+            if headers and not in_movetext:
+                tags_closed = True
+            continue
+        
+        if not in_movetext:
+            in_movetext = True
+            keep = header_filter is None or header_filter(headers)
+        
+        if keep:
+            movetext.append(stripped)
+    
+    if in_movetext and keep:
+        yield PGNGame(headers, '\n'.join(movetext))
+    elif headers and not in_movetext and (header_filter is None or header_filter(headers)):
+        yield PGNGame(headers, '')
+
+
+def open_games(path: str, header_filter: Optional[HeaderFilter] = None) -> Iterator[PGNGame]:
+    """
+    Stream games from a PGN file on disk
+    """
+    with open(path, encoding='utf-8', errors='replace') as stream:
+        yield from read_games(stream, header_filter)
@@ -0,0 +1,182 @@
+# src/notation/san.py
+import re
+from typing import Optional, Tuple, Type
+from src.game.chess_game import ChessGame, GameState
+from src.game.moves import Move
+from src.pieces.concrete_pieces import PIECE_CLASSES, Bishop, Knight, Queen, Rook
+from src.pieces.piece import Color, Piece, PieceType, Position
+
+
+PIECE_LETTERS = {
+    PieceType.KING: 'K',
+    PieceType.QUEEN: 'Q',
+    PieceType.ROOK: 'R',
+    PieceType.BISHOP: 'B',
+    PieceType.KNIGHT: 'N',
+}
+LETTER_PIECE_TYPES = {letter: piece_type for piece_type, letter in PIECE_LETTERS.items()}
+
+PROMOTION_PIECES = {'Q': Queen, 'R': Rook, 'B': Bishop, 'N': Knight}
+PROMOTION_LETTERS = {piece_class: letter for letter, piece_class in PROMOTION_PIECES.items()}
+
+SAN_PATTERN = re.compile(
+    r'^(?P<piece>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?x?'
+    r'(?P<target>[a-h][1-8])(?:=?(?P<promotion>[NBRQ]))?$'
+)
+
+DecodedMove = Tuple[Position, Position, Optional[Type[Piece]]]
+
+
+class SANError(ValueError):
+    """
+    Raised when a SAN string cannot be matched to exactly one legal move
+    """
+    pass
+
+
+def decode_san(game: ChessGame, san: str) -> DecodedMove:
+    """
+    Translate a SAN string into (from, to, promotion piece class)
+    
+    Matches against the game's cached legal move list, so decoding and
+    then playing the move generates the position's moves only once
+    """
+    text = san.rstrip('+#!?')
+    rank = 1 if game.current_turn == Color.WHITE else 8
+    
+    if text in ('O-O', '0-0'):
+        return _castling_move(game, san, Position('E', rank), Position('G', rank))
+    if text in ('O-O-O', '0-0-0'):
+        return _castling_move(game, san, Position('E', rank), Position('C', rank))
+    
+    match = SAN_PATTERN.match(text)
+    if not match:
+        raise SANError(f"Malformed SAN move {san!r}")
+    
+    piece_type = LETTER_PIECE_TYPES.get(match.group('piece'), PieceType.PAWN)
+    target = Position(match.group('target')[0], int(match.group('target')[1]))
+    from_file = match.group('file').upper() if match.group('file') else None
+    from_rank = int(match.group('rank')) if match.group('rank') else None
+    promotion = PROMOTION_PIECES[match.group('promotion')] if match.group('promotion') else None
+    
+    candidates = []
+    for move in _moves_to(game, target):
+        origin = move.from_position
+        if game.board.get_piece_at(origin).piece_type != piece_type:
+            continue
+        if from_file and origin.file != from_file:
+            continue
+        if from_rank and origin.rank != from_rank:
+            continue
+        if origin not in candidates:
+            candidates.append(origin)
+    
+    if not candidates:
+        raise SANError(f"Illegal move {san!r}")
+    if len(candidates) > 1:
+        raise SANError(f"Ambiguous move {san!r}")
+    
+    is_promotion = piece_type == PieceType.PAWN and target.rank in (1, 8)
+    if is_promotion and promotion is None:
+        raise SANError(f"Promotion piece missing in {san!r}")
+    if promotion is not None and not is_promotion:
+        raise SANError(f"Unexpected promotion in {san!r}")
+    
+    return candidates[0], target, promotion
+
+
+def encode_san(game: ChessGame, from_pos: Position, to_pos: Position,
+               promotion: Optional[Type[Piece]] = None) -> str:
+    """
+    Produce the SAN string for a legal move in the current position
+    
+    The check/mate suffix depends on the resulting position, so it is only
+    added by push_move, which actually plays the move
+    """
+    piece = game.board.get_piece_at(from_pos)
+    if piece is None:
+        raise SANError(f"No piece at {from_pos}")
+    
+    if piece.piece_type == PieceType.KING and abs(ord(to_pos.file) - ord(from_pos.file)) == 2:
+        return 'O-O' if to_pos.file == 'G' else 'O-O-O'
+    
+    is_capture = game.board.get_piece_at(to_pos) is not None
+    target = str(to_pos).lower()
+    
+    if piece.piece_type == PieceType.PAWN:
+        # diagonal pawn moves are always captures, en passant included
+        if from_pos.file != to_pos.file:
+            san = f"{from_pos.file.lower()}x{target}"
+        else:
+            san = target
+        if promotion is not None:
+            san += f"={PROMOTION_LETTERS[promotion]}"
+        return san
+    
+    rivals = [
+        move.from_position
+        for move in _moves_to(game, to_pos)
+        if move.from_position != from_pos
+        and game.board.get_piece_at(move.from_position).piece_type == piece.piece_type
+    ]
+    
+    disambiguation = ''
+    if rivals:
+        if all(rival.file != from_pos.file for rival in rivals):
+            disambiguation = from_pos.file.lower()
+        elif all(rival.rank != from_pos.rank for rival in rivals):
+            disambiguation = str(from_pos.rank)
+        else:
+            disambiguation = str(from_pos).lower()
+    
+    return f"{PIECE_LETTERS[piece.piece_type]}{disambiguation}{'x' if is_capture else ''}{target}"
+
+
+def push_move(game: ChessGame, from_pos: Position, to_pos: Position,
+              promotion: Optional[Type[Piece]] = None) -> str:
+    """
+    Play a move and return its SAN, including the check/mate suffix
+    """
+    san = encode_san(game, from_pos, to_pos, promotion)
+    if not game.move_piece(from_pos, to_pos, promotion):
+        raise SANError(f"Illegal move {san!r}")
+    
+    if game.game_state == GameState.CHECKMATE:
+        return san + '#'
+    if game.is_in_check():
+        return san + '+'
+    return san
+
+
+def push_san(game: ChessGame, san: str) -> str:
+    """
+    Decode a SAN string, play it, and return the normalised SAN
+    """
+    from_pos, to_pos, promotion = decode_san(game, san)
+    return push_move(game, from_pos, to_pos, promotion)
+
+
+def legal_moves_san(game: ChessGame) -> list[str]:
+    """
+    SAN (without suffixes) for every legal move of the side to move
+    """
+    return [
+        encode_san(game, move.from_position, move.to_position,
+                   PIECE_CLASSES[move.promotion] if move.promotion else None)
+        for move in game.get_legal_moves()
+    ]
+
+
+def _moves_to(game: ChessGame, target: Position) -> list[Move]:
+    target_square = target.square
+    return [move for move in game.get_legal_moves() if move.to_square == target_square]
+
+
+def _castling_move(game: ChessGame, san: str, king_pos: Position, target: Position) -> DecodedMove:
+    king = game.board.get_piece_at(king_pos)
+    if not king or king.piece_type != PieceType.KING or king.color != game.current_turn:
+        raise SANError(f"Illegal move {san!r}")
+    
+    if not any(move.from_position == king_pos for move in _moves_to(game, target)):
+        raise SANError(f"Illegal move {san!r}")
+    return king_pos, target, None
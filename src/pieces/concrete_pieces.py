@@ -6,11 +6,14 @@ from src.pieces.movement import MovementStrategyFactory
 class Rook(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(Rook)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.ROOK)
     
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.ROOK
@@ -19,11 +22,14 @@ class Rook(Piece):
 class Knight(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(Knight)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.KNIGHT)
 
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.KNIGHT
@@ -33,11 +39,14 @@ class Knight(Piece):
 class Bishop(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(Bishop)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.BISHOP)
 
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.BISHOP
@@ -47,11 +56,14 @@ class Bishop(Piece):
 class Queen(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(Queen)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.QUEEN)
 
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.QUEEN
@@ -61,11 +73,14 @@ class Queen(Piece):
 class King(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(King)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.KING)
 
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.KING
@@ -75,11 +90,25 @@ class King(Piece):
 class Pawn(Piece):
     def __init__(self, color:Color, position:Position):
         super().__init__(color, position)
-        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(Pawn)
+        self.movement_strategy = MovementStrategyFactory.get_movement_strategy(PieceType.PAWN)
 
     def get_possible_moves(self, board):
         return self.movement_strategy.calculate_possible_moves(self, board)
     
+    def generate_moves(self, board, moves):
+        return self.movement_strategy.generate_moves(self, board, moves)
+    
     @property
     def piece_type(self) -> PieceType:
         return PieceType.PAWN
+
+
+# lookup used when a packed move names the piece a pawn promotes to
+PIECE_CLASSES = {
+    PieceType.ROOK: Rook,
+    PieceType.KNIGHT: Knight,
+    PieceType.BISHOP: Bishop,
+    PieceType.QUEEN: Queen,
+    PieceType.KING: King,
+    PieceType.PAWN: Pawn,
+}
@@ -1,142 +1,203 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Type
 from src.board.board import Board
-from src.game.moves import PromotionMove
-from src.pieces.piece import Position, Piece, Color
+from src.game.moves import (
+    CAPTURE, CASTLING, DOUBLE_PUSH, EN_PASSANT, SQUARES, SQUARE_MASK, TO_SHIFT,
+    PROMOTION_SHIFT, MoveList
+)
+from src.pieces.piece import Position, Piece, Color, PieceType
+
+
+KNIGHT_OFFSETS = [ (1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1) ]
+KING_OFFSETS = [ (-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1),  (1, 0),  (1, 1) ]
+ORTHOGONAL_DIRECTIONS = [ (0, 1), (0, -1), (1, 0), (-1, 0) ]
+DIAGONAL_DIRECTIONS = [ (1, 1), (1, -1), (-1, 1), (-1, -1) ]
+
+# promotion codes from moves.PROMOTION_CODES, queen first
+PROMOTION_ORDER = (4, 3, 2, 1)
+
+
+def _build_jump_table(offsets) -> List[List[int]]:
+    """
+    For every square, the squares reachable with one of the offsets
+    """
+    table = []
+    for square in range(64):
+        file_idx, rank_idx = square % 8, square // 8
+        table.append([
+            (rank_idx + dy) * 8 + file_idx + dx
+            for dx, dy in offsets
+            if 0 <= file_idx + dx < 8 and 0 <= rank_idx + dy < 8
+        ])
+    return table
+
+
+def _build_ray_table(directions) -> List[List[List[int]]]:
+    """
+    For every square, one list of squares per direction, nearest first
+    """
+    table = []
+    for square in range(64):
+        rays = []
+        for dx, dy in directions:
+            ray = []
+            file_idx, rank_idx = square % 8 + dx, square // 8 + dy
+            while 0 <= file_idx < 8 and 0 <= rank_idx < 8:
+                ray.append(rank_idx * 8 + file_idx)
+                file_idx, rank_idx = file_idx + dx, rank_idx + dy
+            if ray:
+                rays.append(ray)
+        table.append(rays)
+    return table
+
+
+KNIGHT_TARGETS = _build_jump_table(KNIGHT_OFFSETS)
+KING_TARGETS = _build_jump_table(KING_OFFSETS)
+ORTHOGONAL_RAYS = _build_ray_table(ORTHOGONAL_DIRECTIONS)
+DIAGONAL_RAYS = _build_ray_table(DIAGONAL_DIRECTIONS)
+
+# squares a pawn of each color attacks from a given square
+PAWN_CAPTURES = {
+    Color.WHITE: _build_jump_table([ (-1, 1), (1, 1) ]),
+    Color.BLACK: _build_jump_table([ (-1, -1), (1, -1) ]),
+}
+
+
+def attacks_square(board:Board, square:int, attacker_color:Color) -> bool:
+    """
+    Check whether any piece of `attacker_color` attacks a square number
+    
+    Works backwards from the target square (pawn, knight, king and sliding
+    rays) instead of generating every opponent move, so it is cheap and
+    never recurses into castling logic
+    """
+    squares = board.squares
+    
+    # a pawn attacks the square if it stands where a defending pawn would capture
+    defender_color = Color.BLACK if attacker_color is Color.WHITE else Color.WHITE
+    for origin in PAWN_CAPTURES[defender_color][square]:
+        attacker = squares[origin]
+        if attacker is not None and attacker.color is attacker_color and attacker.piece_type is PieceType.PAWN:
+            return True
+    
+    for origin in KNIGHT_TARGETS[square]:
+        attacker = squares[origin]
+        if attacker is not None and attacker.color is attacker_color and attacker.piece_type is PieceType.KNIGHT:
+            return True
+    
+    for origin in KING_TARGETS[square]:
+        attacker = squares[origin]
+        if attacker is not None and attacker.color is attacker_color and attacker.piece_type is PieceType.KING:
+            return True
+    
+    for rays, piece_types in ((ORTHOGONAL_RAYS, (PieceType.ROOK, PieceType.QUEEN)),
+                              (DIAGONAL_RAYS, (PieceType.BISHOP, PieceType.QUEEN))):
+        for ray in rays[square]:
+            for origin in ray:
+                blocker = squares[origin]
+                if blocker is not None:
+                    if blocker.color is attacker_color and blocker.piece_type in piece_types:
+                        return True
+                    break
+    
+    return False
+
+
+def is_square_attacked(board:Board, position:Position, attacker_color:Color) -> bool:
+    """
+    Position-based wrapper around attacks_square
+    """
+    return attacks_square(board, position.square, attacker_color)
+
+
+def _generate_jump_moves(piece:Piece, board:Board, table:List[List[int]], moves:MoveList) -> MoveList:
+    squares = board.squares
+    from_square = piece.current_position.square
+    for target in table[from_square]:
+        occupant = squares[target]
+        if occupant is None:
+            moves.append(from_square | (target << TO_SHIFT))
+        elif occupant.color is not piece.color:
+            moves.append(from_square | (target << TO_SHIFT) | CAPTURE)
+    return moves
+
+
+def _generate_sliding_moves(piece:Piece, board:Board, rays:List[List[List[int]]], moves:MoveList) -> MoveList:
+    squares = board.squares
+    from_square = piece.current_position.square
+    for ray in rays[from_square]:
+        for target in ray:
+            occupant = squares[target]
+            if occupant is None:
+                moves.append(from_square | (target << TO_SHIFT))
+                continue
+            # stop at the first piece, capturing it if it is an opponent
+            if occupant.color is not piece.color:
+                moves.append(from_square | (target << TO_SHIFT) | CAPTURE)
+            break
+    return moves
 
 
 class MovementStrategy(ABC):
     
     @abstractmethod
-    def calculate_possible_moves(self, piece:Piece, board:Board)->List[Position]:
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
         """
         Core movement calculation strategy
         
         Args:
             piece: The piece being moved
             board: Current board state
+            moves: Buffer the packed pseudo-legal moves are appended to
         
         Returns:
-            List of valid destination positions
+            The same buffer, for chaining
         """
         pass
+    
+    def calculate_possible_moves(self, piece:Piece, board:Board) -> List[Position]:
+        """
+        Destination squares of generate_moves
+        
+        Kept for callers that think in positions; promotions to different
+        pieces collapse onto one destination
+        """
+        targets = dict.fromkeys(
+            (code >> TO_SHIFT) & SQUARE_MASK
+            for code in self.generate_moves(piece, board, MoveList()).raw()
+        )
+        return [SQUARES[target] for target in targets]
 
 class RookMovementStrategy(MovementStrategy):
-    def calculate_possible_moves(self, piece, board)-> List[Position]:
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
         """
         Rook movement logic:
         - Moves horizontally and vertically
         - Stops at board edges or blocked squares
         - Can capture opponent pieces
         """
-        possible_moves = []
-        current_pos = piece.current_position
-        
-        directions = [
-            (0, 1), # North
-            (0, -1), # South
-            (1, 0), # East
-            (-1, 0), # West
-        ]
-        
-        # unpack the directions into verrtical and horizontal 
-        for dx, dy in directions:
-            
-            for step in range(1,8): # the most it can go is 7 from the starting line
-                # get current position letter convert it to number, add the steps you moved, convert the wwhole thing back to character  
-                new_file = chr(ord(current_pos.file) + dx*step)
-                new_rank = current_pos.rank + dy*step
-                
-                # validation of the new position
-                try:
-                    new_pos = Position(new_file,new_rank)
-                except ValueError:
-                    # it means youre outside the board
-                    break
-                
-                # incase when moving there is a blocking piece (we check whether we are sure or not)
-                blocking_piece = board.get_piece_at(new_pos)
-                
-                if blocking_piece:
-                    
-                    # if its our team or opponent
-                    if blocking_piece.color != piece.color:
-                        possible_moves.append(new_pos)
-                    break
-                
-                possible_moves.append(new_pos)
-        
-        return possible_moves
+        return _generate_sliding_moves(piece, board, ORTHOGONAL_RAYS, moves)
     
     
     
 class KnightMovementStrategy(MovementStrategy):
-    def calculate_possible_moves( self, piece: Piece, board: Board ) -> List[Position]:
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
         """
         Knight movement logic:
         - L-shaped movement
         - Can jump over other pieces
         """
-        possible_moves = []
-        current_pos = piece.current_position
-
-        # 8 L-shaped possible formats
-        knight_moves = [ (1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1) ]
-
-        for dx, dy in knight_moves:
-            new_file = chr(ord(current_pos.file) + dx)
-            new_rank = current_pos.rank + dy
-
-            # Validate and process potential move
-            try:
-                new_pos = Position(new_file, new_rank)
-                blocking_piece = board.get_piece_at(new_pos)
-
-                # Can move to empty squares or capture opponent pieces
-                if not blocking_piece or blocking_piece.color != piece.color:
-                    possible_moves.append(new_pos)
-            except ValueError:
-                # Invalid board position, skip
-                continue
-
-        return possible_moves
+        return _generate_jump_moves(piece, board, KNIGHT_TARGETS, moves)
 
 
 class BishopMovementStrategy(MovementStrategy):
-    def calculate_possible_moves(self, piece:Piece, board:Board):
-        
-        possible_moves = []
-        current_pos = piece.current_position
-        
-        # setting out diagonal moves for ther bishop
-        directions = [
-            (1, 1),
-            (1, -1),
-            (-1, 1),
-            (-1, -1)
-        ]
-        
-        for dx, dy in directions:
-            for step in range(1,8):
-                new_file = chr(ord(current_pos.file) + dx*step)
-                new_rank = current_pos.rank +dy*step
-                
-                try:
-                    new_pos = Position(new_rank, new_file)
-                except ValueError:
-                    break
-                
-                # incase of blocking piece
-                blocking_piece = board.get_piece_at(new_pos)
-                
-                # incase there is a blocking piece
-                if blocking_piece:
-                    if blocking_piece.color != piece.color:
-                        possible_moves.append(new_pos)
-                
-                possible_moves.append(new_pos)
-        
-        return possible_moves
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
+        """
+        Bishop movement logic:
+        - Moves diagonally
+        - Stops at board edges or blocked squares
+        """
+        return _generate_sliding_moves(piece, board, DIAGONAL_RAYS, moves)
 
 
 
@@ -145,154 +206,122 @@ class QueenMovementStrategy(MovementStrategy):
         self.rook_strategy = RookMovementStrategy()
         self.bishop_strategy = BishopMovementStrategy()
 
-    def calculate_possible_moves(self, piece:Piece, board:Board)->List[Position]:
-        rook_moves = self.rook_strategy.calculate_possible_moves(piece,board)
-        bishop_moves = self.bishop_strategy.calculate_possible_moves(piece,board)
-        return rook_moves + bishop_moves
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
+        self.rook_strategy.generate_moves(piece, board, moves)
+        return self.bishop_strategy.generate_moves(piece, board, moves)
 
 class PawnMovementStrategy(MovementStrategy):
-    def calculate_possible_moves(self, piece:Piece, board:Board):
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
         
-        from src.pieces.concrete_pieces import ( Rook, Knight, Queen, Bishop )
-        
-        possible_moves = []
-        current_pos = piece.current_position
-        promotion_rank = 8 if piece.color == Color.WHITE else 1
+        squares = board.squares
+        from_square = piece.current_position.square
         
         # separate light player and dark player sense of direction
-        direction = 1 if piece.color == Color.WHITE else -1
+        if piece.color is Color.WHITE:
+            step, start_row, promotion_row = 8, 1, 7
+        else:
+            step, start_row, promotion_row = -8, 6, 0
         
         # movement logic
-        new_rank = current_pos.rank + direction
-                
-        try:
-            # validate the movement
-            forward_pos = Position(current_pos.file, new_rank)
-            
-            # check for obstacles
-            if not board.get_piece_at(forward_pos):
-                possible_moves.append(forward_pos)
+        forward = from_square + step
+        if 0 <= forward < 64 and squares[forward] is None:
+            self._add_pawn_move(from_square, forward, 0, promotion_row, moves)
             
-            
-            # double moving at the beginning
-            if not piece.has_moved:
-                double_rank = current_pos.rank + (2*direction)
-                double_pos = Position(current_pos.file, double_rank)
-                
-                # check if obstacle
-                if not board. get_piece_at(double_pos):
-                    possible_moves.append(double_pos)
-                    
-        except ValueError:
-            pass
+            # double moving at the beginning, only through an empty square
+            if from_square // 8 == start_row and squares[forward + step] is None:
+                moves.append(from_square | ((forward + step) << TO_SHIFT) | DOUBLE_PUSH)
         
         # capturing logic
-        for dx in [-1, 1]:
-            try:
-                new_file = chr(ord(current_pos.file) + dx)
-                capture_pos = Position(new_file, new_rank)
-                target = board.get_piece_at(capture_pos)
-                
-                if target and target.color != piece.color:
-                    possible_moves.append(capture_pos)
-            except ValueError:
-                continue
-            
-        for move in possible_moves:
-            if move.rank == promotion_rank:
-                # Add promotion moves for each possible piece type
-                for promotion_type in [Queen, Rook, Bishop, Knight]:
-                    possible_moves.append(PromotionMove(move, promotion_type))
-            else:
-                possible_moves.append(move)
-                    
+        for target in PAWN_CAPTURES[piece.color][from_square]:
+            occupant = squares[target]
+            if occupant is not None and occupant.color is not piece.color:
+                self._add_pawn_move(from_square, target, CAPTURE, promotion_row, moves)
+        
         # Add en passant moves
-        possible_moves.extend(self._get_en_passant_moves(piece, board))
-            
-        return possible_moves
+        return self._generate_en_passant_moves(piece, board, step, moves)
     
-    def _get_en_passant_moves(self, piece: Piece, board: Board) -> List[Position]:
-        if piece.current_position.rank != (5 if piece.color == Color.WHITE else 4):
-            return []
-            
-        en_passant_moves = []
-        for direction in [-1, 1]:
-            try:
-                adjacent_file = chr(ord(piece.current_position.file) + direction)
-                adjacent_pos = Position(adjacent_file, piece.current_position.rank)
-                
-                adjacent_piece = board.get_piece_at(adjacent_pos)
-                if (isinstance(adjacent_piece) and 
-                    adjacent_piece.color != piece.color and 
-                    adjacent_piece.just_moved_two):
-                    
-                    capture_rank = piece.current_position.rank + (1 if piece.color == Color.WHITE else -1)
-                    en_passant_moves.append(Position(adjacent_file, capture_rank))
-            except ValueError:
+    def _add_pawn_move(self, from_square: int, target: int, flags: int, promotion_row: int, moves: MoveList):
+        route = from_square | (target << TO_SHIFT) | flags
+        if target // 8 == promotion_row:
+            # Add promotion moves for each possible piece type
+            for promotion in PROMOTION_ORDER:
+                moves.append(route | (promotion << PROMOTION_SHIFT))
+        else:
+            moves.append(route)
+    
+    def _generate_en_passant_moves(self, piece: Piece, board: Board, step: int, moves: MoveList) -> MoveList:
+        from_square = piece.current_position.square
+        if from_square // 8 != (4 if piece.color is Color.WHITE else 3):
+            return moves
+        
+        squares = board.squares
+        file_idx = from_square % 8
+        for direction in (-1, 1):
+            if not 0 <= file_idx + direction < 8:
                 continue
+            adjacent_piece = squares[from_square + direction]
+            if (adjacent_piece is not None and
+                adjacent_piece.piece_type is PieceType.PAWN and
+                adjacent_piece.color is not piece.color and 
+                adjacent_piece.just_moved_two):
+                
+                target = from_square + direction + step
+                moves.append(from_square | (target << TO_SHIFT) | CAPTURE | EN_PASSANT)
                 
-        return en_passant_moves
+        return moves
 
 
 
 class KingMovementStrategy(MovementStrategy):
-    def calculate_possible_moves(self, piece, board:Board):
-        possible_moves = []
-        current_pos = piece.current_position
-        
-        # all adjacent position 
-        directions = [ (-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1),  (1, 0),  (1, 1) ]
-    
-        for dx, dy in directions:
-            new_file = chr(ord(current_pos.file) + dx)
-            new_rank = current_pos.rank + dy
-            
-            # validate the new position
-            try:
-                new_pos = Position(new_file, new_rank)
-                
-                # incase of any blockers
-                blocking_piece = board.get_piece_at(new_pos)
-                
-                if not blocking_piece or blocking_piece.color != piece.color:
-                    possible_moves.append(new_pos)
-            
-            except ValueError:
-                continue
+    def generate_moves(self, piece:Piece, board:Board, moves:MoveList) -> MoveList:
+        _generate_jump_moves(piece, board, KING_TARGETS, moves)
         
         # Add castling moves if conditions are met
-        if not piece.has_moved and not self._is_king_in_check(piece, board):
+        from_square = piece.current_position.square
+        home_square = 4 if piece.color is Color.WHITE else 60
+        if (not piece.has_moved and from_square == home_square
+                and not self._is_king_in_check(piece, board)):
             # Kingside castling
-            kingside_rook = self._get_rook_for_castling(piece, board, 'H')
+            kingside_rook = self._get_rook_for_castling(piece, board, home_square + 3)
             if kingside_rook and self._can_castle_kingside(piece, kingside_rook, board):
-                possible_moves.append(Position('G', piece.current_position.rank))
+                moves.append(from_square | ((home_square + 2) << TO_SHIFT) | CASTLING)
                 
             # Queenside castling
-            queenside_rook = self._get_rook_for_castling(piece, board, 'A')
+            queenside_rook = self._get_rook_for_castling(piece, board, home_square - 4)
             if queenside_rook and self._can_castle_queenside(piece, queenside_rook, board):
-                possible_moves.append(Position('C', piece.current_position.rank))
-                
+                moves.append(from_square | ((home_square - 2) << TO_SHIFT) | CASTLING)
             
-        return possible_moves
+        return moves
 
-    def _get_rook_for_castling(self, king: Piece, board: Board, file: str) -> Optional[Piece]:
-        rook_pos = Position(file, king.current_position.rank)
-        rook = board.get_piece_at(rook_pos)
-        return rook if isinstance(rook) and not rook.has_moved else None
+    def _get_rook_for_castling(self, king: Piece, board: Board, rook_square: int) -> Optional[Piece]:
+        rook = board.get_piece_at_square(rook_square)
+        is_castling_rook = (
+            rook is not None and rook.piece_type is PieceType.ROOK
+            and rook.color is king.color and not rook.has_moved
+        )
+        return rook if is_castling_rook else None
 
     def _can_castle_kingside(self, king: Piece, rook: Piece, board: Board) -> bool:
-        return self._is_path_clear(king, rook, board, ['F', 'G'])
+        home = king.current_position.square
+        return self._is_path_clear(king, rook, board, [home + 1, home + 2], [home + 1, home + 2])
 
     def _can_castle_queenside(self, king: Piece, rook: Piece, board: Board) -> bool:
-        return self._is_path_clear(king, rook, board, ['B', 'C', 'D'])
-
-    def _is_path_clear(self, king: Piece, rook: Piece, board: Board, files: List[str]) -> bool:
-        rank = king.current_position.rank
-        return all(
-            not board.get_piece_at(Position(file, rank)) and 
-            not self._is_square_attacked(Position(file, rank), board, king.color)
-            for file in files
+        # the B square must be empty but the king never crosses it
+        home = king.current_position.square
+        return self._is_path_clear(king, rook, board, [home - 1, home - 2, home - 3], [home - 1, home - 2])
+
+    def _is_path_clear(self, king: Piece, rook: Piece, board: Board,
+                       empty_squares: List[int], safe_squares: List[int]) -> bool:
+        squares = board.squares
+        attacker_color = Color.BLACK if king.color is Color.WHITE else Color.WHITE
+        return (
+            all(squares[square] is None for square in empty_squares)
+            and not any(attacks_square(board, square, attacker_color) for square in safe_squares)
         )
+    
+    def _is_king_in_check(self, king: Piece, board: Board) -> bool:
+        attacker_color = Color.BLACK if king.color is Color.WHITE else Color.WHITE
+        return attacks_square(board, king.current_position.square, attacker_color)
 
 
 
@@ -305,19 +334,30 @@ class MovementStrategyFactory:
     - Factory Method
     - Strategy Pattern
     """
-    from src.pieces.concrete_pieces import ( Rook, Knight, Bishop, Queen, King, Pawn )
-    
-    _strategies: Dict[Type[Piece], Type[MovementStrategy]] = {
-        Rook: RookMovementStrategy,
-        Knight: KnightMovementStrategy,
-        Bishop: BishopMovementStrategy,
-        Queen: QueenMovementStrategy,
-        King: KingMovementStrategy,
-        Pawn: PawnMovementStrategy,        
+    # keyed by PieceType rather than piece class, so this module never
+    # needs concrete_pieces (which imports it)
+    _strategies: Dict[PieceType, Type[MovementStrategy]] = {
+        PieceType.ROOK: RookMovementStrategy,
+        PieceType.KNIGHT: KnightMovementStrategy,
+        PieceType.BISHOP: BishopMovementStrategy,
+        PieceType.QUEEN: QueenMovementStrategy,
+        PieceType.KING: KingMovementStrategy,
+        PieceType.PAWN: PawnMovementStrategy,
     }
+    
+    # strategies keep no per-piece state, so every piece shares one instance
+    _instances: Dict[PieceType, MovementStrategy] = {}
+    
+    @classmethod
+    def register_strategy(cls, piece_type: PieceType, strategy_class: Type[MovementStrategy]):
+        """
+        Use a different strategy for pieces created from now on
+        """
+        cls._strategies[piece_type] = strategy_class
+        cls._instances.pop(piece_type, None)
 
     @classmethod
-    def get_movement_strategy( cls, piece_type: Type[Piece] ) -> MovementStrategy:
+    def get_movement_strategy( cls, piece_type: PieceType ) -> MovementStrategy:
         """
         Dynamically select appropriate movement strategy
         
@@ -325,8 +365,10 @@ class MovementStrategyFactory:
         - Runtime strategy selection
         - Extensible design
         """
-        strategy_class = cls._strategies.get(piece_type)
-        if not strategy_class:
-            raise ValueError(f"No movement strategy for {piece_type}")
-        
-        return strategy_class()
\ No newline at end of file
+        strategy = cls._instances.get(piece_type)
+        if strategy is None:
+            strategy_class = cls._strategies.get(piece_type)
+            if not strategy_class:
+                raise ValueError(f"No movement strategy for {piece_type}")
+            strategy = cls._instances[piece_type] = strategy_class()
+        return strategy
\ No newline at end of file
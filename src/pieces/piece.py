@@ -49,6 +49,9 @@ class Position:
         # if the file and rank are valid then assign them
         self.file = file.upper()
         self.rank = rank
+        
+        # 0..63 index (A1 = 0, H8 = 63) used by packed moves and board arrays
+        self.square = 'ABCDEFGH'.index(self.file) + (rank - 1) * 8
     
     def __str__(self):
         """
@@ -65,6 +68,20 @@ class Position:
             str: A string representation of the piece's position.
         """
         return f"Position({self.file}, {self.rank})"
+    
+    def __eq__(self, other):
+        """
+        Two positions are equal when they point at the same square
+        """
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.file == other.file and self.rank == other.rank
+    
+    def __hash__(self):
+        """
+        Positions are used as board dictionary keys
+        """
+        return hash((self.file, self.rank))
 
 
 class Piece(ABC):
@@ -94,6 +111,13 @@ class Piece(ABC):
         getter of current piece position
         """
         return self._current_position
+    
+    @current_position.setter
+    def current_position(self, new_position: Position):
+        """
+        setter used by the board to keep the piece in sync with its square
+        """
+        self._current_position = new_position
 
     @property
     def has_moved(self) -> bool:
@@ -101,6 +125,13 @@ class Piece(ABC):
         Track if piece has been moved
         """
         return self._has_moved
+    
+    @has_moved.setter
+    def has_moved(self, value: bool):
+        """
+        setter used when a move is taken back
+        """
+        self._has_moved = value
 
     def move(self, new_position: Position):
         """
@@ -115,10 +146,12 @@ class Piece(ABC):
         else:
             raise ValueError(f"Invalid move for {self.__class__.__name__} to {new_position}")
     
-    @abstractmethod
     def _is_move_valid(self, new_position:Position) -> bool:
         """
-        Abstract method to validate piece-specific move rules
+        Validate piece-specific move rules
+        
+        Board-aware legality is enforced by the movement strategies and the
+        MoveValidator, so the piece itself only checks it got a real square
         
         Args:
             new_position (Position): Proposed move destination
@@ -126,7 +159,7 @@ class Piece(ABC):
         Returns:
             bool: Whether the move is valid
         """
-        pass
+        return isinstance(new_position, Position)
     
     @abstractmethod
     def get_possible_moves(self,board) -> list[Position]:
@@ -141,6 +174,20 @@ class Piece(ABC):
         """
         pass
     
+    @abstractmethod
+    def generate_moves(self, board, moves):
+        """
+        Append this piece's pseudo-legal moves, as packed integers
+        
+        Args:
+            board: Current board state
+            moves: MoveList buffer to append to
+        
+        Returns:
+            The same MoveList
+        """
+        pass
+    
     @property
     @abstractmethod
     def piece_type(self) -> PieceType:
@@ -0,0 +1,244 @@
+# src/profiling/instrumentation.py
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from src.game.chess_game import ChessGame
+from src.game.validation import MoveValidator
+from src.pieces.concrete_pieces import PIECE_CLASSES
+
+
+# power-of-two microsecond buckets: bucket i holds [2**(i-1), 2**i) us
+BUCKETS = 32
+
+Target = Tuple[type, str, str]   # class, method name, stat name
+
+# the rules engine, timed in every process; the search is added with
+# add_targets() by the processes that search (see ChessServer), so that
+# importing this module does not load the engine
+GAME_TARGETS: List[Target] = [
+    target
+    for piece_type, piece_class in PIECE_CLASSES.items()
+    for target in (
+        (piece_class, 'get_possible_moves', f'get_possible_moves.{piece_type.name.lower()}'),
+        (piece_class, 'generate_moves', f'generate_moves.{piece_type.name.lower()}'),
+    )
+] + [
+    (MoveValidator, 'validate_move', 'validate_move'),
+    (MoveValidator, 'get_legal_moves', 'legal_move_generation'),
+    (MoveValidator, '_is_king_in_check', 'is_king_in_check'),
+    (ChessGame, '_update_game_state', 'update_game_state'),
+]
+
+
+class TimingHistogram:
+    """
+    Call count, total/min/max time and a log2 histogram of call durations
+
+    Recording is a handful of integer operations, so it can sit on paths
+    that run millions of times per second of profiling
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def clear(self):
+        self.__init__()
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Upper edge (seconds) of the bucket holding the given percentile
+        """
+        if not self.count:
+            return 0.0
+        wanted = percent / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= wanted:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count, 'total': self.total, 'mean': self.mean,
+            'min': self.min if self.count else 0.0, 'max': self.max,
+            'p50': self.percentile(50), 'p99': self.percentile(99),
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in counters and timing histograms for the engine's hot paths
+
+    Design Considerations:
+    - Nothing is instrumented until enable(): the wrappers are installed on
+      the classes then and the original functions put back by disable(),
+      so a disabled build runs exactly the uninstrumented code
+    - Times are inclusive, a legal move generation includes the king
+      checks it makes
+    - Recording is not locked; with several threads the counts are
+      approximate, which is fine for finding where the time goes
+    - Only GAME_TARGETS are known from the start; code that owns more
+      hot paths registers them with add_targets()
+    """
+    def __init__(self, targets: Iterable[Target] = GAME_TARGETS):
+        self.timings: Dict[str, TimingHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._targets: List[Target] = list(targets)
+        self._originals: List[Tuple[type, str, Callable]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def targets(self) -> List[Target]:
+        """
+        (class, method name, stat name) for everything that gets timed
+        """
+        return list(self._targets)
+
+    def add_targets(self, targets: Iterable[Target]):
+        """
+        Time more methods; ones already known are skipped, and new ones are
+        patched at once while profiling is on
+        """
+        for target in targets:
+            if target in self._targets:
+                continue
+            self._targets.append(target)
+            if self.enabled:
+                self._patch(*target)
+
+    def enable(self):
+        if self.enabled:
+            return
+        for target in self._targets:
+            self._patch(*target)
+
+    def disable(self):
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals.clear()
+
+    def reset(self):
+        # installed wrappers hold on to their histograms, so empty them in place
+        for histogram in self.timings.values():
+            histogram.clear()
+        self.counters.clear()
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name: str) -> TimingHistogram:
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = TimingHistogram()
+        return histogram
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Snapshot of everything recorded so far, by stat name
+        """
+        stats = {name: histogram.as_dict() for name, histogram in sorted(self.timings.items()) if histogram.count}
+        for name, value in sorted(self.counters.items()):
+            stats[name] = {'count': value}
+        return stats
+
+    def report(self) -> str:
+        """
+        Human readable table, slowest total first
+        """
+        lines = [f"{'name':32} {'calls':>10} {'total ms':>10} {'mean us':>9} {'p50 us':>8} {'p99 us':>8}"]
+        for name, histogram in sorted(self.timings.items(), key=lambda item: -item[1].total):
+            if not histogram.count:
+                continue
+            lines.append(
+                f"{name:32} {histogram.count:>10} {histogram.total * 1e3:>10.1f} "
+                f"{histogram.mean * 1e6:>9.1f} {histogram.percentile(50) * 1e6:>8.0f} "
+                f"{histogram.percentile(99) * 1e6:>8.0f}"
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:32} {value:>10}")
+        return '\n'.join(lines)
+
+    def _patch(self, owner: type, attribute: str, name: str):
+        original = owner.__dict__[attribute]
+        self._originals.append((owner, attribute, original))
+        setattr(owner, attribute, self._timed(original, name))
+
+    def _timed(self, function: Callable, name: str) -> Callable:
+        histogram = self.histogram(name)
+        perf_counter = time.perf_counter
+        # searches also report how many nodes they visited
+        counts_nodes = name == 'search'
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter() - start)
+            if counts_nodes:
+                self.count('search.nodes', result.nodes)
+            return result
+        return wrapper
+
+
+# the process wide instance behind the module level functions
+INSTRUMENTATION = Instrumentation()
+
+
+def enable():
+    INSTRUMENTATION.enable()
+
+
+def disable():
+    INSTRUMENTATION.disable()
+
+
+def add_targets(targets: Iterable[Target]):
+    INSTRUMENTATION.add_targets(targets)
+
+
+def reset():
+    INSTRUMENTATION.reset()
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    return INSTRUMENTATION.stats()
+
+
+def report() -> str:
+    return INSTRUMENTATION.report()
+
+
+@contextmanager
+def profiled(reset_first: bool = True) -> Iterator[Instrumentation]:
+    """
+    Instrument the body of a with block
+    """
+    if reset_first:
+        INSTRUMENTATION.reset()
+    INSTRUMENTATION.enable()
+    try:
+        yield INSTRUMENTATION
+    finally:
+        INSTRUMENTATION.disable()
@@ -0,0 +1,47 @@
+# src/server/client.py
+import asyncio
+from typing import Optional
+
+
+class ChessClient:
+    """
+    Minimal async client for ChessServer's line protocol
+    """
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+    
+    async def connect(self) -> 'ChessClient':
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        return self
+    
+    async def send(self, command: str) -> str:
+        """
+        Send one command and wait for its reply line
+        """
+        if self._writer is None:
+            raise RuntimeError("Client is not connected")
+        self._writer.write(command.encode() + b'\n')
+        await self._writer.drain()
+        reply = await self._reader.readline()
+        if not reply:
+            raise ConnectionError("Server closed the connection")
+        return reply.decode().rstrip('\n')
+    
+    async def close(self):
+        if self._writer is not None:
+            self._writer.write(b'QUIT\n')
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+    
+    async def __aenter__(self):
+        return await self.connect()
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,413 @@
+# src/server/game_server.py
+import argparse
+import asyncio
+import contextvars
+import itertools
+import os
+import struct
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+from src.engine.ponder import Ponderer
+from src.engine.search import SearchLimits, Searcher
+from src.engine.time_manager import TimeManager
+from src.game.checkpoint import CheckpointError, pack_many, unpack_many
+from src.game.chess_game import ChessGame, GameOverError, GameState
+from src.game.clock import ChessClock, TimeControl
+from src.game.rendering import BoardRenderer
+from src.notation.coordinate import move_to_uci, uci_to_move
+from src.pieces.piece import Color
+from src.profiling import instrumentation
+from src.server.latency import LatencyRecorder
+
+
+# the server searches, so its profiles time the engine too
+SEARCH_TARGETS = [(Searcher, 'search', 'search')]
+
+# game id in front of each session's checkpoint
+_SESSION_ID = struct.Struct('<I')
+
+# ids of the games NEW created on the current connection (each client runs in its own task)
+_CONNECTION_GAMES: contextvars.ContextVar[Optional[Set[int]]] = contextvars.ContextVar('connection_games', default=None)
+
+
+class ProtocolError(ValueError):
+    """
+    A client command that cannot be carried out; reported as an ERR line
+    """
+    pass
+
+
+class GameSession:
+    """
+    One hosted game and the lock that serialises commands on it
+    
+    Timed games carry a clock; with pondering on, the session keeps its own
+    searcher so the ponder search and the next move share one table
+    """
+    def __init__(self, game_id: int, clock: Optional[ChessClock] = None, ponder: bool = False,
+                 game: Optional[ChessGame] = None):
+        self.game_id = game_id
+        self.game = game if game is not None else ChessGame(clock=clock)
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+        self.searcher: Optional[Searcher] = Searcher(tt_size=1 << 16) if ponder else None
+        self.ponderer: Optional[Ponderer] = Ponderer(self.searcher) if ponder else None
+
+
+class ChessServer:
+    """
+    Line based TCP server hosting many ChessGame sessions in one process
+    
+    Protocol (one command per line, one reply line each):
+        NEW [<seconds>+<increment>]
+                                  -> OK GAME <id>
+        MOVE <id> <e2e4>          -> OK MOVE <id> <e2e4> <state>
+        GO <id> [depth|movetime|nodes <n>]
+                                  -> OK BESTMOVE <id> <move> <state>
+        LEGAL <id>                -> OK LEGAL <id> <move> ...
+        BOARD <id>                -> OK BOARD <id> <rank8>/.../<rank1> <side>
+        CLOCK <id>                -> OK CLOCK <id> <white ms> <black ms> <running w|b|->
+        CLOSE <id>                -> OK CLOSED <id>
+        STATS                     -> OK STATS games=<n> <move latency summary>
+        PROFILE [ON|OFF|RESET]    -> OK PROFILE <on|off> <name>=<calls>/<mean us>/<p99 us> ...
+        QUIT                      -> closes the connection
+    Errors are reported as "ERR <message>".
+    
+    Design Considerations:
+    - Engine searches run in an executor, the event loop only parses
+      commands and applies moves
+    - Each session has its own lock, so a search never races a move on the
+      same game while other games carry on
+    - GO without limits in a timed game takes its budget from the clock;
+      with ponder=True the engine then thinks on the expected reply until
+      the client's next MOVE, and a right guess answers the following GO
+      with little or no further search. Pondering is capped at the
+      engine's own hard budget
+    - A game belongs to the connection that created it and is closed when
+      that connection drops; games without a connection (restored ones,
+      handle_command callers) are closed once idle for idle_timeout
+      seconds if NEW finds the server full
+    - checkpoint()/restore() save and reload every hosted game through the
+      compact ChessGame checkpoints, for restarts and moving games between
+      processes
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 executor: Optional[Executor] = None,
+                 engine_limits: Optional[SearchLimits] = None,
+                 max_games: int = 10_000, ponder: bool = False, idle_timeout: float = 600.0):
+        self.host = host
+        self.port = port
+        self.executor = executor or ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        self.engine_limits = engine_limits or SearchLimits(depth=2)
+        self.max_games = max_games
+        self.ponder = ponder
+        self.idle_timeout = idle_timeout
+        self.time_manager = TimeManager()
+        self.sessions: Dict[int, GameSession] = {}
+        self.move_latency = LatencyRecorder()
+        # board text is shared by every session that reaches a position
+        self.renderer = BoardRenderer()
+        instrumentation.add_targets(SEARCH_TARGETS)
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self) -> Tuple[str, int]:
+        """
+        Start listening, returning the bound (host, port)
+        """
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+    
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def checkpoint(self) -> bytes:
+        """
+        All sessions' games in one blob for restore()
+        
+        Each game is saved under its lock, so never in the middle of a search
+        """
+        records = []
+        for game_id, session in list(self.sessions.items()):
+            async with session.lock:
+                records.append(_SESSION_ID.pack(game_id) + session.game.checkpoint())
+        return pack_many(records)
+    
+    def restore(self, data: bytes) -> int:
+        """
+        Host the games of a checkpoint() blob under their old ids, replacing
+        any session with the same id
+        
+        Returns:
+            Number of games restored
+        
+        Raises:
+            CheckpointError: For truncated or corrupt data; nothing is
+                             restored then
+        """
+        sessions = []
+        for record in unpack_many(data):
+            if len(record) < _SESSION_ID.size:
+                raise CheckpointError("Truncated session checkpoint")
+            (game_id,) = _SESSION_ID.unpack_from(record)
+            game = ChessGame.restore(record[_SESSION_ID.size:])
+            sessions.append(GameSession(game_id, ponder=self.ponder, game=game))
+        
+        for session in sessions:
+            replaced = self.sessions.get(session.game_id)
+            if replaced is not None and replaced.ponderer is not None:
+                replaced.ponderer.stop()
+            self.sessions[session.game_id] = session
+        # new games never reuse a restored id
+        next_id = max(self.sessions, default=0) + 1
+        self._ids = itertools.count(next_id)
+        return len(sessions)
+    
+    async def handle_command(self, line: str) -> str:
+        """
+        Execute one protocol line and return the reply (without newline)
+        """
+        parts = line.split()
+        if not parts:
+            return "ERR empty command"
+        
+        command, args = parts[0].upper(), parts[1:]
+        handler = getattr(self, f'_cmd_{command.lower()}', None)
+        if handler is None:
+            return f"ERR unknown command {command}"
+        try:
+            return await handler(args)
+        except ProtocolError as error:
+            return f"ERR {error}"
+        except GameOverError:
+            return "ERR game is over"
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        owned: Set[int] = set()
+        _CONNECTION_GAMES.set(owned)
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line.upper() == 'QUIT':
+                    break
+                reply = await self.handle_command(line)
+                writer.write(reply.encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            # nobody is left to play these games
+            for game_id in owned:
+                session = self.sessions.get(game_id)
+                if session is not None:
+                    await self._close_session(session)
+    
+    def _session(self, args, expected: int = 1) -> GameSession:
+        if len(args) < expected:
+            raise ProtocolError("missing arguments")
+        try:
+            session = self.sessions.get(int(args[0]))
+        except ValueError:
+            raise ProtocolError(f"bad game id {args[0]}")
+        if session is None:
+            raise ProtocolError(f"no game {args[0]}")
+        session.last_active = time.monotonic()
+        return session
+
+    async def _close_session(self, session: GameSession):
+        """
+        Drop a session and wait for its ponder search, if any
+        """
+        self.sessions.pop(session.game_id, None)
+        if session.ponderer is not None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, session.ponderer.stop)
+
+    async def _evict_idle(self) -> int:
+        """
+        Close the sessions untouched for idle_timeout seconds, returning how many
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [session for session in self.sessions.values()
+                if session.last_active < cutoff and not session.lock.locked()]
+        for session in idle:
+            await self._close_session(session)
+        return len(idle)
+    
+    async def _cmd_new(self, args) -> str:
+        if len(self.sessions) >= self.max_games and not await self._evict_idle():
+            raise ProtocolError("server full")
+        clock = None
+        if args:
+            try:
+                clock = ChessClock(TimeControl.parse(args[0]))
+            except ValueError as error:
+                raise ProtocolError(str(error))
+        session = GameSession(next(self._ids), clock, self.ponder)
+        self.sessions[session.game_id] = session
+        owned = _CONNECTION_GAMES.get()
+        if owned is not None:
+            owned.add(session.game_id)
+        return f"OK GAME {session.game_id}"
+    
+    async def _cmd_move(self, args) -> str:
+        session = self._session(args, 2)
+        async with session.lock:
+            start = time.perf_counter()
+            game = session.game
+            if game.game_state != GameState.ACTIVE:
+                raise GameOverError("Game has ended")
+            move = uci_to_move(game, args[1])
+            if move is None:
+                raise ProtocolError(f"illegal move {args[1]}")
+            game.play_move(move)
+            self.move_latency.record(time.perf_counter() - start)
+            return f"OK MOVE {session.game_id} {move_to_uci(move)} {game.game_state}"
+    
+    async def _cmd_go(self, args) -> str:
+        session = self._session(args)
+        limits = self._parse_limits(args[1:])
+        async with session.lock:
+            game = session.game
+            if game.check_flag() or game.game_state != GameState.ACTIVE:
+                raise GameOverError("Game has ended")
+            # only clock budgeted moves ponder, no longer than the move itself may take
+            ponder_limits = None
+            if session.ponderer is not None and game.clock is not None and not args[1:]:
+                ponder_limits = SearchLimits(movetime=self.time_manager.clock_budget(game).hard)
+            loop = asyncio.get_running_loop()
+            # the session lock keeps the loop away from this game meanwhile
+            result = await loop.run_in_executor(self.executor, self._search, session, limits if args[1:] else None)
+            if result.best_move is None:
+                raise ProtocolError("no legal moves")
+            game.play_move(result.best_move)
+            if ponder_limits is not None and game.game_state == GameState.ACTIVE and len(result.pv) > 1:
+                session.ponderer.start(game, result.pv[1], ponder_limits)
+            return f"OK BESTMOVE {session.game_id} {move_to_uci(result.best_move)} {game.game_state}"
+    
+    def _search(self, session: GameSession, limits: Optional[SearchLimits]):
+        """
+        The engine's move for a session, run in the executor
+        """
+        game = session.game
+        budget = None
+        if limits is None and game.clock is not None:
+            budget = self.time_manager.clock_budget(game)
+        if session.ponderer is not None:
+            # only a clock budget says how long a right guess may keep thinking
+            if budget is None:
+                session.ponderer.stop()
+            else:
+                result = session.ponderer.hit(game, budget)
+                if result is not None:
+                    return result
+        searcher = session.searcher or Searcher()
+        # the ponder search or the last timed search stopped it
+        searcher.reset()
+        if budget is not None:
+            return self.time_manager.search(searcher, game, budget)
+        return searcher.search(game, limits or self.engine_limits)
+    
+    async def _cmd_legal(self, args) -> str:
+        session = self._session(args)
+        async with session.lock:
+            moves = ' '.join(move_to_uci(move) for move in session.game.get_legal_moves())
+        return f"OK LEGAL {session.game_id} {moves}".rstrip()
+    
+    async def _cmd_board(self, args) -> str:
+        session = self._session(args)
+        async with session.lock:
+            codes = self.renderer.codes(session.game.board)
+            ranks = [codes[rank * 8:rank * 8 + 8] for rank in range(7, -1, -1)]
+            side = 'w' if session.game.current_turn == Color.WHITE else 'b'
+        return f"OK BOARD {session.game_id} {'/'.join(ranks)} {side}"
+    
+    async def _cmd_clock(self, args) -> str:
+        session = self._session(args)
+        clock = session.game.clock
+        if clock is None:
+            raise ProtocolError(f"game {session.game_id} is untimed")
+        running = {Color.WHITE: 'w', Color.BLACK: 'b'}.get(clock.running, '-')
+        white, black = (max(0, int(clock.time_left(color) * 1000)) for color in (Color.WHITE, Color.BLACK))
+        return f"OK CLOCK {session.game_id} {white} {black} {running}"
+    
+    async def _cmd_close(self, args) -> str:
+        session = self._session(args)
+        await self._close_session(session)
+        return f"OK CLOSED {session.game_id}"
+    
+    async def _cmd_stats(self, args) -> str:
+        return f"OK STATS games={len(self.sessions)} {self.move_latency.summary()}"
+    
+    async def _cmd_profile(self, args) -> str:
+        action = args[0].upper() if args else ''
+        if action == 'ON':
+            instrumentation.enable()
+        elif action == 'OFF':
+            instrumentation.disable()
+        elif action == 'RESET':
+            instrumentation.reset()
+        elif action:
+            raise ProtocolError("expected PROFILE [ON|OFF|RESET]")
+        
+        entries = []
+        for name, values in instrumentation.stats().items():
+            if 'mean' in values:
+                entries.append(f"{name}={values['count']}/{values['mean'] * 1e6:.1f}/{values['p99'] * 1e6:.0f}")
+            else:
+                entries.append(f"{name}={values['count']}")
+        state = 'on' if instrumentation.INSTRUMENTATION.enabled else 'off'
+        return ' '.join(['OK PROFILE', state] + entries)
+    
+    def _parse_limits(self, args) -> SearchLimits:
+        if not args:
+            return self.engine_limits
+        if len(args) != 2:
+            raise ProtocolError("expected GO <id> depth|movetime|nodes <n>")
+        kind, raw_value = args[0].lower(), args[1]
+        try:
+            value = int(raw_value)
+        except ValueError:
+            raise ProtocolError(f"bad limit {raw_value}")
+        if kind == 'depth':
+            return SearchLimits(depth=value)
+        if kind == 'movetime':
+            return SearchLimits(movetime=value / 1000)
+        if kind == 'nodes':
+            return SearchLimits(nodes=value)
+        raise ProtocolError(f"unknown limit {kind}")
+
+
+async def run_server(host: str = '127.0.0.1', port: int = 8765, ponder: bool = False):
+    server = ChessServer(host, port, ponder=ponder)
+    host, port = await server.start()
+    print(f"Chess server listening on {host}:{port}")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-game chess server")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", action="store_true",
+                        help="start with instrumentation on (see the PROFILE command)")
+    parser.add_argument("--ponder", action="store_true",
+                        help="think on the opponent's time in timed games")
+    args = parser.parse_args()
+    if args.profile:
+        instrumentation.enable()
+    asyncio.run(run_server(args.host, args.port, args.ponder))
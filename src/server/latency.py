@@ -0,0 +1,40 @@
+# src/server/latency.py
+import random
+from typing import List, Optional
+
+
+class LatencyRecorder:
+    """
+    Bounded sample of latencies with percentile queries
+    
+    Keeps a uniform reservoir sample, so memory stays fixed however many
+    moves a long running server records
+    """
+    def __init__(self, capacity: int = 100_000, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.count = 0
+        self._samples: List[float] = []
+        self._rng = random.Random(seed)
+    
+    def record(self, seconds: float):
+        self.count += 1
+        if len(self._samples) < self.capacity:
+            self._samples.append(seconds)
+            return
+        slot = self._rng.randrange(self.count)
+        if slot < self.capacity:
+            self._samples[slot] = seconds
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Latency in seconds below which `percent` of the samples fall
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def summary(self) -> str:
+        return (f"count={self.count} p50={self.percentile(50) * 1000:.2f}ms "
+                f"p99={self.percentile(99) * 1000:.2f}ms")
@@ -0,0 +1,87 @@
+# src/server/load_test.py
+import argparse
+import asyncio
+import random
+import time
+from typing import Optional
+from src.server.client import ChessClient
+from src.server.game_server import ChessServer
+from src.server.latency import LatencyRecorder
+
+
+async def play_random_game(host: str, port: int, plies: int, rng: random.Random,
+                           latency: LatencyRecorder, engine_every: int = 0):
+    """
+    One virtual player: open a game and play random legal moves
+    
+    Every `engine_every`-th ply is left to the engine with GO instead
+    """
+    async with ChessClient(host, port) as client:
+        game_id = (await client.send("NEW")).split()[-1]
+        for ply in range(plies):
+            if engine_every and ply % engine_every == engine_every - 1:
+                start = time.perf_counter()
+                reply = await client.send(f"GO {game_id} depth 1")
+                latency.record(time.perf_counter() - start)
+            else:
+                legal = (await client.send(f"LEGAL {game_id}")).split()[3:]
+                if not legal:
+                    break
+                start = time.perf_counter()
+                reply = await client.send(f"MOVE {game_id} {rng.choice(legal)}")
+                latency.record(time.perf_counter() - start)
+            if not reply.startswith("OK") or not reply.endswith("ACTIVE"):
+                break
+        await client.send(f"CLOSE {game_id}")
+
+
+async def run_load(host: str, port: int, games: int = 100, plies: int = 40,
+                   concurrency: int = 50, seed: int = 1, engine_every: int = 0) -> LatencyRecorder:
+    """
+    Play `games` random games against a server, `concurrency` at a time
+    
+    Returns:
+        Client side move latencies (round trip for MOVE/GO commands)
+    """
+    latency = LatencyRecorder(seed=seed)
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one_game(game_seed: int):
+        async with semaphore:
+            await play_random_game(host, port, plies, random.Random(game_seed), latency, engine_every)
+    
+    await asyncio.gather(*(one_game(rng.getrandbits(32)) for _ in range(games)))
+    return latency
+
+
+async def _main(args):
+    server: Optional[ChessServer] = None
+    host, port = args.host, args.port
+    if host is None:
+        # no target given: load an in-process server
+        server = ChessServer()
+        host, port = await server.start()
+    
+    start = time.perf_counter()
+    latency = await run_load(host, port, args.games, args.plies, args.concurrency, args.seed, args.engine_every)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{args.games} games, {latency.count} moves in {elapsed:.2f}s "
+          f"({latency.count / elapsed:.0f} moves/s)")
+    print(f"move latency {latency.summary()}")
+    if server is not None:
+        print(f"server side  {server.move_latency.summary()}")
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic load generator for the chess server")
+    parser.add_argument("--host", default=None, help="server host (default: start one in-process)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--plies", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--engine-every", type=int, default=0, help="let the engine play every n-th ply")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(_main(parser.parse_args()))
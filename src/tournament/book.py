@@ -0,0 +1,48 @@
+# src/tournament/book.py
+import random
+from typing import List, Optional
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+
+
+# a handful of main lines, used when no book file is given
+DEFAULT_OPENINGS = [
+    "e4 e5 Nf3 Nc6 Bb5",
+    "e4 e5 Nf3 Nc6 Bc4",
+    "e4 c5 Nf3 d6 d4",
+    "e4 e6 d4 d5 Nc3",
+    "e4 c6 d4 d5 e5",
+    "d4 d5 c4 e6 Nc3",
+    "d4 d5 c4 c6 Nf3",
+    "d4 Nf6 c4 g6 Nc3",
+    "d4 Nf6 c4 e6 Nf3",
+    "c4 e5 Nc3 Nf6 g3",
+    "Nf3 d5 g3 Nf6 Bg2",
+    "e4 d5 exd5 Qxd5 Nc3",
+]
+
+
+class OpeningBook:
+    """
+    Opening lines in SAN, one per line, sampled with a fixed seed
+    
+    Design Considerations:
+    - Every line is replayed once when the book is loaded, so a bad line
+      fails early instead of in a worker halfway through a match
+    """
+    def __init__(self, lines: Optional[List[str]] = None, seed: int = 0):
+        self.lines = [line.split() for line in (lines or DEFAULT_OPENINGS) if line.strip()]
+        for line in self.lines:
+            game = ChessGame()
+            for san in line:
+                push_san(game, san)
+        self._rng = random.Random(seed)
+    
+    @classmethod
+    def from_file(cls, path: str, seed: int = 0) -> 'OpeningBook':
+        with open(path, encoding='utf-8') as book_file:
+            lines = [line for line in book_file if line.strip() and not line.startswith('#')]
+        return cls(lines, seed)
+    
+    def sample(self) -> List[str]:
+        return list(self._rng.choice(self.lines))
@@ -0,0 +1,313 @@
+# src/tournament/runner.py
+import argparse
+import importlib
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+from src.database.game_record import encode_game, write_records
+from src.database.position_index import BLACK_WIN, DRAW, WHITE_WIN
+from src.engine.search import SearchLimits, Searcher
+from src.game.chess_game import ChessGame, GameState
+from src.game.moves import Move, decode_move, promotion_code
+from src.notation.san import decode_san
+from src.pieces.concrete_pieces import PIECE_CLASSES
+from src.pieces.piece import Color, PieceType
+from src.tournament.book import OpeningBook
+from src.tournament.stats import SPRT, MatchScore
+
+
+RESULT_TEXT = {WHITE_WIN: '1-0', DRAW: '1/2-1/2', BLACK_WIN: '0-1'}
+
+# adjudication
+MAX_PLIES = 300
+FIFTY_MOVE_PLIES = 100
+REPETITIONS = 3
+
+
+class EngineConfig:
+    """
+    One engine configuration taking part in a match
+
+    Only plain values are stored so configurations can be sent to worker
+    processes; the evaluator is given as "module:function", or nnue names
+    a network weights file for src.engine.nnue (needs NumPy)
+    """
+    def __init__(self, name: str, depth: Optional[int] = None, movetime: Optional[float] = None,
+                 nodes: Optional[int] = None, tt_size: int = 1 << 16, evaluator: Optional[str] = None,
+                 nnue: Optional[str] = None):
+        self.name = name
+        self.depth = depth
+        self.movetime = movetime
+        self.nodes = nodes
+        self.tt_size = tt_size
+        self.evaluator = evaluator
+        self.nnue = nnue
+
+    @classmethod
+    def parse(cls, spec: str) -> 'EngineConfig':
+        """
+        Build a config from "name:depth=2,movetime=0.1,nodes=500"
+        """
+        name, _, options = spec.partition(':')
+        values = {}
+        for option in filter(None, options.split(',')):
+            key, _, raw_value = option.partition('=')
+            if key in ('depth', 'nodes', 'tt_size'):
+                values[key] = int(raw_value)
+            elif key == 'movetime':
+                values[key] = float(raw_value)
+            elif key in ('evaluator', 'nnue'):
+                values[key] = raw_value
+            else:
+                raise ValueError(f"Unknown engine option {key}")
+        return cls(name, **values)
+
+    def limits(self) -> SearchLimits:
+        if self.depth is None and self.movetime is None and self.nodes is None:
+            return SearchLimits(depth=2)
+        return SearchLimits(self.depth, self.movetime, self.nodes)
+
+    def create_searcher(self) -> Searcher:
+        if self.nnue is not None:
+            # imported by name so NumPy is only loaded by engines that use it
+            evaluator = importlib.import_module('src.engine.nnue').load_evaluator(self.nnue)
+            return Searcher(evaluator=evaluator, tt_size=self.tt_size)
+        if self.evaluator is None:
+            return Searcher(tt_size=self.tt_size)
+        module_name, _, function_name = self.evaluator.partition(':')
+        evaluator = getattr(importlib.import_module(module_name), function_name)
+        return Searcher(evaluator=evaluator, tt_size=self.tt_size)
+
+    def __repr__(self):
+        return f"EngineConfig({self.name}, {self.limits()})"
+
+
+class GameOutcome:
+    """
+    Result of one tournament game, as sent back from a worker
+
+    first_white says which config had white, as both may share a name
+    """
+    def __init__(self, game_id: int, white: str, black: str, result: int, reason: str,
+                 opening: List[str], moves: List[int], first_white: bool = True):
+        self.game_id = game_id
+        self.white = white
+        self.black = black
+        self.first_white = first_white
+        self.result = result
+        self.reason = reason
+        self.opening = opening
+        self.moves = moves
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'game': self.game_id, 'white': self.white, 'black': self.black,
+            'result': RESULT_TEXT[self.result], 'reason': self.reason,
+            'plies': len(self.moves), 'opening': ' '.join(self.opening),
+        }, separators=(',', ':'))
+
+
+def play_game(game_id: int, white: EngineConfig, black: EngineConfig,
+              opening: List[str], max_plies: int = MAX_PLIES, first_white: bool = True) -> GameOutcome:
+    """
+    Play one engine game from an opening line under ChessGame rules
+
+    first_white is only passed through to the outcome: whether white is
+    the tournament's first config
+
+    Draws by repetition, the fifty-move rule and the ply limit are
+    adjudicated here because ChessGame does not track them
+    """
+    game = ChessGame()
+    for san in opening:
+        from_pos, to_pos, promotion = decode_san(game, san)
+        game.play_move(game.get_legal_moves().find(from_pos.square, to_pos.square, promotion_code(promotion)))
+
+    searchers = {Color.WHITE: white.create_searcher(), Color.BLACK: black.create_searcher()}
+    limits = {Color.WHITE: white.limits(), Color.BLACK: black.limits()}
+    seen: Dict[int, int] = {game.position_hash(): 1}
+    quiet_plies = 0
+
+    while True:
+        state = game.game_state
+        if state == GameState.CHECKMATE:
+            result, reason = (BLACK_WIN if game.current_turn == Color.WHITE else WHITE_WIN), 'checkmate'
+            break
+        if state in (GameState.STALEMATE, GameState.DRAW):
+            result, reason = DRAW, state.lower()
+            break
+        if game.ply >= max_plies:
+            result, reason = DRAW, 'ply limit'
+            break
+
+        side = game.current_turn
+        search = searchers[side].search(game, limits[side])
+        move = Move(search.best_move)
+
+        moving_piece = game.board.get_piece_at(move.from_position)
+        resets_clock = move.is_capture() or moving_piece.piece_type == PieceType.PAWN
+        game.play_move(move)
+
+        quiet_plies = 0 if resets_clock else quiet_plies + 1
+        key = game.position_hash()
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= REPETITIONS:
+            result, reason = DRAW, 'repetition'
+            break
+        if quiet_plies >= FIFTY_MOVE_PLIES:
+            result, reason = DRAW, 'fifty moves'
+            break
+
+    return GameOutcome(game_id, white.name, black.name, result, reason, opening, game.move_history, first_white)
+
+
+class TournamentResult:
+    """
+    Final score of a match and, when one was run, the SPRT state
+    """
+    def __init__(self, match: MatchScore, outcomes: int, sprt_outcome: Optional[str], llr: Optional[float]):
+        self.match = match
+        self.games = outcomes
+        self.sprt_outcome = sprt_outcome
+        self.llr = llr
+
+    def summary(self, first: str, second: str) -> str:
+        elo, margin = self.match.elo()
+        text = (f"{first} vs {second}: {self.match!r} score {self.match.score:.3f} "
+                f"elo {elo:+.1f} +/- {margin:.1f}")
+        if self.llr is not None:
+            text += f" llr {self.llr:.2f} sprt {self.sprt_outcome or 'undecided'}"
+        return text
+
+
+class Tournament:
+    """
+    Engine-vs-engine match between two configurations
+
+    Design Considerations:
+    - Games are played in pairs on the same opening with colours swapped,
+      so an unbalanced book line cancels out
+    - Games run in worker processes; results stream to a JSON-lines file
+      (and optionally a binary game archive) as they finish
+    - With an SPRT the match stops as soon as a hypothesis is accepted
+    """
+    def __init__(self, first: EngineConfig, second: EngineConfig, games: int = 100,
+                 concurrency: int = 1, book: Optional[OpeningBook] = None,
+                 sprt: Optional[SPRT] = None, max_plies: int = MAX_PLIES):
+        self.first = first
+        self.second = second
+        self.games = games
+        self.concurrency = concurrency
+        self.book = book or OpeningBook()
+        self.sprt = sprt
+        self.max_plies = max_plies
+
+    def pairings(self) -> Iterator[Tuple[int, EngineConfig, EngineConfig, List[str], bool]]:
+        """
+        (game id, white, black, opening, whether white is the first config)
+        """
+        opening: List[str] = []
+        for game_id in range(self.games):
+            if game_id % 2 == 0:
+                opening = self.book.sample()
+                yield game_id, self.first, self.second, opening, True
+            else:
+                yield game_id, self.second, self.first, opening, False
+
+    def run(self, results: Optional[TextIO] = None, archive: Optional[BinaryIO] = None,
+            on_game: Optional[Callable[[GameOutcome, MatchScore], None]] = None) -> TournamentResult:
+        match = MatchScore()
+        played = 0
+        decision = None
+
+        for outcome in self._outcomes():
+            played += 1
+            match.add(self._points_for_first(outcome))
+            if results is not None:
+                results.write(outcome.to_json() + '\n')
+            if archive is not None:
+                write_records(archive, [encode_game(_record_moves(outcome.moves), outcome.result)])
+            if on_game:
+                on_game(outcome, match)
+            if self.sprt is not None:
+                decision = self.sprt.outcome(match)
+                if decision is not None:
+                    break
+
+        llr = self.sprt.llr(match) if self.sprt is not None else None
+        return TournamentResult(match, played, decision, llr)
+
+    def _outcomes(self) -> Iterator[GameOutcome]:
+        pairings = self.pairings()
+        if self.concurrency <= 1:
+            for game_id, white, black, opening, first_white in pairings:
+                yield play_game(game_id, white, black, opening, self.max_plies, first_white)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = set()
+            try:
+                # keep only a few games queued per worker
+                for game_id, white, black, opening, first_white in pairings:
+                    pending.add(executor.submit(play_game, game_id, white, black, opening, self.max_plies, first_white))
+                    if len(pending) >= self.concurrency * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _points_for_first(self, outcome: GameOutcome) -> float:
+        if outcome.result == DRAW:
+            return 0.5
+        white_won = outcome.result == WHITE_WIN
+        return 1.0 if white_won == outcome.first_white else 0.0
+
+
+def _record_moves(moves: List[int]):
+    # game_record works on (from, to, promotion class) tuples
+    for move in moves:
+        from_pos, to_pos, promotion = decode_move(move)
+        yield from_pos, to_pos, PIECE_CLASSES[promotion] if promotion is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Engine-vs-engine match with Elo and SPRT")
+    parser.add_argument("first", help='engine spec, e.g. "new:depth=3"')
+    parser.add_argument("second", help='engine spec, e.g. "base:depth=2"')
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--book", help="file with one SAN opening line per row")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--results", default="tournament.jsonl")
+    parser.add_argument("--archive", help="also write the games as binary records")
+    parser.add_argument("--sprt", nargs=2, type=float, metavar=("ELO0", "ELO1"))
+    args = parser.parse_args(argv)
+
+    book = OpeningBook.from_file(args.book, args.seed) if args.book else OpeningBook(seed=args.seed)
+    sprt = SPRT(*args.sprt) if args.sprt else None
+    first, second = EngineConfig.parse(args.first), EngineConfig.parse(args.second)
+    tournament = Tournament(first, second, args.games, args.concurrency, book, sprt, args.max_plies)
+
+    def progress(outcome: GameOutcome, match: MatchScore):
+        print(f"game {outcome.game_id}: {outcome.white} - {outcome.black} "
+              f"{RESULT_TEXT[outcome.result]} ({outcome.reason}) {match!r}")
+
+    with open(args.results, 'w') as results:
+        archive = open(args.archive, 'wb') if args.archive else None
+        try:
+            result = tournament.run(results, archive, progress)
+        finally:
+            if archive is not None:
+                archive.close()
+    print(result.summary(first.name, second.name))
+
+
+if __name__ == "__main__":
+    main()
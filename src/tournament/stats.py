@@ -0,0 +1,112 @@
+# src/tournament/stats.py
+import math
+from typing import Optional, Tuple
+
+
+def expected_score(elo: float) -> float:
+    """
+    Logistic expected score for an Elo advantage
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score: float) -> float:
+    """
+    Elo difference implied by a score fraction (0 < score < 1)
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class MatchScore:
+    """
+    Win/draw/loss counts from the first engine's point of view
+    """
+    def __init__(self, wins: int = 0, draws: int = 0, losses: int = 0):
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+    
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+    
+    @property
+    def score(self) -> float:
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+    
+    def add(self, points: float):
+        if points == 1:
+            self.wins += 1
+        elif points == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+    
+    def variance(self) -> float:
+        """
+        Per-game variance of the score
+        """
+        if not self.games:
+            return 0.0
+        mean = self.score
+        return (
+            self.wins * (1 - mean) ** 2
+            + self.draws * (0.5 - mean) ** 2
+            + self.losses * mean ** 2
+        ) / self.games
+    
+    def elo(self) -> Tuple[float, float]:
+        """
+        Elo difference and its 95% error margin
+        """
+        if not self.games:
+            return 0.0, 0.0
+        elo = elo_from_score(self.score)
+        margin = 1.96 * math.sqrt(self.variance() / self.games)
+        upper = elo_from_score(self.score + margin)
+        lower = elo_from_score(self.score - margin)
+        return elo, (upper - lower) / 2
+    
+    def __repr__(self):
+        return f"MatchScore(+{self.wins} ={self.draws} -{self.losses})"
+
+
+class SPRT:
+    """
+    Sequential probability ratio test between two Elo hypotheses
+    
+    Uses the usual normal approximation of the trinomial log-likelihood
+    ratio, so it can be evaluated after every game
+    
+    Args:
+        elo0: Elo difference under H0 (no improvement)
+        elo1: Elo difference under H1 (improvement)
+        alpha: False positive rate
+        beta: False negative rate
+    """
+    H0, H1 = "H0", "H1"
+    
+    def __init__(self, elo0: float = 0.0, elo1: float = 5.0, alpha: float = 0.05, beta: float = 0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+    
+    def llr(self, match: MatchScore) -> float:
+        variance = match.variance()
+        if not match.games or variance == 0:
+            return 0.0
+        score0, score1 = expected_score(self.elo0), expected_score(self.elo1)
+        return match.games * (score1 - score0) * (2 * match.score - score0 - score1) / (2 * variance)
+    
+    def outcome(self, match: MatchScore) -> Optional[str]:
+        """
+        H1 or H0 once a bound is crossed, None while undecided
+        """
+        llr = self.llr(match)
+        if llr >= self.upper_bound:
+            return self.H1
+        if llr <= self.lower_bound:
+            return self.H0
+        return None
@@ -0,0 +1,132 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.board.board import Board
+from src.game.chess_game import ChessGame, GameState
+from src.notation.san import push_san
+from src.pieces.piece import PieceType, Position
+
+
+# every benchmark works on these fixed positions and seeds, so numbers
+# from different commits measure exactly the same work
+MIDDLEGAME = "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O h3 Na5 Bc2 c5 d4 Qc7"
+
+MATING_NETS = {
+    'fools_mate': "f3 e5 g4 Qh4#",
+    'scholars_mate': "e4 e5 Bc4 Nc6 Qh5 Nf6 Qxf7#",
+    'legals_mate': "e4 e5 Nf3 d6 Bc4 Bg4 Nc3 g6 Nxe5 Bxd1 Bxf7+ Ke7 Nd5#",
+}
+
+OPERA_GAME = (
+    "e4 e5 Nf3 d6 d4 Bg4 dxe5 Bxf3 Qxf3 dxe5 Bc4 Nf6 Qb3 Qe7 Nc3 c6 Bg5 b5 "
+    "Nxb5 cxb5 Bxb5+ Nbd7 O-O-O Rd8 Rxd7 Rxd7 Rd1 Qe6 Bxd7+ Nxd7 Qb8+ Nxb8 Rd8#"
+)
+
+# (from, to) pairs for validate_move in the middlegame position (white to move):
+# quiet moves, a capture, a pinned-looking piece and an illegal move
+VALIDATION_ROUTES = [
+    ("D4", "D5"), ("D4", "C5"), ("B1", "D2"), ("C2", "B3"),
+    ("F3", "E5"), ("E1", "E3"), ("D1", "E2"), ("G1", "H1"), ("C2", "C5"),
+]
+
+SEED = 20240601
+
+
+def play(line: str) -> ChessGame:
+    game = ChessGame()
+    for san in line.split():
+        push_san(game, san)
+    return game
+
+
+def forget_legal_moves(game: ChessGame):
+    # force a real generation instead of a cache hit
+    game.move_cache.clear()
+    game._legal_moves_key = None
+
+
+def test_board_construction(benchmark):
+    board = benchmark(Board)
+    assert board.get_piece_at(Position("E", 1)) is None
+
+
+def test_game_startup(benchmark):
+    game = benchmark(ChessGame)
+    assert len(game.board.get_pieces_by_color(game.current_turn)) == 16
+
+
+@pytest.mark.parametrize("piece_type", list(PieceType), ids=lambda piece_type: piece_type.name.lower())
+def test_get_possible_moves(benchmark, piece_type):
+    game = play(MIDDLEGAME)
+    pieces = [
+        piece for piece in game.board.get_pieces_by_color(game.current_turn)
+        if piece.piece_type == piece_type
+    ]
+
+    def generate():
+        return [piece.get_possible_moves(game.board) for piece in pieces]
+
+    benchmark.group = "get_possible_moves"
+    moves = benchmark(generate)
+    assert len(moves) == len(pieces) and any(moves)
+
+
+def test_validate_move(benchmark):
+    game = play(MIDDLEGAME)
+    routes = [(Position(a[0], int(a[1])), Position(b[0], int(b[1]))) for a, b in VALIDATION_ROUTES]
+
+    def validate():
+        return [game.validator.validate_move(from_pos, to_pos)[0] for from_pos, to_pos in routes]
+
+    results = benchmark(validate)
+    assert results.count(True) == 8 and results[-1] is False
+
+
+def test_legal_move_generation(benchmark):
+    game = play(MIDDLEGAME)
+
+    def generate():
+        forget_legal_moves(game)
+        return game.get_legal_moves()
+
+    assert len(benchmark(generate)) > 30
+
+
+@pytest.mark.parametrize("name", list(MATING_NETS))
+def test_checkmate_detection(benchmark, name):
+    game = play(MATING_NETS[name])
+
+    def detect():
+        forget_legal_moves(game)
+        game._update_game_state()
+        return game.game_state
+
+    benchmark.group = "checkmate_detection"
+    assert benchmark(detect) == GameState.CHECKMATE
+
+
+def test_scripted_game(benchmark):
+    game = benchmark(play, OPERA_GAME)
+    assert game.game_state == GameState.CHECKMATE
+
+
+def test_seeded_random_game(benchmark):
+    def random_game():
+        rng = random.Random(SEED)
+        game = ChessGame()
+        while game.game_state == GameState.ACTIVE and game.ply < 120:
+            game.play_move(rng.choice(list(game.get_legal_moves())))
+        return game
+
+    game = benchmark.pedantic(random_game, rounds=5, iterations=1)
+    assert game.ply > 0
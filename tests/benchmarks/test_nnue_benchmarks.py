@@ -0,0 +1,47 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("numpy")
+
+from src.engine.nnue import NetworkWeights, NNUEEvaluator
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+
+
+# the middlegame from test_benchmarks; every legal move is made, evaluated
+# and taken back, the pattern a search puts the evaluator through
+MIDDLEGAME = "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6 O-O Be7 Re1 b5 Bb3 d6 c3 O-O h3 Na5 Bc2 c5 d4 Qc7"
+
+
+@pytest.fixture
+def setup():
+    game = ChessGame()
+    for san in MIDDLEGAME.split():
+        push_san(game, san)
+    return game, NNUEEvaluator(NetworkWeights.random(seed=0)), list(game.get_legal_moves())
+
+
+@pytest.mark.parametrize("mode", ["incremental", "full"])
+def test_nnue_evaluation(benchmark, setup, mode):
+    game, evaluator, moves = setup
+    evaluate = evaluator if mode == "incremental" else evaluator.evaluate_full
+
+    def evaluate_children():
+        scores = []
+        for move in moves:
+            record = game.make_move(move, update_state=False)
+            scores.append(evaluate(game))
+            game.unmake_move(record)
+        return scores
+
+    benchmark.group = "nnue_evaluation"
+    benchmark.extra_info['evaluations'] = len(moves)
+    assert len(benchmark(evaluate_children)) == len(moves)
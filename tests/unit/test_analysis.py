@@ -0,0 +1,103 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import asyncio
+import contextlib
+import time
+import pytest
+from src.engine.analysis import Analyser, analyse
+from src.engine.search import INFINITY, SearchLimits, Searcher
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+
+
+def game_after(sans):
+    game = ChessGame()
+    for san in sans.split():
+        push_san(game, san)
+    return game
+
+
+def test_multipv_scores_are_exact():
+    game = game_after("e4 e5 Nf3 Nc6 Bc4 Nd4")
+    result = Searcher().search(game, SearchLimits(depth=2), multipv=4)
+
+    # every root move scored on its own with a full window
+    scores = {}
+    for move in game.get_legal_moves():
+        record = game.make_move(move, update_state=False)
+        searcher = Searcher()
+        scores[move] = -searcher._negamax(game, 1, -INFINITY, INFINITY, 1)
+        game.unmake_move(record)
+
+    assert [line.score for line in result.lines] == sorted(scores.values(), reverse=True)[:4]
+    assert all(scores[line.pv[0]] == line.score for line in result.lines)
+    assert result.pv == result.lines[0].pv and result.score == result.lines[0].score
+
+
+def test_streams_deeper_results_and_reuses_the_table():
+    async def scenario():
+        analyser = Analyser()
+        game = game_after("e4 e5")
+        depths = []
+        async with contextlib.aclosing(analyser.analyse(game, multipv=3)) as results:
+            async for result in results:
+                depths.append(result.depth)
+                assert len(result.lines) == 3 and result.nps > 0
+                assert len({line.pv[0] for line in result.lines}) == 3
+                assert [line.score for line in result.lines] == sorted((line.score for line in result.lines), reverse=True)
+                if result.depth == 3:
+                    break
+        assert depths == [1, 2, 3]
+        assert analyser.searcher.tt
+
+        # the generator is closed and the searcher free: the next position
+        # is analysed with what the last search stored
+        push_san(game, "Nf3")
+        async for result in analyser.analyse(game, limits=SearchLimits(depth=2)):
+            pass
+        assert result.depth == 2 and len(result.lines) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_the_consumer_stops_the_search():
+    async def scenario():
+        analyser = Analyser()
+        first = asyncio.Event()
+
+        async def consume():
+            async for _ in analyser.analyse(ChessGame(), multipv=2):
+                first.set()
+
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(first.wait(), 10)
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the search thread was stopped and waited for
+        assert time.perf_counter() - start < 2.0
+        assert not analyser._lock.locked()
+
+    asyncio.run(scenario())
+
+
+def test_finished_game_and_module_level_analyse():
+    async def scenario():
+        mated = game_after("f3 e5 g4 Qh4#")
+        results = [result async for result in analyse(mated, multipv=2)]
+        assert len(results) == 1 and results[0].best_move is None
+
+        results = [result async for result in analyse(ChessGame(), limits=SearchLimits(depth=2))]
+        assert [result.depth for result in results] == [1, 2]
+        with pytest.raises(ValueError):
+            async for _ in analyse(ChessGame(), multipv=0):
+                pass
+
+    asyncio.run(scenario())
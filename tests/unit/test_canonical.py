@@ -0,0 +1,101 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+from src.board.snapshot import BoardSnapshot
+from src.engine.eval_cache import EvaluationCache
+from src.engine.evaluation import evaluate
+from src.game.canonical import FLIP, IDENTITY, MIRROR, Canonicalizer, transform_moves
+from src.game.chess_game import ChessGame
+from src.game.move_cache import LegalMoveCache
+from src.notation.san import push_san
+from src.pieces.piece import Color
+
+
+def flipped(snapshot: BoardSnapshot) -> BoardSnapshot:
+    # colours swapped, ranks reversed; castling right i becomes (i + 2) % 4
+    ranks = tuple(tuple(code.swapcase() for code in rank) for rank in reversed(snapshot.ranks))
+    castling = ((snapshot.castling & 0b11) << 2) | (snapshot.castling >> 2)
+    side = Color.BLACK if snapshot.side_to_move is Color.WHITE else Color.WHITE
+    return BoardSnapshot(ranks, side, castling, snapshot.en_passant, 0)
+
+
+def mirrored(snapshot: BoardSnapshot) -> BoardSnapshot:
+    ranks = tuple(tuple(reversed(rank)) for rank in snapshot.ranks)
+    en_passant = None if snapshot.en_passant is None else 7 - snapshot.en_passant
+    return snapshot._replace(ranks=ranks, en_passant=en_passant)
+
+
+def codes(moves) -> list:
+    return sorted(int(move) for move in moves)
+
+
+def random_positions(count: int, seed: int):
+    rng = random.Random(seed)
+    game = ChessGame()
+    for _ in range(count):
+        moves = list(game.get_legal_moves())
+        if not moves:
+            game = ChessGame()
+            continue
+        game.play_move(rng.choice(moves))
+        yield game
+
+
+def test_symmetric_positions_share_a_key_and_their_moves():
+    canonicalizer = Canonicalizer()
+    mirrored_seen = 0
+    for game in random_positions(300, seed=4):
+        snapshot = game.snapshot()
+        canonical = canonicalizer.canonical(game.board, game.current_turn)
+
+        twins = [(flipped(snapshot), FLIP)]
+        if not snapshot.castling:
+            twins += [(mirrored(snapshot), MIRROR), (mirrored(flipped(snapshot)), FLIP | MIRROR)]
+            mirrored_seen += 1
+        for twin_snapshot, transform in twins:
+            twin = ChessGame.from_snapshot(twin_snapshot)
+            assert canonicalizer.canonical(twin.board, twin.current_turn).key == canonical.key
+            assert codes(transform_moves(game.get_legal_moves(), transform)) == codes(twin.get_legal_moves())
+        # the canonical key is the hash of one of the twins
+        keys = {game.position_hash()} | {ChessGame.from_snapshot(s).position_hash() for s, _ in twins}
+        assert canonical.key == min(keys)
+    assert mirrored_seen > 0
+
+
+def test_no_mirroring_while_castling_is_possible():
+    game = ChessGame()
+    push_san(game, "e4")
+    canonical = Canonicalizer().canonical(game.board, game.current_turn)
+    assert canonical.transform in (IDENTITY, FLIP)
+
+
+def test_flipped_twin_hits_the_shared_move_cache():
+    cache = LegalMoveCache(canonicalizer=Canonicalizer())
+    game = ChessGame(cache)
+    for san in "e4 e5 Nf3 Nc6 Bb5".split():
+        push_san(game, san)
+    moves = codes(game.get_legal_moves())
+
+    # from_snapshot already looks the twin's moves up to set its state
+    hits, misses = cache.hits, cache.misses
+    twin = ChessGame.from_snapshot(flipped(game.snapshot()), cache)
+    twin_moves = codes(twin.get_legal_moves())
+    assert (cache.hits, cache.misses) == (hits + 1, misses)
+    assert twin_moves == codes(ChessGame.from_snapshot(flipped(game.snapshot())).get_legal_moves())
+    assert moves == codes(game.get_legal_moves())
+
+
+def test_evaluation_cache_shares_flipped_positions():
+    cache = EvaluationCache(evaluate)
+    for game in random_positions(60, seed=9):
+        twin = ChessGame.from_snapshot(flipped(game.snapshot()))
+        assert cache(game) == evaluate(game)
+        hits = cache.hits
+        assert cache(twin) == evaluate(twin) == evaluate(game)
+        assert cache.hits == hits + 1
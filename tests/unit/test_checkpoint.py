@@ -0,0 +1,138 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import asyncio
+import pickle
+import random
+import time
+import pytest
+from src.board.snapshot import BoardSnapshot
+from src.game.checkpoint import CheckpointError
+from src.game.chess_game import ChessGame, GameState
+from src.game.clock import ChessClock, TimeControl
+from src.notation.san import push_san
+from src.pieces.piece import Color
+from src.server.game_server import ChessServer
+
+
+def random_game(plies, seed, game=None):
+    rng = random.Random(seed)
+    game = game or ChessGame()
+    for _ in range(plies):
+        moves = list(game.get_legal_moves())
+        if not moves:
+            break
+        game.play_move(rng.choice(moves))
+    return game
+
+
+def line_hashes(game):
+    # position hash after every ply of the recorded line
+    ply = game.ply
+    game.goto(0)
+    hashes = [game.position_hash()]
+    while game.redo() is not None:
+        hashes.append(game.position_hash())
+    game.goto(ply)
+    return hashes
+
+
+def test_restore_matches_the_game():
+    for seed in range(12):
+        game = random_game(60, seed)
+        data = game.checkpoint()
+        assert len(data) == 41 + 3 * len(game.move_history)
+        restored = ChessGame.restore(data)
+        assert restored.snapshot() == game.snapshot()
+        assert restored.position_hash() == game.position_hash()
+        assert restored.game_state == game.game_state
+        assert restored.ply == game.ply
+        assert restored.move_history == game.move_history
+        assert sorted(restored.get_legal_moves()) == sorted(game.get_legal_moves())
+
+
+def test_undo_before_the_checkpoint_replays_the_line():
+    game = random_game(30, seed=3)
+    game.goto(24)
+    restored = ChessGame.restore(game.checkpoint())
+    # a move after the restore, then back through the checkpoint
+    move = list(restored.get_legal_moves())[0]
+    restored.play_move(move)
+    assert restored.ply == 25 and len(restored.move_history) == 25
+    restored.goto(10)
+    game.goto(10)
+    assert restored.snapshot() == game.snapshot()
+    assert line_hashes(restored)[:25] == line_hashes(game)[:25]
+    restored.goto(25)
+    assert restored.move_history[-1] == move
+
+
+def test_pickle_and_snapshot_start():
+    ranks = [['.'] * 8 for _ in range(8)]
+    ranks[0][4], ranks[1][4], ranks[7][4] = 'K', 'P', 'k'
+    start = BoardSnapshot(tuple(map(tuple, ranks)), Color.WHITE, 0, None, 0)
+    game = ChessGame.from_snapshot(start)
+    push_san(game, "e4")
+    push_san(game, "Kd7")
+
+    copy = pickle.loads(pickle.dumps(game))
+    assert copy.snapshot() == game.snapshot()
+    assert copy.undo() is not None and copy.undo() is not None
+    assert copy.snapshot().ranks == start.ranks and copy.undo() is None
+
+
+def test_clock_and_errors():
+    game = ChessGame(clock=ChessClock(TimeControl(60, 2)))
+    push_san(game, "e4")
+    push_san(game, "e5")
+    restored = ChessGame.restore(game.checkpoint())
+    assert restored.clock.running is Color.WHITE
+    assert restored.clock.time_left(Color.BLACK) == pytest.approx(62, abs=0.01)
+    assert restored.clock.control.increment == 2
+
+    data = game.checkpoint()
+    with pytest.raises(CheckpointError):
+        ChessGame.restore(data[:-1])
+    with pytest.raises(CheckpointError):
+        ChessGame.restore(b'\x09' + data[1:])
+
+
+def test_bulk_round_trip_is_fast():
+    games = [random_game(40, seed) for seed in range(50)]
+    finished = ChessGame()
+    for san in "f3 e5 g4 Qh4#".split():
+        push_san(finished, san)
+    games.append(finished)
+
+    start = time.perf_counter()
+    for _ in range(4):
+        data = ChessGame.checkpoint_many(games)
+        restored = ChessGame.restore_many(data)
+    elapsed = time.perf_counter() - start
+    # a few thousand round trips a second, with room for a slow machine
+    assert elapsed / (4 * len(games)) < 0.002
+    assert [game.snapshot() for game in restored] == [game.snapshot() for game in games]
+    assert restored[-1].game_state == finished.game_state
+    assert finished.game_state == GameState.CHECKMATE
+
+
+def test_server_checkpoint_and_restore():
+    async def scenario():
+        server = ChessServer()
+        await server.handle_command("NEW")
+        await server.handle_command("NEW 300+2")
+        await server.handle_command("MOVE 2 e2e4")
+        data = await server.checkpoint()
+
+        fresh = ChessServer()
+        assert fresh.restore(data) == 2
+        assert await fresh.handle_command("BOARD 2") == await server.handle_command("BOARD 2")
+        assert (await fresh.handle_command("CLOCK 2")).endswith(" b")
+        assert await fresh.handle_command("NEW") == "OK GAME 3"
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import pytest
+from src.game.chess_game import ChessGame
+from src.notation.coordinate import uci_to_move
+from src.notation.fen import STARTING_FEN, FENError, game_from_fen, parse_fen
+from src.pieces.piece import Color
+
+
+def test_starting_position_matches_a_new_game():
+    assert parse_fen(STARTING_FEN) == ChessGame().snapshot()
+    # the move counters may be left out
+    assert parse_fen(' '.join(STARTING_FEN.split()[:4])) == ChessGame().snapshot()
+
+
+def test_en_passant_and_castling_survive():
+    game = ChessGame()
+    for text in ["e2e4", "a7a6", "e4e5", "d7d5"]:
+        game.play_move(uci_to_move(game, text))
+    fen = "rnbqkbnr/1pp1pppp/p7/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3"
+    assert parse_fen(fen) == game.snapshot()
+    assert uci_to_move(game_from_fen(fen), "e5d6") is not None
+
+    # rights without the rook at home are dropped
+    snapshot = parse_fen("4k3/8/8/8/8/8/8/4K2R w KQ - 0 1")
+    assert snapshot.castling == 0b01 and snapshot.side_to_move is Color.WHITE
+
+
+@pytest.mark.parametrize("fen", [
+    "8/8/8/8 w - - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1",
+    "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KX - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e6 0 1",
+    "8/8/8/8/8/8/8/K7 w - - 0 1",
+])
+def test_bad_fen_is_rejected(fen):
+    with pytest.raises(FENError):
+        parse_fen(fen)
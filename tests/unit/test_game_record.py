@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import io
+import pytest
+from src.database.game_record import (
+    GameRecordError, decode_game, encode_pgn_game, read_records, replay_record, write_records
+)
+from src.database.position_index import WHITE_WIN
+from src.notation.pgn import read_games
+from src.pieces.concrete_pieces import Queen
+from src.pieces.piece import Position
+
+
+PGN_TEXT = """[Result "1-0"]
+
+1. h4 g5 2. hxg5 h6 3. gxh6 Bg7 4. hxg7 Nf6 5. gxh8=Q 1-0
+"""
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_round_trip(indexed):
+    pgn_game = next(read_games(io.StringIO(PGN_TEXT)))
+    record = encode_pgn_game(pgn_game, indexed=indexed)
+    game, moves, result = decode_game(record)
+    
+    assert result == WHITE_WIN
+    assert len(moves) == 9
+    assert len(record) == 2 + 9 * (1 if indexed else 2)
+    assert isinstance(game.board.get_piece_at(Position("H", 8)), Queen)
+    assert moves[-1][2] is Queen
+
+
+def test_archive_stream():
+    record = encode_pgn_game(next(read_games(io.StringIO(PGN_TEXT))))
+    archive = io.BytesIO()
+    write_records(archive, [record, record])
+    archive.seek(0)
+    assert list(read_records(archive)) == [record, record]
+
+
+def test_corrupt_record():
+    record = encode_pgn_game(next(read_games(io.StringIO(PGN_TEXT))))
+    with pytest.raises(GameRecordError):
+        decode_game(record[:-1])
+
+
+def test_replay_record_yields_every_position():
+    record = encode_pgn_game(next(read_games(io.StringIO(PGN_TEXT))))
+    final, moves, _ = decode_game(record)
+    plies = []
+    for game in replay_record(record):
+        plies.append(game.ply)
+    assert plies == list(range(1, len(moves) + 1))
+    assert game.snapshot() == final.snapshot()
+
+    # a corrupt move ends the replay after the positions before it
+    replayed = []
+    with pytest.raises(GameRecordError):
+        for game in replay_record(record[:-1]):
+            replayed.append(game.ply)
+    assert replayed == list(range(1, len(moves)))
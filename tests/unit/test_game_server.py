@@ -0,0 +1,83 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import asyncio
+from src.engine.search import SearchLimits
+from src.server.client import ChessClient
+from src.server.game_server import ChessServer
+from src.server.load_test import run_load
+
+
+def test_commands_without_sockets():
+    async def scenario():
+        server = ChessServer(engine_limits=SearchLimits(depth=1))
+        assert await server.handle_command("NEW") == "OK GAME 1"
+        assert await server.handle_command("MOVE 1 e2e4") == "OK MOVE 1 e2e4 ACTIVE"
+        assert (await server.handle_command("MOVE 1 e2e4")).startswith("ERR illegal move")
+        assert (await server.handle_command("GO 1")).startswith("OK BESTMOVE 1 ")
+        board = await server.handle_command("BOARD 1")
+        assert board.endswith(" w") and "/....P.../" in board
+        assert (await server.handle_command("MOVE 9 e2e4")) == "ERR no game 9"
+        assert (await server.handle_command("FLY")).startswith("ERR unknown command")
+        
+    asyncio.run(scenario())
+
+
+def test_fools_mate_over_tcp():
+    async def scenario():
+        server = ChessServer()
+        host, port = await server.start()
+        async with ChessClient(host, port) as client:
+            game_id = (await client.send("NEW")).split()[-1]
+            for move in ["f2f3", "e7e5", "g2g4"]:
+                assert (await client.send(f"MOVE {game_id} {move}")).endswith("ACTIVE")
+            assert (await client.send(f"MOVE {game_id} d8h4")).endswith("CHECKMATE")
+            assert await client.send(f"MOVE {game_id} a2a3") == "ERR game is over"
+        await server.stop()
+    
+    asyncio.run(scenario())
+
+
+def test_load_generator_reports_latency():
+    async def scenario():
+        server = ChessServer(engine_limits=SearchLimits(depth=1))
+        host, port = await server.start()
+        latency = await run_load(host, port, games=4, plies=6, concurrency=4)
+        await server.stop()
+        return latency
+    
+    latency = asyncio.run(scenario())
+    assert latency.count > 0
+    assert 0 < latency.percentile(50) <= latency.percentile(99)
+
+
+def test_dropped_and_idle_games_are_closed():
+    async def scenario():
+        server = ChessServer(max_games=2, idle_timeout=0.05)
+        host, port = await server.start()
+        async with ChessClient(host, port) as client:
+            assert await client.send("NEW") == "OK GAME 1"
+            assert await client.send("NEW") == "OK GAME 2"
+            assert await client.send("NEW") == "ERR server full"
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.02)
+        assert not server.sessions
+
+        # no connection owns these, so only idleness frees them
+        await server.handle_command("NEW")
+        await server.handle_command("NEW")
+        assert await server.handle_command("NEW") == "ERR server full"
+        await asyncio.sleep(0.1)
+        await server.handle_command("MOVE 4 e2e4")
+        assert await server.handle_command("NEW") == "OK GAME 5"
+        assert sorted(server.sessions) == [4, 5]
+        await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+import pytest
+from src.game.chess_game import ChessGame, GameState
+from src.notation.san import push_san
+
+
+def play_random(game, plies, seed):
+    rng = random.Random(seed)
+    hashes = [game.position_hash()]
+    for _ in range(plies):
+        moves = list(game.get_legal_moves())
+        if not moves:
+            break
+        game.play_move(rng.choice(moves))
+        hashes.append(game.position_hash())
+    return hashes
+
+
+def test_undo_redo_round_trip():
+    game = ChessGame()
+    for san in ["e4", "e5", "Nf3"]:
+        push_san(game, san)
+    assert game.ply == 3
+
+    undone = game.undo()
+    assert str(undone.to_position) == "F3" and game.ply == 2
+    assert game.redo() == undone
+    assert game.redo() is None
+    assert len(game.move_history) == 3
+
+
+def test_goto_visits_every_ply():
+    game = ChessGame()
+    hashes = play_random(game, 120, seed=3)
+    last = game.ply
+
+    for ply in [0, last // 2, 5, last, 1, last - 1]:
+        game.goto(ply)
+        assert game.ply == ply
+        assert game.position_hash() == hashes[ply]
+    with pytest.raises(ValueError):
+        game.goto(last + 1)
+
+
+def test_new_move_replaces_undone_line():
+    game = ChessGame()
+    for san in ["e4", "e5", "Nf3", "Nc6"]:
+        push_san(game, san)
+    game.goto(2)
+    push_san(game, "Bc4")
+    assert game.ply == 3 and len(game.move_history) == 3
+    assert game.redo() is None
+
+
+def test_undo_after_mate_restores_active_game():
+    game = ChessGame()
+    for san in ["f3", "e5", "g4", "Qh4#"]:
+        push_san(game, san)
+    assert game.game_state == GameState.CHECKMATE
+    game.undo()
+    assert game.game_state == GameState.ACTIVE
+    game.redo()
+    assert game.game_state == GameState.CHECKMATE
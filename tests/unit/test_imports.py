@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import ast
+import glob
+import json
+import subprocess
+
+# cold start budget for the engine, measured at ~30ms with bytecode cached
+# and ~60ms without; the slack covers slow disks, not new dependencies
+IMPORT_BUDGET_MS = 250
+
+# modules an analysis worker must not pay for just to search a position
+HEAVY_MODULES = ['asyncio', 'concurrent', 'multiprocessing', 'numpy', 'socket']
+
+
+def test_no_function_level_imports():
+    offenders = []
+    for path in glob.glob(os.path.join(root_path, "src", "**", "*.py"), recursive=True):
+        with open(path, encoding="utf-8") as source:
+            tree = ast.parse(source.read())
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            for inner in ast.walk(node):
+                if isinstance(inner, (ast.Import, ast.ImportFrom)):
+                    offenders.append(f"{os.path.relpath(path, root_path)}:{inner.lineno}")
+    assert offenders == []
+
+
+def test_engine_cold_import_budget():
+    script = (
+        "import json, sys, time\n"
+        "before = set(sys.modules)\n"
+        "start = time.perf_counter()\n"
+        "import src.engine.search\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "loaded = sorted(set(sys.modules) - before)\n"
+        "print(json.dumps({'ms': elapsed, 'modules': loaded}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=root_path, check=True,
+                            capture_output=True, text=True).stdout
+    result = json.loads(output)
+
+    heavy = [name for name in result['modules'] if name.split('.')[0] in HEAVY_MODULES]
+    assert heavy == []
+    assert result['ms'] < IMPORT_BUDGET_MS
+
+
+def test_cli_start_does_not_load_the_engine():
+    # the CLI profiles the rules only, the server adds the search
+    script = (
+        "import sys\n"
+        "import src.game.game_cli\n"
+        "print('src.engine.search' in sys.modules)\n"
+        "src.game.game_cli.instrumentation.enable()\n"
+        "print('src.engine.search' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=root_path, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_only_the_network_evaluator_needs_numpy():
+    script = (
+        "import sys\n"
+        "import src.database.tactics, src.tournament.runner\n"
+        "print('numpy' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=root_path, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.split() == ["False"]
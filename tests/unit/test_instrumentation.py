@@ -0,0 +1,92 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import asyncio
+from src.engine.search import SearchLimits, Searcher
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+from src.pieces.concrete_pieces import Knight
+from src.pieces.piece import Position
+from src.profiling import instrumentation
+from src.profiling.instrumentation import TimingHistogram, profiled
+from src.server.game_server import SEARCH_TARGETS, ChessServer
+
+
+def test_disabled_leaves_original_functions():
+    original = Knight.__dict__['generate_moves']
+    with profiled():
+        assert Knight.__dict__['generate_moves'] is not original
+    assert Knight.__dict__['generate_moves'] is original
+    assert not instrumentation.INSTRUMENTATION.enabled
+
+
+def test_enable_patches_and_disable_restores_every_target():
+    instrumentation.add_targets(SEARCH_TARGETS)
+    targets = instrumentation.INSTRUMENTATION.targets()
+    assert (Searcher, 'search', 'search') in targets
+    originals = [owner.__dict__[attribute] for owner, attribute, _ in targets]
+
+    instrumentation.enable()
+    try:
+        for (owner, attribute, _), original in zip(targets, originals):
+            patched = owner.__dict__[attribute]
+            assert patched is not original
+            assert patched.__wrapped__ is original
+    finally:
+        instrumentation.disable()
+    for (owner, attribute, _), original in zip(targets, originals):
+        assert owner.__dict__[attribute] is original
+
+
+def test_profiled_game_and_search():
+    instrumentation.add_targets(SEARCH_TARGETS)
+    with profiled() as profile:
+        game = ChessGame()
+        for san in ["e4", "e5", "Nf3"]:
+            push_san(game, san)
+        assert game.validator.validate_move(Position("B", 8), Position("C", 6)) == (True, None)
+        Searcher().search(game, SearchLimits(depth=2))
+    stats = profile.stats()
+
+    assert stats['update_game_state']['count'] == 3
+    assert stats['validate_move']['count'] == 1
+    assert stats['generate_moves.knight']['count'] > 0
+    assert stats['search']['count'] == 1
+    assert stats['search.nodes']['count'] > 0
+    assert 'update_game_state' in profile.report()
+
+    # nothing more is recorded once profiling is off
+    push_san(game, "Nc6")
+    assert instrumentation.stats()['update_game_state']['count'] == 3
+
+
+def test_histogram_percentiles():
+    histogram = TimingHistogram()
+    for _ in range(99):
+        histogram.record(3e-6)
+    histogram.record(1e-3)
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 4e-6
+    assert histogram.percentile(100) == 1e-3
+
+
+def test_server_profile_command():
+    async def scenario():
+        server = ChessServer()
+        try:
+            assert (await server.handle_command("PROFILE ON")).startswith("OK PROFILE on")
+            await server.handle_command("PROFILE RESET")
+            await server.handle_command("NEW")
+            await server.handle_command("MOVE 1 e2e4")
+            reply = await server.handle_command("PROFILE OFF")
+            assert reply.startswith("OK PROFILE off") and "update_game_state=1/" in reply
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+
+    asyncio.run(scenario())
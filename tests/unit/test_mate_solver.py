@@ -0,0 +1,84 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+from src.board.snapshot import BoardSnapshot
+from src.engine.mate_solver import DISPROVEN, PROVEN, UNKNOWN, MateSolver, solve_mate
+from src.game.chess_game import ChessGame
+from src.notation.coordinate import move_to_uci
+from src.notation.san import push_san
+from src.pieces.piece import Color
+
+
+def position(placement: str, side_to_move: Color) -> ChessGame:
+    # FEN piece placement only (rank 8 first), no castling or en passant
+    ranks = []
+    for rank in placement.split('/'):
+        row = ''
+        for char in rank:
+            row += '.' * int(char) if char.isdigit() else char
+        ranks.append(tuple(row))
+    return ChessGame.from_snapshot(BoardSnapshot(tuple(reversed(ranks)), side_to_move, 0, None, 0))
+
+
+def test_fools_mate_in_one():
+    game = ChessGame()
+    for san in "f3 e5 g4".split():
+        push_san(game, san)
+    result = solve_mate(game, 3)
+    assert result.status == PROVEN and result.moves == 1
+    assert [move_to_uci(move) for move in result.line] == ['d8h4']
+
+
+def test_back_rank_lists_every_mating_move():
+    game = position("6k1/5ppp/8/8/8/8/1R6/R5K1", Color.WHITE)
+    assert sorted(move_to_uci(move) for move in MateSolver().mating_moves(game, 1)) == ['a1a8', 'b2b8']
+
+
+KING_HUNT = "r1b1kb1r/pppp1ppp/5q2/4n3/3KP3/2N3PN/PPP4P/R1BQ1B1R"
+
+
+def test_shortest_mate_and_line_ends_in_mate():
+    game = position(KING_HUNT, Color.BLACK)
+    solver = MateSolver()
+    assert solver.prove(game, 2).status == DISPROVEN
+    result = solver.solve(game, 4)
+    assert result.status == PROVEN and result.moves == 3
+    assert len(result.line) == 5
+    # a unique solution, as a puzzle should have
+    assert solver.mating_moves(game, 3) == [result.line[0]]
+
+    for move in result.line:
+        game.make_move(move, update_state=False)
+    assert not game.get_legal_moves() and game.is_in_check()
+
+
+def test_no_mate_from_start_leaves_game_untouched():
+    game = ChessGame()
+    key = game.position_hash()
+    result = MateSolver().solve(game, 2)
+    assert result.status == DISPROVEN and result.line == []
+    assert game.position_hash() == key and game.ply == 0
+
+
+def test_budget_and_table_bounds():
+    game = position(KING_HUNT, Color.BLACK)
+    assert MateSolver(max_nodes=5).prove(game, 3).status == UNKNOWN
+
+    solver = MateSolver(table_size=32)
+    assert solver.prove(game, 3).status == PROVEN
+    assert len(solver.table) <= 32
+
+
+def test_stop_holds_until_reset():
+    game = position(KING_HUNT, Color.BLACK)
+    solver = MateSolver()
+    solver.stop()
+    assert solver.prove(game, 3).status == UNKNOWN
+    assert solver.mating_moves(game, 3) == []
+    solver.reset()
+    assert solver.prove(game, 3).status == PROVEN
@@ -0,0 +1,89 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+from src.game.chess_game import ChessGame
+from src.game.move_cache import LegalMoveCache
+from src.game.moves import Move, MoveList
+from src.game.zobrist import placement_key
+from src.notation.san import push_san
+from src.pieces.piece import Position
+
+
+def make_list(*moves):
+    move_list = MoveList()
+    for move in moves:
+        move_list.append(move)
+    return move_list
+
+
+def test_lru_eviction_and_counters():
+    cache = LegalMoveCache(capacity=2)
+    cache.put(1, make_list(Move.create(12, 28)))
+    cache.put(2, make_list(Move.create(11, 27)))
+    assert cache.get(1) is not None  # 1 is now the most recent
+    cache.put(3, make_list())
+
+    assert 2 not in cache and 1 in cache and 3 in cache
+    assert cache.get(2) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+    assert stats['memory_bytes'] == 4  # one stored move of 4 bytes
+
+
+def test_stored_lists_are_compact_copies():
+    moves = make_list(Move.create(12, 28))
+    stored = LegalMoveCache().put(1, moves)
+    assert stored is not moves and list(stored) == list(moves)
+    assert stored.nbytes() == 4
+
+
+def test_transposition_hits_cache():
+    game = ChessGame()
+    for san in ["Nf3", "Nf6", "Ng1", "Ng8"]:
+        push_san(game, san)
+    hits = game.move_cache.hits
+    game.get_legal_moves()
+    assert game.move_cache.hits == hits
+    # back in the initial position: its list is already cached
+    assert len(game.get_legal_moves()) == 20
+
+    push_san(game, "Nf3")
+    assert game.move_cache.hits > hits
+
+
+def test_shared_cache_between_games():
+    cache = LegalMoveCache()
+    first, second = ChessGame(cache), ChessGame(cache)
+    moves = first.get_legal_moves()
+    assert second.get_legal_moves() is moves
+    assert cache.hits == 1
+
+
+def test_placement_key_follows_board_mutations():
+    game = ChessGame()
+    rng = random.Random(7)
+    records = []
+    for _ in range(60):
+        moves = game.get_legal_moves()
+        if not moves:
+            break
+        records.append(game.make_move(rng.choice(list(moves)), update_state=False))
+        assert game.board.placement_key == placement_key(game.board.squares)
+    for record in reversed(records):
+        game.unmake_move(record)
+    assert game.board.placement_key == placement_key(game.board.squares)
+    assert game.position_hash() == ChessGame().position_hash()
+
+
+def test_mutated_board_is_not_served_stale_moves():
+    game = ChessGame()
+    assert Position("E", 4) in game.get_legal_moves()
+    # editing the board directly changes the key, so the list is regenerated
+    game.board.remove_piece(Position("E", 2))
+    assert Position("E", 4) not in game.get_legal_moves()
@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import copy
+from src.game.chess_game import ChessGame
+from src.game.moves import CAPTURE, DOUBLE_PUSH, Move, MoveList, encode_move
+from src.notation.san import push_san
+from src.pieces.concrete_pieces import Queen
+from src.pieces.piece import PieceType, Position
+
+
+def perft(game, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in game.get_legal_moves():
+        child = copy.deepcopy(game)
+        child.make_move(move)
+        nodes += perft(child, depth - 1)
+    return nodes
+
+
+def test_move_packing():
+    move = Move.create(Position("E", 7).square, Position("D", 8).square, 4, CAPTURE)
+    assert move.from_position == Position("E", 7)
+    assert move.to_position == Position("D", 8)
+    assert move.promotion == PieceType.QUEEN
+    assert move.is_capture() and not move.is_en_passant()
+    assert move.code == encode_move(Position("E", 7), Position("D", 8), Queen)
+
+
+def test_move_list_membership_ignores_flags():
+    moves = MoveList()
+    moves.append(Move.create(12, 28, flags=DOUBLE_PUSH))
+    assert len(moves) == 1
+    assert Move.create(12, 28) in moves
+    assert Position("E", 4) in moves
+    assert moves.find(12, 28) == moves[0]
+    assert moves.find(12, 20) is None
+
+
+def test_initial_position_perft():
+    game = ChessGame()
+    assert len(game.get_legal_moves()) == 20
+    assert perft(game, 2) == 400
+
+
+def test_legal_moves_respect_pins():
+    game = ChessGame()
+    for san in ["e4", "d5", "Bb5+"]:
+        push_san(game, san)
+    # only blocks and king moves get out of check
+    routes = {(move.from_position, move.to_position) for move in game.get_legal_moves()}
+    assert (Position("C", 7), Position("C", 6)) in routes
+    assert (Position("A", 7), Position("A", 6)) not in routes
+
+
+def test_legal_moves_cached_per_position():
+    game = ChessGame()
+    moves = game.get_legal_moves()
+    assert game.get_legal_moves() is moves
+    
+    assert game.move_piece(Position("E", 2), Position("E", 4))
+    # game-over detection already generated the reply list, which is reused
+    replies = game.get_legal_moves()
+    assert replies is not moves and len(replies) == 20
+    assert game.get_legal_moves() is replies
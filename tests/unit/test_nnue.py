@@ -0,0 +1,84 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.engine.nnue import NNUEError, NetworkWeights, NNUEEvaluator, board_features
+from src.engine.search import SearchLimits
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+from src.pieces.piece import Color
+from src.tournament.runner import EngineConfig
+
+
+def test_incremental_accumulator_matches_full_recomputation():
+    weights = NetworkWeights.random(seed=3)
+    evaluator = NNUEEvaluator(weights)
+    rng = random.Random(7)
+    for _ in range(4):
+        game = ChessGame()
+        records = []
+        for _ in range(120):
+            moves = list(game.get_legal_moves())
+            if not moves:
+                break
+            records.append(game.make_move(rng.choice(moves), update_state=False))
+            score = evaluator(game)
+            full = weights.bias + weights.columns[board_features(game.board)].sum(axis=0)
+            assert np.allclose(evaluator.accumulator.values, full, atol=1e-4)
+            assert abs(score - evaluator.evaluate_full(game)) <= 1
+        # and all the way back through unmake
+        while records:
+            game.unmake_move(records.pop())
+            assert abs(evaluator(game) - evaluator.evaluate_full(game)) <= 1
+    assert evaluator.accumulator.updates > evaluator.accumulator.refreshes
+
+
+def test_symmetric_position_scores_the_same_for_both_sides():
+    evaluator = NNUEEvaluator(NetworkWeights.random(seed=1))
+    game = ChessGame()
+    black_to_move = ChessGame.from_snapshot(game.snapshot()._replace(side_to_move=Color.BLACK))
+    assert evaluator(game) == evaluator.evaluate_full(black_to_move)
+
+
+def test_weights_round_trip_and_validation(tmp_path):
+    weights = NetworkWeights.random(hidden=16, seed=5)
+    path = str(tmp_path / "net.npz")
+    weights.save(path)
+    loaded = NetworkWeights.load(path)
+    assert loaded.hidden == 16 and np.array_equal(loaded.columns, weights.columns)
+
+    game = ChessGame()
+    push_san(game, "e4")
+    assert NNUEEvaluator(loaded)(game) == NNUEEvaluator(weights)(game)
+
+    np.savez(str(tmp_path / "partial.npz"), feature_weights=weights.feature_weights)
+    with pytest.raises(NNUEError):
+        NetworkWeights.load(str(tmp_path / "partial.npz"))
+    with pytest.raises(NNUEError):
+        NetworkWeights(weights.feature_weights, weights.feature_bias, weights.hidden_weights[:8],
+                       weights.hidden_bias, weights.output_weights, weights.output_bias)
+
+
+def test_searcher_and_tournament_config_use_the_network(tmp_path):
+    path = str(tmp_path / "net.npz")
+    NetworkWeights.random(seed=2).save(path)
+
+    config = EngineConfig.parse(f"net:depth=2,nnue={path}")
+    searcher = config.create_searcher()
+    assert isinstance(searcher.evaluator, NNUEEvaluator)
+
+    game = ChessGame()
+    result = searcher.search(game, SearchLimits(depth=2))
+    assert result.best_move in list(game.get_legal_moves())
+
+    # a search never leaves the accumulator out of step with the game
+    assert abs(searcher.evaluator(game) - searcher.evaluator.evaluate_full(game)) <= 1
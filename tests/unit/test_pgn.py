@@ -0,0 +1,107 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import io
+import pytest
+from src.game.chess_game import ChessGame, GameState
+from src.notation.pgn import PGNError, read_games
+from src.notation.san import SANError, decode_san, legal_moves_san, push_san
+from src.pieces.concrete_pieces import Queen
+from src.pieces.piece import Color, PieceType, Position
+
+
+PGN_TEXT = """[Event "Fool"]
+[White "A"]
+[Black "B"]
+[Result "0-1"]
+
+1. f3 e5 2. g4 {blunder} Qh4# 0-1
+
+[Event "Castles"]
+[White "C"]
+[Black "D"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 Nc6 (2... d6 3. d4) 3. Bc4 Bc5 4. O-O Nf6
+5. d3 0-0 $1 ; castled both sides
+*
+
+[Event "Promotion"]
+[White "E"]
+[Black "F"]
+[Result "*"]
+
+1. h4 g5 2. hxg5 h6 3. gxh6 Bg7 4. hxg7 Nf6 5. gxh8=Q *
+"""
+
+
+def test_read_games_streams_headers_and_moves():
+    games = list(read_games(io.StringIO(PGN_TEXT)))
+    assert [game.headers["Event"] for game in games] == ["Fool", "Castles", "Promotion"]
+    assert list(games[0].moves()) == ["f3", "e5", "g4", "Qh4#"]
+    # variations, NAGs and comments are not part of the mainline
+    assert list(games[1].moves())[-2:] == ["d3", "0-0"]
+
+
+def test_header_filter_skips_games():
+    games = list(read_games(io.StringIO(PGN_TEXT), lambda headers: headers["White"] == "C"))
+    assert len(games) == 1
+    assert games[0].headers["Black"] == "D"
+
+
+def test_game_without_moves_keeps_its_own_headers():
+    text = '[Event "Empty"]\n[Result "*"]\n\n[Event "Next"]\n[Result "1-0"]\n\n1. e4 1-0\n\n[Event "Last"]\n'
+    games = list(read_games(io.StringIO(text)))
+    assert [(game.headers["Event"], list(game.moves())) for game in games] == [
+        ("Empty", []), ("Next", ["e4"]), ("Last", [])
+    ]
+    assert games[0].result == "*" and games[1].result == "1-0"
+    kept = read_games(io.StringIO(text), lambda headers: headers["Event"] != "Empty")
+    assert [game.headers["Event"] for game in kept] == ["Next", "Last"]
+
+
+def test_replay_reaches_checkmate():
+    game = next(read_games(io.StringIO(PGN_TEXT))).final_position()
+    assert game.game_state == GameState.CHECKMATE
+
+
+def test_replay_castling_and_promotion():
+    _, castles, promotion = read_games(io.StringIO(PGN_TEXT))
+    
+    board = castles.final_position().board
+    assert board.get_piece_at(Position("G", 1)).piece_type == PieceType.KING
+    assert board.get_piece_at(Position("F", 8)).piece_type == PieceType.ROOK
+    
+    queen = promotion.final_position().board.get_piece_at(Position("H", 8))
+    assert isinstance(queen, Queen) and queen.color == Color.WHITE
+
+
+def test_en_passant_and_san_round_trip():
+    game = ChessGame()
+    for san in ["e4", "Nf6", "e5", "d5"]:
+        push_san(game, san)
+    assert "exd6" in legal_moves_san(game)
+    assert push_san(game, "exd6") == "exd6"
+    assert game.board.get_piece_at(Position("D", 5)) is None
+
+
+def test_san_disambiguation():
+    game = ChessGame()
+    for san in ["Nf3", "a6", "Nc3", "a5", "Nd4", "a4"]:
+        push_san(game, san)
+    # both knights can reach b5
+    assert "Ndb5" in legal_moves_san(game)
+    assert "Ncb5" in legal_moves_san(game)
+    with pytest.raises(SANError):
+        decode_san(game, "Nb5")
+
+
+def test_illegal_move_reports_ply():
+    bad = next(read_games(io.StringIO("1. e4 e5 2. Ke3 *\n")))
+    with pytest.raises(PGNError, match="Move 3"):
+        bad.final_position()
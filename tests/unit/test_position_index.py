@@ -0,0 +1,106 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import io
+import random
+from src.database.position_index import (
+    POSTING_FORMAT, WHITE_WIN, BLACK_WIN, Posting, PositionIndexBuilder, build_index
+)
+from src.game.chess_game import ChessGame
+from src.game.moves import decode_move
+from src.notation.pgn import read_games
+from src.notation.san import push_san
+from src.pieces.piece import Position
+
+
+PGN_TEXT = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "0-1"]
+
+1. e4 c5 2. Nf3 d6 0-1
+
+[Result "1-0"]
+
+1. Nf3 Nc6 2. e4 e5 1-0
+"""
+
+
+def test_transpositions_share_a_hash():
+    first, second = ChessGame(), ChessGame()
+    for san in ["e4", "e5", "Nf3", "Nc6"]:
+        push_san(first, san)
+    for san in ["Nf3", "Nc6", "e4", "e5"]:
+        push_san(second, san)
+    assert first.position_hash() == second.position_hash()
+    assert first.position_hash() != ChessGame().position_hash()
+
+
+def test_index_finds_games_and_explores(tmp_path):
+    index = build_index(read_games(io.StringIO(PGN_TEXT)), str(tmp_path), shard_bits=4)
+    assert index.games_indexed == 3
+    
+    start = index.explore(ChessGame())
+    assert [stats.games for stats in start] == [2, 1]
+    first_move = decode_move(start[0].move)
+    assert first_move[:2] == (Position("E", 2), Position("E", 4))
+    assert (start[0].white_wins, start[0].black_wins) == (1, 1)
+    
+    # the first and third game transpose into the same final position
+    game = ChessGame()
+    for san in ["e4", "e5", "Nf3", "Nc6"]:
+        push_san(game, san)
+    postings = index.find_games(game)
+    assert sorted((posting.game_id, posting.ply) for posting in postings) == [(0, 4), (2, 4)]
+    assert all(posting.result == WHITE_WIN for posting in postings)
+    index.close()
+
+
+def test_finish_sorts_shards_like_tuples(tmp_path):
+    rng = random.Random(7)
+    builder = PositionIndexBuilder(str(tmp_path), shard_bits=1, buffer_size=100)
+    postings = [Posting(rng.choice([rng.getrandbits(64), 1 << 63, 5]), rng.randrange(50), rng.randrange(300),
+                        rng.randrange(1 << 16), rng.randrange(4)) for _ in range(1000)]
+    for posting in postings:
+        builder._write(posting)
+    index = builder.finish()
+
+    stored = []
+    for shard in range(2):
+        with open(tmp_path / f"shard_{shard:04x}.bin", 'rb') as shard_file:
+            stored += POSTING_FORMAT.iter_unpack(shard_file.read())
+    assert stored == sorted(postings)
+    # about five runs per shard were merged and removed
+    assert sorted(os.listdir(tmp_path)) == [
+        "manifest.json", "shard_0000.bin", "shard_0000.moves", "shard_0001.bin", "shard_0001.moves"
+    ]
+    assert sorted(index.lookup(5)) == sorted(posting for posting in postings if posting.position_hash == 5)
+    index.close()
+
+
+def test_stored_move_stats_match_the_postings(tmp_path):
+    # the same short games many times over, as in a real opening explorer
+    text = (PGN_TEXT + "\n") * 40 + '[Result "1/2-1/2"]\n\n1. e4 e5 2. Bc4 1/2-1/2\n'
+    builder = PositionIndexBuilder(str(tmp_path), shard_bits=2, buffer_size=50)
+    builder.add_games(read_games(io.StringIO(text)))
+    index = builder.finish()
+    assert index.has_move_stats
+    game = ChessGame()
+    for san in [None, "e4", "e5"]:
+        if san:
+            push_san(game, san)
+        stored = [(s.move, s.games, s.white_wins, s.draws, s.black_wins) for s in index.explore(game)]
+        index.has_move_stats = False
+        counted = [(s.move, s.games, s.white_wins, s.draws, s.black_wins) for s in index.explore(game)]
+        index.has_move_stats = True
+        assert stored == counted and stored
+    # after 1. e4 e5: Nf3 in the 40 copies of the first game, Bc4 in the drawn one
+    assert [(games, draws) for _, games, _, draws, _ in stored] == [(40, 0), (1, 1)]
+    assert len(index.lookup(game.position_hash())) == 41
+    index.close()
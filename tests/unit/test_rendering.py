@@ -0,0 +1,97 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import io
+from src.board.snapshot import BoardSnapshot
+from src.game.chess_game import ChessGame, GameState
+from src.game.game_cli import ChessGameCLI
+from src.game.rendering import BoardRenderer, BoardView, ansi_diff
+from src.notation.san import push_san
+from src.pieces.concrete_pieces import Knight
+from src.pieces.piece import Color, Position
+
+
+def test_plain_text_matches_board_layout():
+    text = BoardRenderer().text(ChessGame().board).split('\n')
+    assert text[0] == "  A B C D E F G H"
+    assert text[1] == "8 r n b q k b n r 8"
+    assert text[8] == "1 R N B Q K B N R 1"
+
+
+def test_view_sends_frame_then_changed_squares_only():
+    game = ChessGame()
+    view = BoardView()
+    frame = view.update(game.board)
+    assert "8 r n b q k b n r 8" in frame
+
+    push_san(game, "e4")
+    update = view.update(game.board)
+    # e2 emptied (screen row 8, column 11) and e4 filled (row 6)
+    assert update == "\x1b[8;11H.\x1b[6;11HP"
+    assert view.update(game.board) == ""
+
+    view.invalidate()
+    assert view.update(game.board).startswith("\x1b[1;1H")
+
+
+def test_castling_diff_touches_four_squares():
+    game = ChessGame()
+    for san in ["e4", "e5", "Nf3", "Nc6", "Bc4", "Bc5"]:
+        push_san(game, san)
+    renderer = BoardRenderer()
+    before = renderer.codes(game.board)
+    push_san(game, "O-O")
+    assert renderer.diff(before, renderer.codes(game.board)).count("\x1b[") == 4
+
+
+def test_watchers_share_cached_output():
+    renderer = BoardRenderer()
+    game = ChessGame()
+    watchers = [BoardView(renderer) for _ in range(3)]
+    for view in watchers:
+        view.update(game.board)
+    push_san(game, "d4")
+    hits = ansi_diff.cache_info().hits
+    updates = {view.update(game.board) for view in watchers}
+    assert len(updates) == 1
+    assert ansi_diff.cache_info().hits == hits + 2
+
+
+def test_cli_updates_in_place():
+    output = io.StringIO()
+    cli = ChessGameCLI(output, ansi=True)
+    cli.display_board()
+    drawn = len(output.getvalue())
+    push_san(cli.game, "e4")
+    cli.display_board("Invalid move!")
+    assert output.getvalue()[drawn:] == "\x1b[8;11H.\x1b[6;11HP\x1b[12;1H\x1b[JInvalid move!\n"
+
+
+def play_cli(cli, answers, monkeypatch):
+    replies = iter(answers)
+    monkeypatch.setattr('builtins.input', lambda prompt: next(replies))
+    cli.play()
+    return cli.output.getvalue()
+
+
+def test_cli_reports_mate_and_keeps_running(monkeypatch):
+    cli = ChessGameCLI(io.StringIO(), ansi=False)
+    moves = ["F2", "F3", "E7", "E5", "G2", "G4", "D8", "H4", "A2", "A3", "Q"]
+    output = play_cli(cli, moves, monkeypatch)
+    assert output.count("Checkmate, Black wins! U to undo, Q to quit") == 2
+    assert cli.game.game_state == GameState.CHECKMATE
+
+
+def test_cli_promotes_to_the_chosen_piece(monkeypatch):
+    ranks = [['.'] * 8 for _ in range(8)]
+    ranks[0][4], ranks[6][0], ranks[7][7] = 'K', 'P', 'k'
+    cli = ChessGameCLI(io.StringIO(), ansi=False)
+    cli.game = ChessGame.from_snapshot(BoardSnapshot(tuple(map(tuple, ranks)), Color.WHITE, 0, None, 0))
+    output = play_cli(cli, ["A7", "A8X", "A7", "A8N", "Q"], monkeypatch)
+    assert "Invalid input!" in output
+    assert isinstance(cli.game.board.get_piece_at(Position("A", 8)), Knight)
@@ -0,0 +1,64 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import random
+import pytest
+from src.game.chess_game import ChessGame
+from src.notation.san import push_san
+
+
+def test_apply_matches_game_after_random_playout():
+    rng = random.Random(11)
+    for _ in range(5):
+        game = ChessGame()
+        snapshot = game.snapshot()
+        for _ in range(80):
+            moves = list(game.get_legal_moves())
+            if not moves:
+                break
+            move = rng.choice(moves)
+            snapshot = snapshot.apply(move)
+            game.make_move(move, update_state=False)
+            assert snapshot == game.snapshot()
+            assert snapshot.key == game.position_hash()
+
+
+def test_apply_shares_untouched_ranks():
+    game = ChessGame()
+    before = game.snapshot()
+    after = before.apply(game.get_legal_moves().find(12, 28))  # e2e4
+    shared = [row for row in range(8) if after.ranks[row] is before.ranks[row]]
+    assert shared == [0, 2, 4, 5, 6, 7]
+    # the parent is untouched
+    assert before.piece_at(12) == 'P' and after.piece_at(28) == 'P'
+
+
+def test_snapshot_is_immutable():
+    snapshot = ChessGame().snapshot()
+    with pytest.raises(AttributeError):
+        snapshot.side_to_move = None
+    with pytest.raises(TypeError):
+        snapshot.ranks[0][0] = '.'
+
+
+def test_castling_and_en_passant_survive_round_trip():
+    game = ChessGame()
+    for san in ["e4", "Nf6", "e5", "d5", "Nf3", "Nc6", "Bb5", "a6"]:
+        push_san(game, san)
+    restored = ChessGame.from_snapshot(game.snapshot())
+    assert restored.position_hash() == game.position_hash()
+    assert sorted(restored.get_legal_moves().raw()) == sorted(game.get_legal_moves().raw())
+
+    game = ChessGame()
+    for san in ["e4", "a6", "e5", "d5"]:
+        push_san(game, san)
+    snapshot = game.snapshot()
+    assert snapshot.en_passant == 3
+    restored = ChessGame.from_snapshot(snapshot)
+    push_san(restored, "exd6")
+    assert restored.snapshot().piece_at(35) == '.'
@@ -0,0 +1,120 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import io
+import json
+from collections import deque
+import pytest
+from src.database.game_record import encode_pgn_game, write_records
+from src.database import tactics
+from src.database.tactics import (
+    Candidate, MinerConfig, MinerStats, ScanResult, TacticMiner, archive_games, scan_game, verify_candidate
+)
+from src.game.chess_game import ChessGame
+from src.notation.pgn import read_games
+
+
+PGN = """
+[Event "Scholar"]
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0
+
+[Event "Queen blunder"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Qh4 3. Nxh4 Nc6 1-0
+
+[Event "Quiet"]
+[Result "*"]
+
+1. d4 d5 2. c4 e6 3. Nc3 Nf6 *
+
+[Event "Broken"]
+[Result "*"]
+
+1. e4 e5 2. Ke3 *
+"""
+
+CONFIG = MinerConfig(min_ply=1, verify_depth=2)
+
+
+@pytest.fixture
+def archives(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(PGN)
+    # the same two tactical games again as binary records
+    record_path = tmp_path / "games.bin"
+    with open(record_path, 'wb') as stream:
+        write_records(stream, [encode_pgn_game(game) for game in list(read_games(PGN.splitlines()))[:2]])
+    return str(pgn_path), str(record_path)
+
+
+def test_scan_flags_mates_and_swings(archives):
+    items = list(archive_games(archives))
+    assert [(item.index, item.pgn is not None) for item in items] == [(0, True), (1, True), (2, True), (3, True), (0, False), (1, False)]
+
+    mate, swing, quiet, broken = (scan_game(item, CONFIG) for item in items[:4])
+    assert [(c.ply, c.mate) for c in mate.candidates] == [(6, True)]
+    assert [(c.ply, c.mate) for c in swing.candidates] == [(4, False)]
+    assert quiet.candidates == [] and quiet.error is None
+    assert broken.error is not None and broken.plies == 2
+
+
+def test_miner_writes_each_puzzle_once(archives):
+    output = io.StringIO()
+    stats = TacticMiner(CONFIG, workers=1, queue_size=2).run(archives, output)
+    # verifications finish in any order
+    puzzles = sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda p: p['kind'])
+
+    assert (stats.games, stats.errors, stats.candidates, stats.duplicates) == (6, 1, 4, 2)
+    assert [(p['kind'], p['solution'][0], p['side']) for p in puzzles] == [("mate", "h5f7", "w"), ("swing", "f3h4", "w")]
+    assert puzzles[0]['mate_in'] == 1 and puzzles[1]['score'] > 500
+
+    # the checkpoint reloads the puzzle position
+    game = ChessGame.restore(bytes.fromhex(puzzles[0]['checkpoint']))
+    assert f"{game.position_hash():016x}" == puzzles[0]['key']
+
+
+def test_dedup_set_is_bounded():
+    result = ScanResult([Candidate("games.pgn", 0, ply, key, b"", 0, 0, False)
+                         for ply, key in enumerate([1, 2, 1, 1])], 4, None)
+    stats, seen, queued = MinerStats(), set(), deque()
+    # two hashes fit and the repeat of the first is dropped
+    TacticMiner._scanned(result, stats, seen, queued, seen_size=2)
+    assert stats.duplicates == 2 and [c.key for c in queued] == [1, 2]
+
+    # one fits: 2 pushes 1 out, so the first repeat of 1 is queued again
+    stats, seen, queued = MinerStats(), set(), deque()
+    TacticMiner._scanned(result, stats, seen, queued, seen_size=1)
+    assert stats.duplicates == 1 and [c.key for c in queued] == [1, 2, 1]
+    assert len(seen) == 1
+
+
+def test_miner_process_pool(archives):
+    found = []
+    stats = TacticMiner(CONFIG, workers=2, queue_size=1).run(archives, on_puzzle=found.append)
+    assert stats.puzzles == 2 and stats.duplicates == 2
+    assert sorted(puzzle.kind for puzzle in found) == ["mate", "swing"]
+
+
+def test_failed_jobs_are_counted(archives, monkeypatch):
+    def failing_verify(candidate, config):
+        if candidate.mate:
+            raise RuntimeError("solver crashed")
+        return verify_candidate(candidate, config)
+
+    monkeypatch.setattr(tactics, "verify_candidate", failing_verify)
+    stats = TacticMiner(CONFIG, workers=1).run(archives)
+    # the broken game and the mate's verification
+    assert (stats.games, stats.errors, stats.puzzles) == (6, 2, 1)
+
+
+def test_missing_archive_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TacticMiner(CONFIG, workers=1).run([str(tmp_path / "missing.bin")])
@@ -0,0 +1,210 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import asyncio
+import time
+import pytest
+from src.engine.ponder import Ponderer
+from src.engine.search import SearchResult, Searcher
+from src.engine.time_manager import IterationController, TimeBudget, TimeManager
+from src.engine.uci_protocol import UCIEngine
+from src.game.chess_game import ChessGame, GameOverError, GameState
+from src.game.clock import ChessClock, TimeControl
+from src.notation.coordinate import uci_to_move
+from src.pieces.piece import Color
+from src.server.client import ChessClient
+from src.server.game_server import ChessServer
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_clock_increment_and_flag():
+    now = FakeTime()
+    clock = ChessClock(TimeControl.parse("10+2"), time_source=now)
+    clock.start(Color.WHITE)
+    now.now += 3
+    assert clock.time_left(Color.WHITE) == pytest.approx(7)
+    assert clock.press() == pytest.approx(3)
+    assert clock.time_left(Color.WHITE) == pytest.approx(9)
+    assert clock.running is Color.BLACK
+
+    now.now += 11
+    assert clock.flagged(Color.BLACK)
+    clock.press()
+    # no increment once the flag has fallen
+    assert clock.time_left(Color.BLACK) == pytest.approx(-1)
+    with pytest.raises(ValueError):
+        TimeControl.parse("fast")
+
+
+def test_game_presses_clock_and_ends_on_time():
+    now = FakeTime()
+    game = ChessGame(clock=ChessClock(TimeControl(5, 1), time_source=now))
+    game.play_move(uci_to_move(game, "e2e4"))
+    # the first move starts black's clock
+    assert game.clock.running is Color.BLACK
+    now.now += 2
+    game.play_move(uci_to_move(game, "e7e5"))
+    assert game.clock.time_left(Color.BLACK) == pytest.approx(4)
+
+    now.now += 6
+    with pytest.raises(GameOverError):
+        game.play_move(uci_to_move(game, "g1f3"))
+    assert game.game_state == GameState.TIMEOUT and game.ply == 2
+
+
+def test_undo_and_redo_move_the_running_clock():
+    now = FakeTime()
+    game = ChessGame(clock=ChessClock(TimeControl(60, 1), time_source=now))
+    game.play_move(uci_to_move(game, "e2e4"))
+    now.now += 2
+    game.play_move(uci_to_move(game, "e7e5"))
+    now.now += 3
+    # white has thought for 3 seconds; taking back black's move hands the clock to black
+    game.undo()
+    assert game.current_turn is Color.BLACK and game.clock.running is Color.BLACK
+    assert game.clock.time_left(Color.WHITE) == pytest.approx(57)
+    now.now += 4
+    game.play_move(uci_to_move(game, "c7c5"))
+    # black paid for both thinks (2 + 4) and got both increments
+    assert game.clock.time_left(Color.BLACK) == pytest.approx(56)
+    assert game.clock.time_left(Color.WHITE) == pytest.approx(57)
+    assert game.clock.running is Color.WHITE
+
+    game.goto(0)
+    assert game.clock.running is None
+    game.redo()
+    assert game.clock.running is Color.BLACK
+
+
+def test_budgets():
+    manager = TimeManager()
+    budget = manager.budget(60.0)
+    assert 0 < budget.soft < budget.hard <= 30
+    assert manager.budget(60.0, increment=2.0).soft > budget.soft
+    assert manager.budget(10.0, moves_to_go=1).hard == pytest.approx(10.0 - manager.move_overhead)
+    assert manager.budget(0.0).hard > 0
+
+
+def test_controller_stops_stable_searches_early():
+    searcher = Searcher()
+    controller = IterationController(TimeBudget(soft=1.0, hard=4.0), searcher)
+    for depth in range(1, 5):
+        controller(SearchResult(1234, 20, depth, 100, 0.1 * depth, [1234]))
+    assert not searcher._stop_event.is_set()
+    # a settled best move stops at 0.6 of the soft budget
+    controller(SearchResult(1234, 20, 5, 100, 0.65, [1234]))
+    assert searcher._stop_event.is_set()
+
+    searcher = Searcher()
+    controller = IterationController(TimeBudget(soft=1.0, hard=4.0), searcher)
+    controller(SearchResult(1, 20, 1, 100, 0.1, [1]))
+    controller(SearchResult(2, -40, 2, 100, 0.5, [2]))
+    # a changed best move and a falling score buy more time
+    assert controller.factor > 1.5 and not searcher._stop_event.is_set()
+    # but no depth is started that the hard limit would cut short
+    controller(SearchResult(2, -40, 3, 100, 1.2, [2]))
+    assert searcher._stop_event.is_set()
+
+
+def test_timed_search_respects_the_hard_budget():
+    start = time.perf_counter()
+    result = TimeManager().search(Searcher(), ChessGame(), TimeBudget(soft=0.05, hard=0.3))
+    assert result.best_move is not None
+    assert time.perf_counter() - start < 1.0
+
+
+def test_ponder_hit_and_miss():
+    game = ChessGame()
+    game.play_move(uci_to_move(game, "e2e4"))
+    ponderer = Ponderer(Searcher())
+
+    ponderer.start(game, uci_to_move(game, "e7e5"))
+    time.sleep(0.1)
+    game.play_move(uci_to_move(game, "e7e5"))
+    result = ponderer.hit(game, TimeBudget(soft=0.0, hard=1.0))
+    assert result is not None and result.best_move in list(game.get_legal_moves())
+    assert not ponderer.pondering
+
+    game.play_move(result.best_move)
+    ponderer.start(game, uci_to_move(game, "a7a6"))
+    game.play_move(uci_to_move(game, "h7h6"))
+    assert ponderer.hit(game, TimeBudget(soft=0.1, hard=1.0)) is None
+    assert (ponderer.hits, ponderer.misses) == (1, 1)
+
+
+def test_uci_clock_and_ponderhit():
+    lines = []
+    engine = UCIEngine(output=lines.append)
+    engine.handle("position startpos")
+    engine.handle("go wtime 2000 btime 2000 winc 0 binc 0")
+    engine.wait()
+    assert lines[-1].startswith("bestmove ")
+
+    engine.handle("position startpos moves e2e4 e7e5")
+    engine.handle("go ponder wtime 2000 btime 2000")
+    time.sleep(0.1)
+    # no bestmove while pondering
+    assert len([line for line in lines if line.startswith("bestmove")]) == 1
+    engine.handle("ponderhit")
+    engine.wait()
+    assert len([line for line in lines if line.startswith("bestmove")]) == 2
+
+
+def test_server_clock_and_pondering():
+    async def scenario():
+        server = ChessServer(ponder=True)
+        assert await server.handle_command("NEW 3+0.5") == "OK GAME 1"
+        assert (await server.handle_command("CLOCK 1")).startswith("OK CLOCK 1 3000 3000 -")
+        assert (await server.handle_command("MOVE 1 e2e4")).endswith("ACTIVE")
+        reply = await server.handle_command("GO 1")
+        assert reply.startswith("OK BESTMOVE 1 ")
+        session = server.sessions[1]
+        assert session.ponderer.pondering
+        # the engine played black, so white's clock runs again
+        assert (await server.handle_command("CLOCK 1")).endswith(" w")
+        assert (await server.handle_command("NEW soon")).startswith("ERR")
+        assert (await server.handle_command("CLOCK 2")).startswith("ERR")
+        await server.handle_command("CLOSE 1")
+        assert not session.ponderer.pondering
+
+    asyncio.run(scenario())
+
+
+def test_server_ponder_is_capped_and_ends_with_the_connection():
+    async def scenario():
+        server = ChessServer(ponder=True)
+        host, port = await server.start()
+        client = await ChessClient(host, port).connect()
+        assert await client.send("NEW 3+0") == "OK GAME 1"
+        await client.send("MOVE 1 e2e4")
+        await client.send("GO 1")
+        ponderer = server.sessions[1].ponderer
+        # capped by the engine's budget for a move, far below the clock
+        thread = ponderer._thread
+        await asyncio.get_running_loop().run_in_executor(None, thread.join, 2.0)
+        assert not thread.is_alive()
+
+        await client.send("MOVE 1 d2d4")
+        await client.send("GO 1")
+        assert ponderer.pondering
+        await client.close()
+        for _ in range(100):
+            if not ponderer.pondering:
+                break
+            await asyncio.sleep(0.02)
+        assert not ponderer.pondering and 1 not in server.sessions
+        await server.stop()
+
+    asyncio.run(scenario())
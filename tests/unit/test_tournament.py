@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path)
+
+
+import io
+import pytest
+from src.database.game_record import decode_game, read_records
+from src.database.position_index import WHITE_WIN
+from src.tournament.book import OpeningBook
+from src.tournament.runner import EngineConfig, Tournament, play_game
+from src.tournament.stats import SPRT, MatchScore, elo_from_score
+
+
+def test_elo_from_score():
+    assert elo_from_score(0.5) == pytest.approx(0.0)
+    assert elo_from_score(0.75) == pytest.approx(190.85, abs=0.01)
+    assert elo_from_score(0.25) == pytest.approx(-190.85, abs=0.01)
+
+
+def test_match_score_elo_margin_shrinks_with_games():
+    small = MatchScore(6, 2, 2)
+    large = MatchScore(60, 20, 20)
+    assert small.elo()[0] == pytest.approx(large.elo()[0])
+    assert large.elo()[1] < small.elo()[1]
+
+
+def test_sprt_decides():
+    sprt = SPRT(0, 10)
+    assert sprt.outcome(MatchScore(5, 5, 5)) is None
+    assert sprt.outcome(MatchScore(300, 100, 100)) == SPRT.H1
+    assert sprt.outcome(MatchScore(100, 100, 300)) == SPRT.H0
+
+
+def test_engine_config_parse():
+    config = EngineConfig.parse("fast:depth=2,movetime=0.5")
+    assert (config.name, config.depth, config.movetime, config.nodes) == ("fast", 2, 0.5, None)
+    with pytest.raises(ValueError):
+        EngineConfig.parse("bad:speed=3")
+
+
+def test_play_game_finds_scholars_mate():
+    engine = EngineConfig("a", depth=1)
+    outcome = play_game(0, engine, engine, "e4 e5 Bc4 Nc6 Qh5 Nf6".split())
+    assert outcome.result == WHITE_WIN
+    assert outcome.reason == "checkmate"
+    assert len(outcome.moves) == 7
+
+
+def test_same_named_configs_are_scored_by_colour():
+    engine = EngineConfig("same", depth=1)
+    tournament = Tournament(engine, EngineConfig("same", depth=1), games=2,
+                            book=OpeningBook(["e4 e5 Bc4 Nc6 Qh5 Nf6"]), max_plies=20)
+    result = tournament.run()
+    # white mates in both games, so each config wins once
+    assert (result.match.wins, result.match.losses) == (1, 1)
+
+
+def test_tournament_swaps_colours_and_archives():
+    first, second = EngineConfig("first", depth=1), EngineConfig("second", depth=1)
+    tournament = Tournament(first, second, games=2, book=OpeningBook(["e4 e5 Bc4 Nc6 Qh5 Nf6"]), max_plies=20)
+    results, archive = io.StringIO(), io.BytesIO()
+    result = tournament.run(results, archive)
+
+    # the same mate is delivered once by each engine
+    assert result.games == 2
+    assert (result.match.wins, result.match.losses) == (1, 1)
+    lines = results.getvalue().splitlines()
+    assert '"white":"first"' in lines[0] and '"white":"second"' in lines[1]
+
+    archive.seek(0)
+    records = list(read_records(archive))
+    assert len(records) == 2
+    assert decode_game(records[0])[2] == WHITE_WIN
@@ -0,0 +1,91 @@
+import sys
+import os
+
+# Add the root directory to sys.path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(root_path) 
+
+
+import time
+from src.engine.uci_protocol import UCIEngine
+
+
+def make_engine():
+    lines = []
+    return UCIEngine(output=lines.append), lines
+
+
+def test_handshake():
+    engine, lines = make_engine()
+    engine.handle("uci")
+    engine.handle("isready")
+    assert lines[-2:] == ["uciok", "readyok"]
+
+
+def test_go_depth_finds_mate():
+    engine, lines = make_engine()
+    engine.handle("position startpos moves f2f3 e7e5 g2g4")
+    engine.handle("go depth 2")
+    engine.wait()
+    assert lines[-1].startswith("bestmove d8h4")
+    assert any("score mate 1" in line for line in lines)
+
+
+def test_stop_interrupts_infinite_search():
+    engine, lines = make_engine()
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    time.sleep(0.2)
+    engine.handle("stop")
+    assert lines[-1].startswith("bestmove ")
+    assert engine.handle("quit") is False
+
+
+def test_infinite_search_waits_for_stop_to_report():
+    engine, lines = make_engine()
+    engine.handle("position startpos moves f2f3 e7e5 g2g4")
+    engine.handle("go infinite")
+    # the mate ends the search by itself, bestmove still waits for stop
+    deadline = time.perf_counter() + 5
+    while not any("score mate" in line for line in lines) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert not any(line.startswith("bestmove") for line in lines)
+    engine.handle("stop")
+    assert lines[-1].startswith("bestmove d8h4")
+
+
+def test_stop_before_the_search_starts_is_kept():
+    engine, lines = make_engine()
+    engine.handle("position startpos")
+    engine.searcher.reset()
+    engine.searcher.stop()
+    # a search that only gets going after the stop still sees it
+    start = time.perf_counter()
+    result = engine.searcher.search(engine.game, engine._parse_go(["infinite"])[0])
+    assert result.best_move is not None and time.perf_counter() - start < 1.0
+
+
+def test_position_fen_with_moves():
+    engine, lines = make_engine()
+    engine.handle("position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    engine.handle("go depth 2")
+    engine.wait()
+    assert lines[-1].startswith("bestmove a1a8")
+
+    engine.handle("position fen rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 moves f2f3 e7e5 g2g4")
+    engine.handle("go depth 2")
+    engine.wait()
+    assert lines[-1].startswith("bestmove d8h4")
+
+
+def test_unusable_position_is_never_searched():
+    engine, lines = make_engine()
+    engine.handle("position startpos moves f2f3 e7e5 g2g4")
+    for position in ["fen 8/8/8/8 w - - 0 1", "startpos moves e2e4 e2e4", "shuffled"]:
+        engine.handle(f"position {position}")
+        engine.handle("go depth 2")
+        engine.wait()
+        # not d8h4 from the position before
+        assert lines[-1] == "bestmove 0000"
+        assert lines[-2].startswith("info string")
@@ -0,0 +1,5 @@
+from src.engine.uci_protocol import UCIEngine
+
+if __name__ == "__main__":
+    engine = UCIEngine()
+    engine.run()